@@ -21,18 +21,33 @@ import math
 from models.ogrenci_sinifi import Ogrenci, DenemeKaydi, HataKaydi, GorusmeNotu
 from core.veritabani import OgrenciRepository
 from core.analiz_motoru import AnalizMotoru, UyariSeviyesi
+from core.analiz_onbellegi import onbellekli_hata_haritasi, onbellekli_korelasyon, onbellekli_tam_analiz
 from core.puan_hesaplama import (
     TYT_DERSLER, AYT_DERSLER, LGS_DERSLER,
     AYT_PUAN_KATSAYILARI,
     net_hesapla_yks, net_hesapla_lgs,
     tyt_puan_hesapla, ayt_puan_hesapla,
-    yerlestirme_puani_hesapla, lgs_puan_hesapla,
-    tam_puan_hesapla, _siralama_tahmin,
+    yerlestirme_puani_hesapla, _siralama_tahmin,
+    tam_puan_hesapla_onbellekli, lgs_puan_hesapla_onbellekli,
+    hedef_plani_hesapla, ders_duyarliligi,
     TYT_SIRALAMA_TABLOSU,
 )
+from core.erisilebilirlik import VARSAYILAN_MATRIS_YOLU, erisim_matrisi_olustur, kayitli_erisim_matrisi
+from core.erken_uyari import arka_plan_servisi_baslat, uyari_deposu
+from core.kohort_analizi import kohort_risk_tablosu, risk_ozeti
+from core.korelasyon import FAKTOR_ETIKETLERI, kohort_korelasyonlari
+from core.kural_motoru import kural_yukleme_hatasi
+from core.konu_onceligi import eslesmeyen_hatalar, kohort_konu_oncelikleri
+from core.lise_verileri import lise_oner, lise_oner_puan, lise_sehirleri, lise_turleri
+from core.puan_gecmisi import puan_gecmisi_tablosu
+from core.simulasyon import puan_dagilimi_simule
+from core.tahmin import LGS_TARIH, YKS_TARIH, net_tahmini, tahmin_tablosu
+from core.tercih_optimizasyonu import TercihAgirliklari, ogrenci_tercih_listesi
+from core.yerlesme_modeli import ogrenci_yerlesme_tahmini
 from core.yokatlas_verileri import (
-    bolum_ara, universite_oner,
-    benzersiz_sehirler, benzersiz_bolumler,
+    bolum_ara_bulanik, universite_oner, universite_oner_siralama,
+    benzersiz_sehirler, benzersiz_bolumler, faset_sayimlari,
+    katalog_yillari, katalog_yili_sec, projeksiyon_yili, oneri_katalogu,
     BOLUM_VERILERI,
 )
 from models.konu_verileri import (
@@ -285,6 +300,8 @@ header {visibility: hidden;}
 # Session State ve Repository
 # ══════════════════════════════════════════════
 repo = OgrenciRepository()
+# Erken uyarı taraması sunucu sürecinde arka planda çalışır (süreç başına bir kez başlar)
+arka_plan_servisi_baslat(repo.dosya_yolu)
 
 
 def _state(key, default=None):
@@ -309,9 +326,7 @@ def secili_ogrenci():
 # ══════════════════════════════════════════════
 YKS_2025 = datetime(2025, 6, 14)
 LGS_2025 = datetime(2025, 6, 8)
-# 2026 tarihleri (tahmini)
-YKS_TARIH = datetime(2026, 6, 13)
-LGS_TARIH = datetime(2026, 6, 7)
+# 2026 tarihleri (tahmini) core/tahmin.py'den gelir: YKS_TARIH, LGS_TARIH
 
 
 def geri_sayim_goster(sinav_turu="YKS"):
@@ -359,6 +374,15 @@ def metric_card(etiket, deger, renk="var(--gradient-1)"):
     </div>"""
 
 
+def yerlesme_rozeti(tahmin, bolum):
+    """Öğrencinin deneme geçmişine göre yerleşme olasılığı rozeti (tahmin yoksa boş)."""
+    p = tahmin.olasilik(bolum) if tahmin else None
+    if p is None:
+        return ""
+    sinif = {"guvenli": "badge-guvenli", "dengeli": "badge-dengeli"}.get(tahmin.kategori(bolum), "badge-sans")
+    return f'<span class="uni-card-badge {sinif}">%{p * 100:.0f} yerleşme</span>'
+
+
 def format_siralama(s):
     if s is None:
         return "—"
@@ -456,6 +480,23 @@ with st.sidebar:
                 st.success(f"✅ {yeni_ad} eklendi!")
                 st.rerun()
 
+    # ── Erken Uyarılar (arka plan taramasından) ──
+    depo = uyari_deposu()
+    kurum_uyarilari = depo.tum_uyarilar(UyariSeviyesi.UYARI)
+    kural_hatasi = kural_yukleme_hatasi()
+    if kural_hatasi:
+        st.warning(f"⚙️ Kurum kural dosyası yüklenemedi, varsayılan kurallar kullanılıyor: {kural_hatasi}")
+    if depo.son_hata:
+        st.error(f"⚠️ Erken uyarı taraması başarısız ({(depo.son_hata_zamani or '').replace('T', ' ')}): "
+                 f"{depo.son_hata}. Liste son başarılı taramayı gösteriyor.")
+    with st.expander(f"🔔 Erken Uyarılar ({len(kurum_uyarilari)})"):
+        for u in kurum_uyarilari[:15]:
+            simge = "🚨" if u.seviye == UyariSeviyesi.KRITIK.name else "⚡"
+            st.markdown(f"{simge} **{u.ad}** – {u.mesaj}  \n<small>{u.zaman.replace('T', ' ')}</small>",
+                        unsafe_allow_html=True)
+        if not kurum_uyarilari:
+            st.caption("Etkin uyarı yok.")
+
     st.markdown("---")
     st.caption("v2.2.1 • Ultra-Profesyonel (Hotfix)")
 
@@ -536,9 +577,7 @@ with sekmeler[0]:
     if deneme_sayisi > 0:
         son_deneme = ogr.deneme_kayitlari[-1]
         son_toplam_net = sum(son_deneme.netleri.values())
-        ortalama_net = sum(
-            sum(d.netleri.values()) for d in ogr.deneme_kayitlari
-        ) / deneme_sayisi
+        ortalama_net = ogr.deneme_akisi.alan("toplam_net").ortalama
 
         # Trend hesapla
         if deneme_sayisi >= 2:
@@ -615,40 +654,163 @@ with sekmeler[0]:
                 )
                 st.plotly_chart(fig_pie, use_container_width=True)
 
-        # Detaylı analiz
-        # Detaylı analiz
-        rapor = analiz.tam_analiz()
-        if rapor:
-            st.markdown("<br>", unsafe_allow_html=True)
-            col_a1, col_a2, col_a3 = st.columns(3)
-            with col_a1:
-                st.markdown("#### 💪 Güçlü Dersler")
-                for d in (rapor.guclu_dersler or []):
-                    st.success(f"✅ {d}")
-            with col_a2:
-                st.markdown("#### ⚠️ Zayıf Dersler")
-                for d in (rapor.zayif_dersler or []):
-                    st.warning(f"📉 {d}")
-            with col_a3:
-                st.markdown("#### 🔥 Durum")
-                yanma = rapor.burnout
-                if yanma.seviye == UyariSeviyesi.KRITIK:
-                    st.error(f"🚨 {yanma.mesaj}")
-                elif yanma.seviye == UyariSeviyesi.UYARI:
-                    st.warning(f"⚡ {yanma.mesaj}")
-                elif yanma.seviye == UyariSeviyesi.DIKKAT:
-                    st.info(f"💡 {yanma.mesaj}")
+        # Sıralama gelişimi (saklanan puan geçmişinden; yeniden puanlama yok)
+        df_gecmis = puan_gecmisi_tablosu(ogr).dropna(subset=["Sıralama"])
+        if len(df_gecmis) >= 2:
+            st.subheader("📉 Tahmini Sıralama Gelişimi")
+            fig_sir = px.line(
+                df_gecmis, x="Tarih", y="Sıralama", color="Bölüm",
+                markers=True, hover_data=["Puan"],
+                template="plotly_dark",
+                color_discrete_sequence=px.colors.qualitative.Set2,
+            )
+            fig_sir.update_yaxes(autorange="reversed")
+            fig_sir.update_layout(
+                plot_bgcolor="rgba(0,0,0,0)",
+                paper_bgcolor="rgba(0,0,0,0)",
+                font_color="#9AA0A6",
+                legend=dict(orientation="h", yanchor="bottom", y=-0.3),
+                margin=dict(l=0, r=0, t=30, b=0),
+                height=320,
+            )
+            st.plotly_chart(fig_sir, use_container_width=True)
+
+        # Sınav günü projeksiyonu (sönümlü eğilim, yeni deneme gelene kadar önbellekte)
+        projeksiyon = net_tahmini(ogr)
+        if projeksiyon is not None:
+            st.subheader("🔮 Sınav Günü Projeksiyonu")
+            st.caption(
+                f"Son denemeden sınava {projeksiyon.ufuk_hafta:.0f} hafta · "
+                f"%80 aralık · eğim haftalar içinde sönümlenir"
+            )
+            pc1, pc2, pc3 = st.columns(3)
+            with pc1:
+                st.markdown(metric_card(
+                    "Tahmini Toplam Net",
+                    f"{projeksiyon.toplam_net:.1f} ({projeksiyon.toplam_net_alt:.0f}–{projeksiyon.toplam_net_ust:.0f})",
+                ), unsafe_allow_html=True)
+            with pc2:
+                st.markdown(metric_card(
+                    "Tahmini Puan",
+                    f"{projeksiyon.puan:.1f} ({projeksiyon.puan_alt:.0f}–{projeksiyon.puan_ust:.0f})",
+                    "linear-gradient(135deg, #00D2FF, #00E676)",
+                ), unsafe_allow_html=True)
+            with pc3:
+                st.markdown(metric_card(
+                    "Tahmini Sıralama",
+                    f"{projeksiyon.siralama:,}".replace(",", "."),
+                    "linear-gradient(135deg, #FF6D00, #FFD600)",
+                ), unsafe_allow_html=True)
+            df_proj = projeksiyon.ders_tablosu()
+            st.dataframe(pd.DataFrame({
+                "Bölüm": df_proj["bolum"],
+                "Ders": df_proj["ders"],
+                "Şu An": df_proj["son_duzey"].round(1),
+                "Haftalık Eğim": df_proj["haftalik_egim"].map(lambda e: f"{e:+.2f}"),
+                "Sınav Günü": df_proj["tahmin"].round(1),
+                "Aralık": [f"{a:.1f}–{u:.1f}" for a, u in zip(df_proj["alt"], df_proj["ust"])],
+            }), use_container_width=True, hide_index=True)
+
+        # Detaylı analiz (uyarılar erken uyarı deposundan okunur)
+        rapor = onbellekli_tam_analiz(ogr)   # Yeniden başlatmadan sonra da diskten
+        guclu_dersler, zayif_dersler = rapor.guclu_dersler, rapor.zayif_dersler
+        st.markdown("<br>", unsafe_allow_html=True)
+        col_a1, col_a2, col_a3 = st.columns(3)
+        with col_a1:
+            st.markdown("#### 💪 Güçlü Dersler")
+            for d in guclu_dersler:
+                st.success(f"✅ {d}")
+        with col_a2:
+            st.markdown("#### ⚠️ Zayıf Dersler")
+            for d in zayif_dersler:
+                st.warning(f"📉 {d}")
+        with col_a3:
+            st.markdown("#### 🔥 Durum")
+            uyarilar = uyari_deposu().ogrenci_uyarilari(ogr)
+            for u in uyarilar:
+                if u.seviye == UyariSeviyesi.KRITIK.name:
+                    st.error(f"🚨 {u.mesaj}")
+                elif u.seviye == UyariSeviyesi.UYARI.name:
+                    st.warning(f"⚡ {u.mesaj}")
                 else:
-                    st.success(f"✨ {yanma.mesaj}")
+                    st.info(f"💡 {u.mesaj}\n\n{u.detay}" if u.kaynak in ("zpd", "kural") else f"💡 {u.mesaj}")
+            if not uyarilar:
+                st.success("✨ ✅ Herhangi bir risk faktörü tespit edilmedi. Devam edin!")
+
+        # Ders bazında / gecikmeli korelasyonlar
+        with st.expander("🔗 Korelasyon Analizi (Çalışma · Stres · Uyku → Net)"):
+            col_k1, col_k2, col_k3 = st.columns(3)
+            with col_k1:
+                kor_yontem = st.radio("Yöntem", ["pearson", "spearman"], horizontal=True,
+                                      format_func=str.capitalize, key="kor_yontem")
+            with col_k2:
+                kor_gecikme = st.selectbox(
+                    "Gecikme", [0, 1, 2], key="kor_gecikme",
+                    format_func=lambda g: "Aynı deneme" if g == 0 else f"{g} deneme sonrası net",
+                )
+            with col_k3:
+                kor_kapsam = st.radio("Kapsam", ["Öğrenci", "Kurum geneli"], horizontal=True, key="kor_kapsam")
+
+            if kor_kapsam == "Öğrenci":
+                kor = onbellekli_korelasyon(ogr, yontem=kor_yontem, gecikme=kor_gecikme)
+            else:
+                kor = kohort_korelasyonlari(ogrenciler, yontem=kor_yontem, gecikme=kor_gecikme)
 
-                zpd = rapor.zpd
-                if zpd and zpd.durum:
-                    st.info(f"📐 ZPD: {zpd.durum}\n\n{zpd.aciklama}")
+            if kor.bos or kor.katsayilar.isna().all().all():
+                st.info("ℹ️ Korelasyon için en az 3 ortak gözlem gereklidir.")
+            else:
+                kor_tablo = kor.katsayilar.rename(
+                    index=lambda h: "Toplam Net" if h == "toplam_net" else h[len("net_"):],
+                    columns=FAKTOR_ETIKETLERI,
+                )
+                fig_kor = px.imshow(
+                    kor_tablo, zmin=-1, zmax=1, text_auto=".2f", aspect="auto",
+                    color_continuous_scale="RdBu", template="plotly_dark",
+                )
+                fig_kor.update_layout(
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    font_color="#9AA0A6",
+                    margin=dict(l=0, r=0, t=30, b=0),
+                    height=max(250, 32 * len(kor_tablo)),
+                )
+                st.plotly_chart(fig_kor, use_container_width=True)
+                st.caption(
+                    f"Gözlem sayısı: {int(kor.gozlem_sayilari.values.min())}–{int(kor.gozlem_sayilari.values.max())}. "
+                    + ("Kurum geneli katsayılar öğrenci içi merkezlenmiş verilerle hesaplanır." if kor_kapsam != "Öğrenci" else "")
+                )
 
 
     else:
         st.info("📝 Henüz deneme kaydı yok. **Deneme Ekle** sekmesinden ilk denemenizi girin!")
 
+    # Kurum geneli risk taraması
+    with st.expander("🚦 Kurum Geneli Risk Taraması (tüm öğrenciler)"):
+        risk_tablosu = kohort_risk_tablosu(ogrenciler)
+        st.dataframe(risk_ozeti(risk_tablosu), use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame({
+            "Öğrenci": risk_tablosu["ad"],
+            "Seviye": risk_tablosu["seviye"].map(lambda s: s.name),
+            "Burnout": risk_tablosu["burnout_tipi"].map(lambda t: t.value),
+            "Trend": risk_tablosu["trend"],
+            "Son Net": risk_tablosu["son_net"].round(1),
+            "ZPD": risk_tablosu["zpd_durumu"],
+            "Deneme": risk_tablosu["deneme_sayisi"],
+            "Kurum Kuralları": risk_tablosu["kural_uyarilari"],
+        }), use_container_width=True, hide_index=True)
+
+        st.markdown("#### 🔮 Sınav Günü Projeksiyonları")
+        proj_tablosu = tahmin_tablosu(ogrenciler)
+        if not proj_tablosu.empty:
+            st.dataframe(pd.DataFrame({
+                "Öğrenci": proj_tablosu["ad"],
+                "Sınav": proj_tablosu["sinav_turu"],
+                "Net": proj_tablosu["toplam_net"].round(1),
+                "Puan": proj_tablosu["puan"].round(1),
+                "Puan Aralığı": [f"{a:.0f}–{u:.0f}" for a, u in zip(proj_tablosu["puan_alt"], proj_tablosu["puan_ust"])],
+                "Sıralama": proj_tablosu["siralama"],
+            }).sort_values("Puan", ascending=False), use_container_width=True, hide_index=True)
+
 
 # ──────────────────────────────────────────────
 # SEKME 2: PUAN & SIRALAMA
@@ -712,7 +874,7 @@ with sekmeler[1]:
 
         with tab_sonuc:
             if st.button("🧮 Puanı Hesapla", use_container_width=True, key="btn_puan"):
-                sonuc = tam_puan_hesapla(tyt_netleri, ayt_netleri, puan_turu, ogr.obp)
+                sonuc = tam_puan_hesapla_onbellekli(tyt_netleri, ayt_netleri, puan_turu, ogr.obp)
                 tyt_p = sonuc.detay.get("TYT Puanı", 0)
 
                 col_r1, col_r2, col_r3, col_r4 = st.columns(4)
@@ -742,6 +904,64 @@ with sekmeler[1]:
                         fark = sonuc.tahmini_siralama - ogr.hedef_siralama
                         st.warning(f"📊 Hedefe {format_siralama(fark)} sıra daha var (Hedef: {format_siralama(ogr.hedef_siralama)})")
 
+            # Hedefe giden yol – slider her hareket ettiğinde yeniden çözülür
+            st.markdown("---")
+            st.markdown("#### 🧭 Hedefe Giden Yol")
+            hedef_sir_giris = st.slider(
+                "Hedef Sıralama", 1, 500_000, min(ogr.hedef_siralama or 50_000, 500_000),
+                step=500, key="plan_hedef_sir",
+            )
+            zor_dersler = st.multiselect(
+                "Zorlandığınız dersler (artış daha maliyetli sayılır)",
+                list(dict.fromkeys(list(tyt_netleri) + list(ayt_netleri))),
+                key="plan_zor_dersler",
+            )
+            plan = hedef_plani_hesapla(
+                {"TYT": tyt_netleri, "AYT": ayt_netleri}, hedef_sir_giris,
+                "YKS", puan_turu, ogr.obp,
+                zorluk_agirliklari={d: 2.0 for d in zor_dersler},
+            )
+            if not plan.artislar:
+                st.success(f"🎉 Mevcut netlerle hedef puana ({plan.hedef_puan:.1f}) ulaşıyorsunuz!")
+            else:
+                if not plan.ulasilabilir:
+                    st.error("⚠️ Soru sayısı sınırları içinde bu hedefe ulaşılamıyor; en yakın plan gösteriliyor.")
+                st.caption(
+                    f"Mevcut: {plan.mevcut_puan:.1f} → Hedef: {plan.hedef_puan:.1f} puan • "
+                    f"Toplam +{plan.toplam_net_artisi:.2f} net"
+                )
+                st.dataframe(pd.DataFrame([
+                    {"Ders": kalem, "Net Artışı": f"+{artis:.2f}"}
+                    for kalem, artis in plan.kalem_artislari.items()
+                ]), use_container_width=True, hide_index=True)
+
+            # Hangi ders net başına en çok sıra kazandırır?
+            st.markdown("---")
+            st.markdown("#### 🔥 Ders Duyarlılığı (+net → kazanılan sıra)")
+            duyarlilik = ders_duyarliligi(
+                {"TYT": tyt_netleri, "AYT": ayt_netleri}, "YKS", puan_turu, ogr.obp,
+            )
+            fig_dy = px.imshow(
+                duyarlilik.siralama_kazanci,
+                x=[f"+{d:g}" for d in duyarlilik.deltalar],
+                y=duyarlilik.kalemler,
+                color_continuous_scale="Viridis",
+                labels=dict(x="Net Artışı", y="Ders", color="Kazanılan Sıra"),
+                template="plotly_dark",
+                aspect="auto",
+            )
+            fig_dy.update_layout(
+                plot_bgcolor="rgba(0,0,0,0)",
+                paper_bgcolor="rgba(0,0,0,0)",
+                font_color="#9AA0A6",
+                margin=dict(l=0, r=0, t=30, b=0),
+                height=420,
+            )
+            st.plotly_chart(fig_dy, use_container_width=True)
+            en_verimli = next(iter(duyarlilik.net_basina_siralama.items()))
+            st.caption(f"💡 Net başına en çok sıra kazandıran ders: **{en_verimli[0]}** "
+                       f"(~{format_siralama(int(en_verimli[1]))} sıra/net)")
+
     else:
         # LGS
         st.markdown("**LGS – Liseye Geçiş Sınavı** (90 soru)")
@@ -756,7 +976,7 @@ with sekmeler[1]:
                 )
 
         if st.button("🧮 LGS Puanı Hesapla", use_container_width=True, key="btn_lgs"):
-            sonuc = lgs_puan_hesapla(lgs_netleri)
+            sonuc = lgs_puan_hesapla_onbellekli(lgs_netleri)
             col_l1, col_l2, col_l3 = st.columns(3)
             with col_l1:
                 st.markdown(metric_card("LGS Puanı", f"{sonuc.puan:.1f}"), unsafe_allow_html=True)
@@ -767,6 +987,27 @@ with sekmeler[1]:
                 st.markdown(metric_card("Yüzdelik", f"%{sonuc.tahmini_yuzdelik:.1f}",
                                          "linear-gradient(135deg, #FF6D00, #FFD600)"), unsafe_allow_html=True)
 
+    # Deneme geçmişinden sınav günü dağılımı
+    if ogr.trend_kayitlari:
+        with st.expander("🎲 Sınav Günü Simülasyonu (Monte Carlo)"):
+            sim = puan_dagilimi_simule(ogr, ornek_sayisi=5000, tohum=0)
+            sc1, sc2, sc3 = st.columns(3)
+            with sc1:
+                st.markdown(metric_card("Medyan Puan", f"{sim.puan_yuzdelikleri[50]:.1f}"), unsafe_allow_html=True)
+            with sc2:
+                st.markdown(metric_card("%90 Aralık",
+                                         f"{format_siralama(sim.siralama_yuzdelikleri[5])} – {format_siralama(sim.siralama_yuzdelikleri[95])}",
+                                         "linear-gradient(135deg, #00D2FF, #00E676)"), unsafe_allow_html=True)
+            with sc3:
+                olasilik = f"%{sim.hedef_olasiligi * 100:.0f}" if sim.hedef_olasiligi is not None else "—"
+                st.markdown(metric_card("Hedefi Tutturma", olasilik,
+                                         "linear-gradient(135deg, #FF6D00, #FFD600)"), unsafe_allow_html=True)
+            st.dataframe(pd.DataFrame({
+                "Yüzdelik": [f"%{p}" for p in sim.puan_yuzdelikleri],
+                "Puan": list(sim.puan_yuzdelikleri.values()),
+                "Sıralama": [format_siralama(v) for v in sim.siralama_yuzdelikleri.values()],
+            }), use_container_width=True, hide_index=True)
+
 
 # ──────────────────────────────────────────────
 # SEKME 3: ÜNİVERSİTE ÖNERİ
@@ -775,8 +1016,61 @@ with sekmeler[2]:
     st.subheader("🏛️ Üniversite & Bölüm Öneri Sistemi")
 
     if ogr.sinav_turu == "LGS":
-        st.info("🎓 Bu özellik YKS öğrencileri için aktiftir. LGS lise tercih rehberi yakında!")
+        st.caption("🎓 LGS Lise Tercih Rehberi")
+        son_lgs = lgs_puan_hesapla_onbellekli(ogr.son_trend_denemesi.netleri) if ogr.son_trend_denemesi else None
+
+        col_l1, col_l2, col_l3 = st.columns(3)
+        with col_l1:
+            lise_modu = st.radio("Öneri Bazı", ["Yüzdelik Dilim", "LGS Puanı"], horizontal=True, key="lise_mod")
+        with col_l2:
+            lise_sehir = st.selectbox("Şehir (Opsiyonel)", ["Tümü"] + lise_sehirleri(), key="lise_sehir")
+        with col_l3:
+            lise_tur = st.selectbox("Okul Türü (Opsiyonel)", ["Tümü"] + lise_turleri(), key="lise_tur")
+        lise_filtreleri = {
+            "sehir": lise_sehir if lise_sehir != "Tümü" else None,
+            "tur": lise_tur if lise_tur != "Tümü" else None,
+        }
+
+        if lise_modu == "Yüzdelik Dilim":
+            varsayilan = float(son_lgs.tahmini_yuzdelik) if son_lgs else 5.0
+            yuzdelik_giris = st.number_input("Yüzdelik Diliminiz (%)", 0.01, 100.0, varsayilan, step=0.1, key="lise_yuzdelik")
+            lise_onerileri = lise_oner(yuzdelik_giris, **lise_filtreleri)
+        else:
+            varsayilan = float(son_lgs.puan) if son_lgs else 400.0
+            lgs_puan_giris = st.number_input("LGS Puanınız", 100.0, 500.0, varsayilan, key="lise_puan")
+            lise_onerileri = lise_oner_puan(lgs_puan_giris, **lise_filtreleri)
+        if son_lgs:
+            st.caption(f"Son denemenize göre: {son_lgs.puan:.1f} puan • %{son_lgs.tahmini_yuzdelik:.2f} dilim")
+
+        for kategori, baslik, aciklama, renk in (
+            ("guvenli", "### 🟢 Güvenli Tercihler", "Yüzdelik diliminizle rahatlıkla yerleşebileceğiniz liseler", "var(--accent-success)"),
+            ("dengeli", "### 🟡 Dengeli Tercihler", "Diliminize yakın, iyi şansınız olan liseler", "var(--accent-primary)"),
+            ("sans", "### 🔴 Şans Tercihleri", "Biraz risk içeren ama şansınızı deneyebileceğiniz liseler", "var(--accent-danger)"),
+        ):
+            st.markdown(baslik)
+            st.caption(aciklama)
+            if not lise_onerileri[kategori]:
+                st.caption("Bu aralıkta lise bulunamadı.")
+            for l in lise_onerileri[kategori]:
+                st.markdown(f"""
+                <div class="uni-card">
+                    <div style="display:flex; justify-content:space-between; align-items:center;">
+                        <div>
+                            <div class="uni-card-title">{l.okul}</div>
+                            <div class="uni-card-subtitle">{l.ilce} / {l.sehir} • Kontenjan: {l.kontenjan}</div>
+                        </div>
+                        <div style="text-align:right;">
+                            <div><span class="uni-card-badge badge-{kategori}">{l.tur}</span></div>
+                            <div style="color:{renk}; font-weight:700;">{l.taban_puan:.1f} puan</div>
+                            <div style="color:var(--text-muted); font-size:0.8rem;">Dilim: %{l.yuzdelik:.2f}</div>
+                        </div>
+                    </div>
+                </div>""", unsafe_allow_html=True)
     else:
+        katalog_yillari_listesi = katalog_yillari()
+        if len(katalog_yillari_listesi) > 1:
+            katalog_yili_sec(st.selectbox("Katalog Yılı", katalog_yillari_listesi, key="katalog_yili"))
+
         col_f1, col_f2, col_f3 = st.columns(3)
         with col_f1:
             oneri_modu = st.radio("Öneri Bazı", ["Mevcut Puan", "Hedef Sıralama"], horizontal=True, key="oneri_mod")
@@ -784,7 +1078,11 @@ with sekmeler[2]:
             filtre_pt = st.selectbox("Puan Türü", ["SAY", "EA", "SOZ"], key="filtre_pt",
                                       index=["SAY", "EA", "SOZ"].index(ogr.hedef_puan_turu) if ogr.hedef_puan_turu in ["SAY", "EA", "SOZ"] else 0)
         with col_f3:
-            filtre_sehir = st.selectbox("Şehir (Opsiyonel)", ["Tümü"] + benzersiz_sehirler(), key="filtre_sehir")
+            sehir_sayimlari = dict(faset_sayimlari("sehir", {"puan_turu": filtre_pt}))
+            filtre_sehir = st.selectbox(
+                "Şehir (Opsiyonel)", ["Tümü"] + list(sehir_sayimlari), key="filtre_sehir",
+                format_func=lambda s: s if s == "Tümü" else f"{s} ({sehir_sayimlari[s]})",
+            )
 
         oneriler = {}
         if oneri_modu == "Mevcut Puan":
@@ -795,13 +1093,14 @@ with sekmeler[2]:
            hedef = ogr.hedef_siralama or 50000
            hedef_giris = st.number_input("Hedef Sıralama", 1, 3_000_000, hedef, key="filtre_sir")
            
-           # Sıralama mantığı: Hedefin %20 altı ve %20 üstü
-           tum = bolum_ara(puan_turu=filtre_pt, sehir=filtre_sehir if filtre_sehir != "Tümü" else None)
-           oneriler = {
-               "guvenli": [b for b in tum if b.siralama >= hedef_giris * 1.2][:8], # Daha kötü sıralama = güvenli
-               "dengeli": [b for b in tum if hedef_giris * 0.8 <= b.siralama <= hedef_giris * 1.2][:8],
-               "sans": [b for b in tum if b.siralama < hedef_giris * 0.8][:8], # Daha iyi sıralama = şans
-           }
+           oneriler = universite_oner_siralama(
+               hedef_giris, filtre_pt, sehir=filtre_sehir if filtre_sehir != "Tümü" else None,
+           )
+
+        yerlesme_tahmini = ogrenci_yerlesme_tahmini(ogr)
+        tahmin_yili = projeksiyon_yili()
+        if tahmin_yili and oneri_katalogu().bolumler[0].yil == tahmin_yili:
+            st.caption(f"📈 Öneriler {tahmin_yili} için tahmin edilen taban puan ve sıralamalara göre yapılmıştır.")
 
         # Güvenli
         st.markdown("### 🟢 Güvenli Tercihler")
@@ -817,7 +1116,7 @@ with sekmeler[2]:
                         <div class="uni-card-subtitle">{b.universite} • {b.sehir} • {b.tur}</div>
                     </div>
                     <div style="text-align:right;">
-                        <div><span class="uni-card-badge badge-guvenli">{b.puan_turu}</span></div>
+                        <div><span class="uni-card-badge badge-guvenli">{b.puan_turu}</span> {yerlesme_rozeti(yerlesme_tahmini, b)}</div>
                         <div style="color:var(--accent-success); font-weight:700;">{b.taban_puan:.1f} puan</div>
                         <div style="color:var(--text-muted); font-size:0.8rem;">Sıra: {format_siralama(b.siralama)}</div>
                     </div>
@@ -838,7 +1137,7 @@ with sekmeler[2]:
                         <div class="uni-card-subtitle">{b.universite} • {b.sehir} • {b.tur}</div>
                     </div>
                     <div style="text-align:right;">
-                        <div><span class="uni-card-badge badge-dengeli">{b.puan_turu}</span></div>
+                        <div><span class="uni-card-badge badge-dengeli">{b.puan_turu}</span> {yerlesme_rozeti(yerlesme_tahmini, b)}</div>
                         <div style="color:var(--accent-primary); font-weight:700;">{b.taban_puan:.1f} puan</div>
                         <div style="color:var(--text-muted); font-size:0.8rem;">Sıra: {format_siralama(b.siralama)}</div>
                     </div>
@@ -859,19 +1158,53 @@ with sekmeler[2]:
                         <div class="uni-card-subtitle">{b.universite} • {b.sehir} • {b.tur}</div>
                     </div>
                     <div style="text-align:right;">
-                        <div><span class="uni-card-badge badge-sans">{b.puan_turu}</span></div>
+                        <div><span class="uni-card-badge badge-sans">{b.puan_turu}</span> {yerlesme_rozeti(yerlesme_tahmini, b)}</div>
                         <div style="color:var(--accent-danger); font-weight:700;">{b.taban_puan:.1f} puan</div>
                         <div style="color:var(--text-muted); font-size:0.8rem;">Sıra: {format_siralama(b.siralama)}</div>
                     </div>
                 </div>
             </div>""", unsafe_allow_html=True)
 
+        # Tercih listesi
+        st.markdown("---")
+        st.subheader("📝 Tercih Listesi Sihirbazı")
+        st.caption("Deneme geçmişinizden tahmin edilen puan dağılımıyla beklenen faydayı en yükselten liste")
+        col_t1, col_t2, col_t3 = st.columns(3)
+        with col_t1:
+            tercih_sehirler = st.multiselect("Tercih edilen şehirler", benzersiz_sehirler(), key="tercih_sehirler")
+        with col_t2:
+            tercih_bolumler = st.text_input("Öncelikli bölümler (virgülle)", key="tercih_bolumler")
+        with col_t3:
+            tercih_uzunluk = st.slider("Liste uzunluğu", 1, 24, 24, key="tercih_uzunluk")
+        if st.button("🎯 Tercih Listesi Oluştur", key="tercih_olustur"):
+            agirliklar = TercihAgirliklari(
+                bolumler={b.strip(): 1.5 for b in tercih_bolumler.split(",") if b.strip()},
+                sehirler={s: 1.3 for s in tercih_sehirler},
+            )
+            tercih_listesi = ogrenci_tercih_listesi(ogr, agirliklar, tercih_uzunluk)
+            if tercih_listesi is None or not tercih_listesi.secimler:
+                st.warning("Tercih listesi için yeterli deneme verisi veya uygun program bulunamadı.")
+            else:
+                st.caption(
+                    f"Herhangi bir tercihe yerleşme olasılığı: %{tercih_listesi.toplam_yerlesme_olasiligi * 100:.1f} • "
+                    f"{tercih_listesi.aday_sayisi} aday program değerlendirildi"
+                )
+                st.dataframe(pd.DataFrame([{
+                    "Sıra": t.sira,
+                    "Üniversite": t.bolum.universite,
+                    "Bölüm": t.bolum.bolum,
+                    "Şehir": t.bolum.sehir,
+                    "Taban Puan": t.bolum.taban_puan,
+                    "Kabul Olasılığı": f"%{t.kabul_olasiligi * 100:.1f}",
+                    "Yerleşme Olasılığı": f"%{t.yerlesme_olasiligi * 100:.1f}",
+                } for t in tercih_listesi.secimler]), use_container_width=True, hide_index=True)
+
         # Bölüm arama
         st.markdown("---")
         st.subheader("🔍 Bölüm Arama")
-        arama = st.text_input("Bölüm adı yazın...", key="bolum_arama")
+        arama = st.text_input("Bölüm, üniversite veya şehir yazın...", key="bolum_arama")
         if arama:
-            bulunanlar = bolum_ara(bolum_adi=arama, puan_turu=filtre_pt)
+            bulunanlar = bolum_ara_bulanik(arama, puan_turu=filtre_pt, limit=50)
             if bulunanlar:
                 df_b = pd.DataFrame([{
                     "Üniversite": b.universite,
@@ -886,6 +1219,31 @@ with sekmeler[2]:
             else:
                 st.warning("Bu kriterlere uygun bölüm bulunamadı.")
 
+        # Kurum geneli erişim
+        # Matris toplu işle kurulur (python -m core.erisilebilirlik); burada yalnızca okunur
+        with st.expander("🏫 Kurum Geneli Erişim (tüm öğrenciler)"):
+            erisim = kayitli_erisim_matrisi()
+            if st.button("🔄 Erişim matrisini yeniden oluştur", key="erisim_olustur"):
+                with st.spinner("Öğrenci × program matrisi kuruluyor..."):
+                    erisim_matrisi_olustur(ogrenciler).kaydet(VARSAYILAN_MATRIS_YOLU)
+                erisim = kayitli_erisim_matrisi()
+            if erisim is None:
+                st.info("Güncel katalogla kaydedilmiş erişim matrisi yok. Oluşturmak için yukarıdaki "
+                        "düğmeyi kullanın ya da `python -m core.erisilebilirlik` işini çalıştırın.")
+            else:
+                olusturma = datetime.fromtimestamp(VARSAYILAN_MATRIS_YOLU.stat().st_mtime)
+                st.caption(f"{len(erisim.ogrenci_idleri)} öğrenci × {len(erisim.katalog)} program • "
+                           f"oluşturma: {olusturma:%d.%m.%Y %H:%M}")
+                col_e1, col_e2 = st.columns(2)
+                with col_e1:
+                    st.caption("Şehir bazında en az bir programa ulaşabilen öğrenci sayısı")
+                    st.dataframe(erisim.sehir_ozeti().head(15), use_container_width=True, hide_index=True)
+                with col_e2:
+                    st.caption("Üniversite bazında")
+                    st.dataframe(erisim.universite_ozeti().head(15), use_container_width=True, hide_index=True)
+                st.caption("Program bazında ulaşabilen öğrenci sayısı")
+                st.dataframe(erisim.program_ozeti().head(30), use_container_width=True, hide_index=True)
+
 
 # ──────────────────────────────────────────────
 # SEKME 4: KONU TAKİBİ
@@ -893,6 +1251,37 @@ with sekmeler[2]:
 with sekmeler[3]:
     st.subheader("📚 Konu Bazlı İlerleme Takibi")
 
+    with st.expander("🎯 Öncelikli Konular (hata × soru ağırlığı × kalan ilerleme)", expanded=True):
+        oncelikler = analiz.konu_oncelikleri(10)
+        st.dataframe(pd.DataFrame({
+            "Bölüm": oncelikler["bolum"],
+            "Ders": oncelikler["ders"],
+            "Konu": oncelikler["konu"],
+            "Beklenen Soru": oncelikler["beklenen_soru"].round(1),
+            "Hata": oncelikler["hata_sayisi"],
+            "İlerleme": [f"%{v * 100:.0f}" for v in oncelikler["ilerleme"]],
+            "Öncelik": oncelikler["oncelik"].round(2),
+        }), use_container_width=True, hide_index=True)
+        eslesmeyen = eslesmeyen_hatalar(ogr)
+        st.caption(
+            "Öncelik, sınavda o konudan kaybedilmesi beklenen soru sayısıdır: "
+            "son yılların ortalama soru sayısı × düzleştirilmiş hata oranı × (1 − ilerleme)."
+            + (f" {len(eslesmeyen)} hata kaydı hiçbir konuyla eşleşmedi." if eslesmeyen else "")
+        )
+
+    with st.expander("🏫 Kurum Geneli: Sıradaki Konular (tüm öğrenciler)"):
+        kohort_oncelik = kohort_konu_oncelikleri(ogrenciler)
+        st.dataframe(pd.DataFrame({
+            "Bölüm": kohort_oncelik["bolum"],
+            "Ders": kohort_oncelik["ders"],
+            "Konu": kohort_oncelik["konu"],
+            "İlk 5'inde Olan Öğrenci": kohort_oncelik["ilk_n_ogrenci"],
+            "Öğrenci": kohort_oncelik["ogrenci_sayisi"],
+            "Ort. Öncelik": kohort_oncelik["ortalama_oncelik"].round(2),
+            "Toplam Hata": kohort_oncelik["toplam_hata"],
+            "Ort. İlerleme": (kohort_oncelik["ortalama_ilerleme"] * 100).round(0),
+        }).head(30), use_container_width=True, hide_index=True)
+
     if ogr.sinav_turu == "LGS":
         alt_sinav = "LGS"
         dersler = list(LGS_KONULARI.keys())
@@ -1036,7 +1425,12 @@ with sekmeler[4]:
             ogr.deneme_ekle(kayit)
             repo.kaydet(ogr)
             st.success(f"✅ Deneme kaydedildi! Toplam net: {sum(netleri_filtre.values()):.1f}")
-            st.rerun()
+            if kayit.anomali:
+                # Şüpheli kayıt: rerun yapılmaz, danışman uyarıyı görsün
+                st.warning("⚠️ Bu deneme olağan dışı görünüyor ve onaylanana kadar trend analizine alınmayacak:\n\n"
+                           + "\n".join(f"- {n}" for n in kayit.anomali["nedenler"]))
+            else:
+                st.rerun()
         else:
             st.error("⚠️ En az bir derse net girmelisiniz!")
 
@@ -1049,12 +1443,28 @@ with sekmeler[4]:
             toplam = sum(d.netleri.values())
             gecmis_data.append({
                 "Tarih": d.tarih.isoformat(),
+                "Durum": ("✔️ Onaylı" if d.onaylandi else "⚠️ Şüpheli") if d.anomali else "",
                 "Not": d.notlar or "—",
                 "Toplam Net": f"{toplam:.1f}",
                 **{k: f"{v:.1f}" for k, v in d.netleri.items()},
             })
         st.dataframe(pd.DataFrame(gecmis_data), use_container_width=True, hide_index=True)
 
+        # Şüpheli (onaylanmamış) denemeler: trend analizinden hariç tutulur
+        supheliler = [d for d in ogr.deneme_kayitlari if d.anomali and not d.onaylandi]
+        if supheliler:
+            st.markdown("#### ⚠️ Şüpheli Denemeler")
+            st.caption("Bu kayıtlar burnout, ZPD ve projeksiyon hesaplarına alınmıyor. "
+                       "Netler doğruysa onaylayın; onaylanmayan kayıt dışarıda kalmaya devam eder.")
+            for d in supheliler:
+                with st.expander(f"{d.tarih.isoformat()} · {d.toplam_net:.1f} net · {d.notlar or '—'}"):
+                    for neden in d.anomali["nedenler"]:
+                        st.markdown(f"- {neden}")
+                    if st.button("✔️ Netler doğru, trende dahil et", key=f"onayla_{d.id}"):
+                        ogr.deneme_onayla(d.id)
+                        repo.kaydet(ogr)
+                        st.rerun()
+
 
 # ──────────────────────────────────────────────
 # SEKME 6: TEKRAR TAKİBİ (Ebbinghaus)
@@ -1113,6 +1523,25 @@ with sekmeler[5]:
                             st.rerun()
             else:
                 st.info("🎉 Yaklaşan tekrar yok. Tüm tekrarlar tamamlandı!")
+
+            st.markdown("---")
+            st.markdown("#### 🗺️ Ders Bazında Hata Yoğunluğu")
+            df_hata = onbellekli_hata_haritasi(ogr)
+            fig_hata = px.bar(
+                df_hata, x="Hata Sayısı", y="Ders", orientation="h",
+                template="plotly_dark",
+                color="Bekleyen Tekrar",
+                color_continuous_scale="Reds",
+            )
+            fig_hata.update_layout(
+                plot_bgcolor="rgba(0,0,0,0)",
+                paper_bgcolor="rgba(0,0,0,0)",
+                font_color="#9AA0A6",
+                margin=dict(l=0, r=0, t=30, b=0),
+                height=300,
+                yaxis=dict(autorange="reversed"),
+            )
+            st.plotly_chart(fig_hata, use_container_width=True)
         else:
             st.info("📌 Henüz hata kaydı yok. Sol taraftan yeni hata girebilirsiniz.")
 
@@ -12,13 +12,13 @@ Kapsanan Psikolojik Kuramlar:
 
 from __future__ import annotations
 
-import statistics
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from core.onbellek import LRUOnbellek
 from models.ogrenci_sinifi import DenemeKaydi, HataKaydi, Ogrenci
 
 
@@ -74,6 +74,68 @@ class GenelRapor:
     zayif_dersler: List[str]
     bugunun_tekrarlari: List[HataKaydi]
     uyku_uyarisi: Optional[str]
+    kural_uyarilari: list = field(default_factory=list)   # core.kural_motoru.KuralSonucu
+
+
+# ──────────────────────────────────────────────
+# Deneme veri çerçevesi önbelleği
+# ──────────────────────────────────────────────
+@dataclass
+class _CerceveGirdisi:
+    veri_surumu: int
+    deneme_idleri: Tuple[str, ...]
+    df: pd.DataFrame
+
+
+_CERCEVE_ONBELLEGI = LRUOnbellek("veri_cercevesi", kapasite=512)
+
+
+def _cerceve_olustur(kayitlar: List[DenemeKaydi]) -> pd.DataFrame:
+    """Deneme kayıtlarından çerçeve; tarih sütunu tek seferde dönüştürülür."""
+    df = pd.DataFrame([
+        {
+            "tarih": k.tarih,
+            "toplam_net": k.toplam_net,
+            "calisma_saati": k.calisma_saati,
+            "stres_puani": k.stres_puani,
+            "uyku_saati": k.uyku_saati,
+            **{f"net_{ders}": net for ders, net in k.netleri.items()},
+        }
+        for k in kayitlar
+    ])
+    df["tarih"] = pd.to_datetime(df["tarih"])
+    return df
+
+
+def deneme_cercevesi(ogrenci: Ogrenci) -> pd.DataFrame:
+    """
+    Öğrencinin trende giren denemelerinin çerçevesi (tarihe göre sıralı;
+    onaylanmamış şüpheli denemeler hariç). Önbellekteki çerçeve
+    aynı veri sürümüne aitse doğrudan döner; arada yalnızca deneme_ekle ile
+    sona denemeler eklenmişse bunlar eklenir, aksi halde çerçeve yeniden kurulur.
+    """
+    kayitlar = ogrenci.trend_kayitlari
+    if not kayitlar:
+        return pd.DataFrame()
+    idler = tuple(k.id for k in kayitlar)
+    girdi = _CERCEVE_ONBELLEGI.bul(ogrenci.ogrenci_id)
+    if girdi is not None and girdi.deneme_idleri == idler and girdi.veri_surumu == ogrenci.veri_surumu:
+        return girdi.df
+
+    eski = len(girdi.deneme_idleri) if girdi is not None else 0
+    # Artımlı ekleme: eski denemeler değişmemiş ve sürüm yalnızca eklemeler kadar ilerlemiş
+    if (
+        0 < eski < len(idler)
+        and idler[:eski] == girdi.deneme_idleri
+        and ogrenci.veri_surumu - girdi.veri_surumu == len(idler) - eski
+    ):
+        df = pd.concat([girdi.df, _cerceve_olustur(kayitlar[eski:])], ignore_index=True)
+    else:
+        df = _cerceve_olustur(kayitlar)
+    if not df["tarih"].is_monotonic_increasing:
+        df = df.sort_values("tarih", kind="stable").reset_index(drop=True)
+    _CERCEVE_ONBELLEGI.koy(ogrenci.ogrenci_id, _CerceveGirdisi(ogrenci.veri_surumu, idler, df))
+    return df
 
 
 # ──────────────────────────────────────────────
@@ -97,43 +159,24 @@ class AnalizMotoru:
     YUKSEK_STRES_ESIGI = 7  # Stres puanı ≥ 7 → yüksek stres
     DUSUK_UYKU_ESIGI = 6.0  # 6 saatten az uyku → uyarı
     CALISMA_ARTIS_ESIGI = 1.15  # %15 artış = belirgin artış
+    KARSILASTIRMA_TOLERANSI = 1e-9
 
     def __init__(self, ogrenci: Ogrenci):
         self.ogrenci = ogrenci
-        self._df: Optional[pd.DataFrame] = None  # Lazy cache
 
     # ── DataFrame yardımcısı ───────────────────
 
     def veri_cercevesi(self) -> pd.DataFrame:
         """
         Tüm deneme kayıtlarını analiz için pandas DataFrame'e dönüştürür.
-        Tekrar oluşturmayı önlemek için sonuç önbelleğe alınır.
+        Sonuç süreç genelinde (öğrenci id, veri sürümü) ile önbelleğe alınır;
+        yalnızca yeni denemeler eklenmişse mevcut çerçeveye eklenir.
+        Dönen çerçeve paylaşılır, değiştirilmemelidir.
         """
-        if self._df is not None:
-            return self._df
-
-        kayitlar = self.ogrenci.deneme_kayitlari
-        if not kayitlar:
-            return pd.DataFrame()
-
-        satirlar = []
-        for k in kayitlar:
-            satir = {
-                "tarih": pd.to_datetime(k.tarih),
-                "toplam_net": k.toplam_net,
-                "calisma_saati": k.calisma_saati,
-                "stres_puani": k.stres_puani,
-                "uyku_saati": k.uyku_saati,
-            }
-            satir.update({f"net_{ders}": net for ders, net in k.netleri.items()})
-            satirlar.append(satir)
-
-        self._df = pd.DataFrame(satirlar).sort_values("tarih").reset_index(drop=True)
-        return self._df
+        return deneme_cercevesi(self.ogrenci)
 
     def df_sifirla(self) -> None:
-        """Yeni veri eklendikten sonra cache'i temizle."""
-        self._df = None
+        """Geriye dönük uyumluluk için; önbellek veri sürümüyle güncellendiğinden gerekmez."""
 
     # ── Tükenmişlik Dedektörü ─────────────────
 
@@ -147,120 +190,31 @@ class AnalizMotoru:
           - Net trendi
           - Stres puanı trendi
           - Uyku süresi
+
+        Kurallar ve eşikleri core/kural_motoru.py'de veriyle tanımlıdır
+        (data/kurallar.json ile değiştirilebilir); sınıf sabitleri varsayılanlardır.
         """
-        kayitlar = self.ogrenci.deneme_kayitlari
+        from core.kural_motoru import ogrenci_kurallari  # döngüsel içe aktarmayı önler
+
+        kayitlar = self.ogrenci.trend_kayitlari  # Onaylanmamış şüpheli denemeler hariç
         if len(kayitlar) < self.MIN_KAYIT_BURNOUT:
             return BurnoutRaporu(
                 mesaj="ℹ️ Trend analizi için en az 2 deneme kaydı gereklidir.",
                 detay="Daha fazla veri girin.",
             )
 
-        # Son 2 ve önceki 2 kaydı karşılaştır (rolling window)
-        yarim = max(1, len(kayitlar) // 2)
-        eski = kayitlar[:yarim]
-        yeni = kayitlar[yarim:]
-
-        ort_net_eski = statistics.mean(k.toplam_net for k in eski)
-        ort_net_yeni = statistics.mean(k.toplam_net for k in yeni)
-        ort_calisma_eski = statistics.mean(k.calisma_saati for k in eski)
-        ort_calisma_yeni = statistics.mean(k.calisma_saati for k in yeni)
-        son_stres = kayitlar[-1].stres_puani
-        son_uyku = kayitlar[-1].uyku_saati
-
-        net_dusmus = ort_net_yeni < ort_net_eski
-        calisma_artmis = ort_calisma_yeni > ort_calisma_eski * self.CALISMA_ARTIS_ESIGI
-        calisma_dusmis = ort_calisma_yeni < ort_calisma_eski / self.CALISMA_ARTIS_ESIGI
-        yuksek_stres = son_stres >= self.YUKSEK_STRES_ESIGI
-        dusuk_uyku = son_uyku < self.DUSUK_UYKU_ESIGI
-
-        # ── Kural 1: Akademik Tükenmişlik ──
-        if calisma_artmis and net_dusmus and yuksek_stres:
-            return BurnoutRaporu(
-                tip=BurnoutTipi.AKADEMIK_TUKENME,
-                seviye=UyariSeviyesi.KRITIK,
-                mesaj="🚨 KRİTİK UYARI: Akademik Tükenmişlik Riski!",
-                detay=(
-                    f"Çalışma saati artmasına rağmen ({ort_calisma_eski:.1f}h → {ort_calisma_yeni:.1f}h) "
-                    f"netler düşüyor ({ort_net_eski:.1f} → {ort_net_yeni:.1f}). "
-                    f"Stres puanı: {son_stres}/10. Bu klasik tükenmişlik göstergesidir."
-                ),
-                oneriler=self._tukenme_onerileri(),
-            )
-
-        # ── Kural 2: Kaygı Kaynaklı Kaçınma ──
-        if calisma_dusmis and net_dusmus and yuksek_stres:
-            return BurnoutRaporu(
-                tip=BurnoutTipi.KAYGI_KACINMA,
-                seviye=UyariSeviyesi.UYARI,
-                mesaj="⚠️ UYARI: Kaygı Kaynaklı Kaçınma Davranışı!",
-                detay=(
-                    f"Hem çalışma saati ({ort_calisma_eski:.1f}h → {ort_calisma_yeni:.1f}h) "
-                    f"hem de netler ({ort_net_eski:.1f} → {ort_net_yeni:.1f}) düşüyor. "
-                    f"Yüksek stres ({son_stres}/10) ile birleştiğinde, kaçınma davranışı olasıdır."
-                ),
-                oneriler=self._kaygi_onerileri(),
-            )
-
-        # ── Kural 3: Uyku Bozukluğu ──
-        if dusuk_uyku and net_dusmus:
-            return BurnoutRaporu(
-                tip=BurnoutTipi.UYKU_BOZUKLUGU,
-                seviye=UyariSeviyesi.UYARI,
-                mesaj="😴 UYARI: Yetersiz Uyku Performansı Olumsuz Etkiliyor!",
-                detay=(
-                    f"Ortalama {son_uyku:.1f} saat uyku, bilişsel performans için yetersiz. "
-                    "Araştırmalar, 7 saatin altındaki uykunun hafıza konsolidasyonunu "
-                    "önemli ölçüde bozduğunu göstermektedir."
-                ),
-                oneriler=self._uyku_onerileri(),
-            )
-
-        # ── Kural 4: Motivasyon Kaybı (sessiz düşüş) ──
-        if net_dusmus and not yuksek_stres and calisma_dusmis:
-            return BurnoutRaporu(
-                tip=BurnoutTipi.MOTIVASYON_KAYBI,
-                seviye=UyariSeviyesi.DIKKAT,
-                mesaj="💡 DİKKAT: Motivasyon Düşüşü Belirtileri",
-                detay="Çalışma süresi ve netler düşüyor, ancak stres düşük. "
-                      "Bu genellikle motivasyon kaybına işaret eder.",
-                oneriler=[
-                    "Kısa vadeli, somut hedefler belirleyin (haftalık mini hedefler).",
-                    "Çalışma ortamını değiştirin (kütüphane, kafe).",
-                    "Hedef bölümünüzle ilgili motivasyon kaynaklarına bakın.",
-                    "Grup çalışması veya çalışma arkadaşı edinin.",
-                ],
-            )
-
-        return BurnoutRaporu(mesaj="✅ Herhangi bir risk faktörü tespit edilmedi. Devam edin!")
-
-    def _tukenme_onerileri(self) -> List[str]:
-        return [
-            "📅 Bu hafta çalışma süresini %25-30 azaltın.",
-            "🎯 'Derin çalışma' tekniğine geçin: 90 dk odaklanma + 20 dk tam dinlenme.",
-            "🏃 Günde en az 30 dk hafif egzersiz ekleyin (yürüyüş yeterli).",
-            "📵 Sosyal medyayı çalışma saatleri dışında tamamen kesin.",
-            "🛌 Uyku düzenini sabitleyin (aynı saat kalkış-yatış).",
-            "📞 Bu haftayı 'toparlanma haftası' olarak ilan edin; danışmanınızla görüşün.",
-        ]
-
-    def _kaygi_onerileri(self) -> List[str]:
-        return [
-            "🧘 Günde 10 dk mindfulness/nefes egzersizi yapın.",
-            "✍️ 'Endişe defteri' tutun: Sınav kaygılarını kâğıda dökün, zihninizi boşaltın.",
-            "🎯 Çalışma hedeflerini küçültün: 'Bugün şu konuyu bitireceğim' değil, "
-            "'Bugün şu konudan 10 soru çözeceğim.'",
-            "👨‍👩‍👧 Güvendiğiniz biriyle (aile, arkadaş) duygularınızı paylaşın.",
-            "📊 Geçmiş başarılarınızı listeleyin; kaygı gerçekçi değil.",
-        ]
-
-    def _uyku_onerileri(self) -> List[str]:
-        return [
-            "🛌 Hedef: Gece 7-8 saat kesintisiz uyku.",
-            "📵 Yatmadan 1 saat önce ekranları kapatın (mavi ışık melatonini engeller).",
-            "☕ Öğleden sonra 14:00'ten sonra kafein almayın.",
-            "🌡️ Oda sıcaklığını 18-20°C'ye ayarlayın.",
-            "⏰ Hafta sonu bile aynı saatte kalkın (ritim bozulmaz).",
-        ]
+        # İlk yarı/ikinci yarı ortalamaları akış istatistiklerinden O(1);
+        # burnout kuralları sırayla denenir, ilk eşleşen kazanır
+        sonuc, _ = ogrenci_kurallari(self.ogrenci)
+        if sonuc is None:
+            return BurnoutRaporu(mesaj="✅ Herhangi bir risk faktörü tespit edilmedi. Devam edin!")
+        return BurnoutRaporu(
+            tip=sonuc.tip,
+            seviye=sonuc.seviye,
+            mesaj=sonuc.mesaj,
+            detay=sonuc.detay,
+            oneriler=sonuc.oneriler,
+        )
 
     # ── Vygotsky ZPD Analizi ──────────────────
 
@@ -273,7 +227,7 @@ class AnalizMotoru:
           - Üst sınır: Rehberlikle ulaşabileceği net (çok zor = kaygı)
           - ZPD: Bu iki sınır arasındaki 'tatlı nokta'
         """
-        kayitlar = self.ogrenci.deneme_kayitlari
+        kayitlar = self.ogrenci.trend_kayitlari
         if len(kayitlar) < self.MIN_KAYIT_ZPD:
             return ZPDRaporu(
                 mevcut_seviye=0, alt_sinir=0, ust_sinir=0, hedef_net=0,
@@ -281,9 +235,8 @@ class AnalizMotoru:
                 aciklama="ZPD analizi için en az 1 deneme kaydı gereklidir.",
             )
 
-        # Son 3 denemenin ortalamasını al (daha stabil bir baz)
-        son_uc = kayitlar[-3:]
-        baz_net = statistics.mean(k.toplam_net for k in son_uc)
+        # Son 3 denemenin ortalamasını al (daha stabil bir baz; halka tampondan)
+        baz_net = self.ogrenci.deneme_akisi.alan("toplam_net").son_ortalama
         son_net = kayitlar[-1].toplam_net
 
         alt = baz_net * self.ZPD_ALT_YUZDE
@@ -325,7 +278,7 @@ class AnalizMotoru:
 
     def haftalik_trend(self) -> str:
         """Son 2 deneme arasındaki net farkına göre trend belirler."""
-        kayitlar = self.ogrenci.deneme_kayitlari
+        kayitlar = self.ogrenci.trend_kayitlari
         if len(kayitlar) < 2:
             return "→ Yetersiz veri"
         fark = kayitlar[-1].toplam_net - kayitlar[-2].toplam_net
@@ -339,10 +292,10 @@ class AnalizMotoru:
 
     def ders_analizi(self) -> Tuple[List[str], List[str]]:
         """
-        Son denemenin ders netlerini, derslerin maksimum net değerine göre
+        Trende giren son denemenin ders netlerini, derslerin maksimum net değerine göre
         normalize eder ve en güçlü/zayıf 3 dersi döndürür.
         """
-        son = self.ogrenci.son_deneme
+        son = self.ogrenci.son_trend_denemesi
         if not son:
             return [], []
 
@@ -356,10 +309,12 @@ class AnalizMotoru:
 
     def uyku_uyarisi(self) -> Optional[str]:
         """Yetersiz uyku varsa uyarı mesajı döndürür."""
-        son = self.ogrenci.son_deneme
+        son = self.ogrenci.son_trend_denemesi
         if not son:
             return None
-        if son.uyku_saati < self.DUSUK_UYKU_ESIGI:
+        from core.kural_motoru import kural_kumesi  # döngüsel içe aktarmayı önler
+
+        if son.uyku_saati < kural_kumesi().esikler.get("dusuk_uyku", self.DUSUK_UYKU_ESIGI):
             return (
                 f"😴 Son kayıttaki ortalama uyku: **{son.uyku_saati:.1f} saat**. "
                 "7 saatten az uyku, öğrenilen bilgilerin uzun süreli belleğe aktarımını "
@@ -367,6 +322,14 @@ class AnalizMotoru:
             )
         return None
 
+    # ── Kural Uyarıları ──────────────────────
+
+    def kural_uyarilari(self) -> list:
+        """Kurumun tanımladığı "uyari" grubundaki kurallardan eşleşenler (KuralSonucu listesi)."""
+        from core.kural_motoru import ogrenci_kurallari  # döngüsel içe aktarmayı önler
+
+        return ogrenci_kurallari(self.ogrenci)[1]
+
     # ── Tam Analiz ───────────────────────────
 
     def tam_analiz(self) -> GenelRapor:
@@ -380,6 +343,7 @@ class AnalizMotoru:
             zayif_dersler=zayif,
             bugunun_tekrarlari=self.ogrenci.bugunun_tekrar_listesi,
             uyku_uyarisi=self.uyku_uyarisi(),
+            kural_uyarilari=self.kural_uyarilari(),
         )
 
     # ── Hata Yoğunluk Haritası ───────────────
@@ -401,21 +365,29 @@ class AnalizMotoru:
 
         return pd.DataFrame(list(satirlar.values())).sort_values("Hata Sayısı", ascending=False)
 
+    def konu_oncelikleri(self, adet: int = 10) -> pd.DataFrame:
+        """
+        Hata geçmişi, konu ilerlemesi ve sınavdaki soru ağırlığından
+        hesaplanan en öncelikli konular. Ayrıntı için bkz. core/konu_onceligi.py.
+        """
+        from core.konu_onceligi import konu_oncelikleri  # döngüsel içe aktarmayı önler
+
+        return konu_oncelikleri(self.ogrenci).head(adet)
+
     # ── Korelasyon Verisi ─────────────────────
 
     def korelasyon_verisi(self) -> Dict[str, float]:
         """
         Çalışma saati, stres ve uyku ile net arasındaki
         Pearson korelasyon katsayılarını hesaplar.
+        Ders bazında, gecikmeli ve Spearman korelasyonları için
+        bkz. core/korelasyon.py.
         """
+        from core.korelasyon import korelasyon_matrisi  # döngüsel içe aktarmayı önler
+
         df = self.veri_cercevesi()
         if df.empty or len(df) < 3:
             return {}
 
-        sonuclar = {}
-        for sutun in ["calisma_saati", "stres_puani", "uyku_saati"]:
-            if sutun in df.columns:
-                corr = df["toplam_net"].corr(df[sutun])
-                sonuclar[sutun] = round(corr, 3)
-
-        return sonuclar
+        satir = korelasyon_matrisi(df, hedefler=["toplam_net"]).katsayilar.loc["toplam_net"]
+        return {sutun: round(float(r), 3) for sutun, r in satir.items()}
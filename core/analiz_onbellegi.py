@@ -0,0 +1,276 @@
+"""
+OmniPDR – core/analiz_onbellegi.py
+====================================
+İçerik özetiyle anahtarlanan, yeniden başlatmalar arasında kalıcı analiz önbelleği.
+
+Süreç içi LRU önbellekler her dağıtım/yeniden başlatmada boşalır; ilk
+dashboard görüntülemesi tam_analiz, korelasyon ve hata haritasını baştan
+hesaplar. Bu modül sonuçları, öğrencinin analizi etkileyen verilerinin
+SHA-256 özetiyle adlandırılmış pickle dosyalarında tutar:
+
+  anahtar = sha256(tür, parametreler, ANALIZ_SURUMU, öğrenci içeriği)
+
+Öğrenci içeriği denemeler, hata kayıtları, konu ilerlemeleri ve hedef
+alanlarıdır (iletişim bilgileri ve görüşme notları analizi etkilemez).
+Veri değişince özet değişir; eski dosyalar tahliyeyle temizlenir, ayrıca
+geçersiz kılma gerekmez. Hesaplama kodu ya da kurallar değişirse
+ANALIZ_SURUMU / kural kümesi sürümü anahtara girdiğinden eski sonuçlar
+okunmaz.
+
+Dizin toplam boyutu max_bayt ile sınırlıdır; aşılınca en uzun süredir
+okunmayan dosyalar (mtime, okumada güncellenir) silinir. Diskin önünde
+küçük bir süreç içi LRU bulunur; sıcak görüntülemeler pickle açmaz.
+Yazımlar atomiktir; bozuk dosya ıska sayılıp silinir.
+
+Kullanım:
+    rapor = onbellekli_tam_analiz(ogrenci)
+    kor = onbellekli_korelasyon(ogrenci, "spearman", 1)
+    print(analiz_onbellegi().istatistik())
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Optional, TypeVar
+
+import pandas as pd
+
+from core.analiz_motoru import AnalizMotoru, GenelRapor
+from core.korelasyon import KorelasyonSonucu, ogrenci_korelasyonlari
+from core.kural_motoru import kural_kumesi
+from core.onbellek import LRUOnbellek
+from models.ogrenci_sinifi import Ogrenci
+
+T = TypeVar("T")
+
+ANALIZ_SURUMU = 1                                # Analiz kodu sonuçları değiştirdiğinde artırılır
+VARSAYILAN_MAX_BAYT = 64 * 1024 * 1024
+ONBELLEK_BOYUTU_ORTAM = "OMNIPDR_ANALIZ_ONBELLEGI_MB"
+_VARSAYILAN_DIZIN = Path(__file__).parent.parent / "data" / ".onbellek" / "analiz"
+_BELLEK_KAPASITESI = 256
+
+# Analiz sonuçlarını etkileyen öğrenci alanları
+_ICERIK_ALANLARI = (
+    "sinav_turu", "hedef_net", "obp", "hedef_puan_turu", "hedef_siralama",
+    "deneme_kayitlari", "hata_kayitlari", "konu_ilerlemeleri",
+)
+
+
+@dataclass
+class DiskOnbellekIstatistigi:
+    """Disk önbelleğinin anlık kullanım istatistikleri."""
+    dizin: str
+    max_bayt: int
+    bayt: int
+    dosya: int
+    isabet: int
+    iska: int
+    tahliye: int
+
+    @property
+    def isabet_orani(self) -> float:
+        toplam = self.isabet + self.iska
+        return self.isabet / toplam if toplam else 0.0
+
+
+# ──────────────────────────────────────────────
+# İçerik özeti
+# ──────────────────────────────────────────────
+def icerik_ozeti(ogrenci: Ogrenci) -> str:
+    """Öğrencinin analizi etkileyen verilerinin SHA-256 özeti."""
+    d = ogrenci.to_dict()
+    metin = json.dumps([d[a] for a in _ICERIK_ALANLARI], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(metin.encode("utf-8")).hexdigest()
+
+
+def analiz_anahtari(tur: str, ogrenci: Ogrenci, *parametreler) -> str:
+    """Sonuç türü, parametreler, kod sürümü ve öğrenci içeriğinden dosya anahtarı."""
+    on_ek = json.dumps([tur, ANALIZ_SURUMU, list(parametreler)], ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{on_ek}|{icerik_ozeti(ogrenci)}".encode("utf-8")).hexdigest()[:32]
+
+
+# ──────────────────────────────────────────────
+# Disk önbelleği
+# ──────────────────────────────────────────────
+class AnalizOnbellegi:
+    """
+    Anahtar → pickle dosyası; toplam boyutu sınırlı, en uzun süredir
+    okunmayanı tahliye eden disk önbelleği. Süreç içi thread'ler
+    arasında kilitle korunur.
+    """
+
+    def __init__(self, dizin: Path = _VARSAYILAN_DIZIN, max_bayt: int = VARSAYILAN_MAX_BAYT):
+        if max_bayt <= 0:
+            raise ValueError("Önbellek boyutu pozitif olmalıdır.")
+        self.dizin = Path(dizin)
+        self.max_bayt = max_bayt
+        self._kilit = threading.Lock()
+        self._bellek = LRUOnbellek(f"analiz_diski:{self.dizin.name}", _BELLEK_KAPASITESI)
+        self._boyutlar: Optional[Dict[str, int]] = None   # İlk kullanımda dizin taranır
+        self._isabet = 0
+        self._iska = 0
+        self._tahliye = 0
+
+    def _yol(self, anahtar: str) -> Path:
+        return self.dizin / f"{anahtar}.pkl"
+
+    def _dizini_tara(self) -> Dict[str, int]:
+        if self._boyutlar is None:
+            self._boyutlar = {}
+            if self.dizin.exists():
+                for p in self.dizin.glob("*.pkl"):
+                    try:
+                        self._boyutlar[p.stem] = p.stat().st_size
+                    except OSError:
+                        pass
+        return self._boyutlar
+
+    def bul(self, anahtar: str) -> Optional[object]:
+        """Değeri (yoksa None) döndürür; önce süreç içi LRU, sonra disk."""
+        deger = self._bellek.bul(anahtar)
+        if deger is not None:
+            with self._kilit:
+                self._isabet += 1
+            return deger
+        yol = self._yol(anahtar)
+        try:
+            with open(yol, "rb") as f:
+                deger = pickle.load(f)
+            os.utime(yol)   # Tahliye sırası için son kullanım
+        except FileNotFoundError:
+            deger = None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+            deger = None    # Bozuk ya da eski sınıf yapısı: ıska sayılır, dosya silinir
+            self._sil(anahtar)
+        with self._kilit:
+            if deger is None:
+                self._iska += 1
+                return None
+            self._isabet += 1
+        self._bellek.koy(anahtar, deger)
+        return deger
+
+    def koy(self, anahtar: str, deger: object) -> None:
+        """Değeri atomik yazar; boyut sınırı aşılırsa en eski dosyaları siler."""
+        self._bellek.koy(anahtar, deger)
+        veri = pickle.dumps(deger, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(veri) > self.max_bayt:
+            return
+        yol = self._yol(anahtar)
+        with self._kilit:
+            boyutlar = self._dizini_tara()
+            self.dizin.mkdir(parents=True, exist_ok=True)
+            tmp_yol = yol.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_yol, "wb") as f:
+                f.write(veri)
+            os.replace(tmp_yol, yol)  # Atomic rename
+            boyutlar[anahtar] = len(veri)
+            self._tahliye_et(boyutlar, korunan=anahtar)
+
+    def getir(self, anahtar: str, uret: Callable[[], T]) -> T:
+        """Anahtar önbellekteyse döndürür, değilse uret() ile hesaplayıp saklar."""
+        deger = self.bul(anahtar)
+        if deger is None:
+            deger = uret()
+            self.koy(anahtar, deger)
+        return deger  # type: ignore[return-value]
+
+    def _tahliye_et(self, boyutlar: Dict[str, int], korunan: str) -> None:
+        """Kilit altında çağrılır: toplam boyut sınırın altına inene dek en eski dosyaları siler."""
+        toplam = sum(boyutlar.values())
+        if toplam <= self.max_bayt:
+            return
+        zamanlar = []
+        for anahtar in boyutlar:
+            try:
+                zamanlar.append((self._yol(anahtar).stat().st_mtime, anahtar))
+            except OSError:
+                zamanlar.append((0.0, anahtar))     # Dışarıdan silinmiş: önce düşer
+        for _, anahtar in sorted(zamanlar):
+            if toplam <= self.max_bayt:
+                break
+            if anahtar == korunan:
+                continue
+            toplam -= boyutlar.pop(anahtar)
+            self._yol(anahtar).unlink(missing_ok=True)
+            self._bellek.gecersiz_kil(anahtar)
+            self._tahliye += 1
+
+    def _sil(self, anahtar: str) -> None:
+        with self._kilit:
+            self._yol(anahtar).unlink(missing_ok=True)
+            if self._boyutlar is not None:
+                self._boyutlar.pop(anahtar, None)
+
+    def temizle(self) -> None:
+        """Tüm dosyaları ve istatistikleri siler."""
+        with self._kilit:
+            for anahtar in list(self._dizini_tara()):
+                self._yol(anahtar).unlink(missing_ok=True)
+            self._boyutlar = {}
+            self._isabet = self._iska = self._tahliye = 0
+        self._bellek.temizle()
+
+    def istatistik(self) -> DiskOnbellekIstatistigi:
+        with self._kilit:
+            boyutlar = self._dizini_tara()
+            return DiskOnbellekIstatistigi(
+                dizin=str(self.dizin),
+                max_bayt=self.max_bayt,
+                bayt=sum(boyutlar.values()),
+                dosya=len(boyutlar),
+                isabet=self._isabet,
+                iska=self._iska,
+                tahliye=self._tahliye,
+            )
+
+
+_ONBELLEKLER: Dict[Path, AnalizOnbellegi] = {}
+_ONBELLEK_KILIDI = threading.Lock()
+
+
+def analiz_onbellegi(dizin: Path = _VARSAYILAN_DIZIN) -> AnalizOnbellegi:
+    """Süreç içinde dizin başına tek önbellek; boyut OMNIPDR_ANALIZ_ONBELLEGI_MB ile ayarlanır."""
+    yol = Path(dizin).resolve()
+    with _ONBELLEK_KILIDI:
+        if yol not in _ONBELLEKLER:
+            mb = os.environ.get(ONBELLEK_BOYUTU_ORTAM)
+            max_bayt = int(float(mb) * 1024 * 1024) if mb else VARSAYILAN_MAX_BAYT
+            _ONBELLEKLER[yol] = AnalizOnbellegi(yol, max_bayt)
+        return _ONBELLEKLER[yol]
+
+
+# ──────────────────────────────────────────────
+# Önbellekli analizler
+# ──────────────────────────────────────────────
+def onbellekli_tam_analiz(ogrenci: Ogrenci) -> GenelRapor:
+    """
+    AnalizMotoru.tam_analiz; bugünün tekrar listesi tarihe, burnout ve
+    uyarılar kural kümesine bağlı olduğundan ikisi de anahtara girer.
+    Rapor her çağrıda derin kopyalanır: süreç içi LRU isabetinde önbellekteki
+    nesne, ıskada öğrencinin kendi HataKaydi nesneleri paylaşılmasın.
+    """
+    anahtar = analiz_anahtari("tam_analiz", ogrenci, date.today().isoformat(), kural_kumesi().surum)
+    return copy.deepcopy(analiz_onbellegi().getir(anahtar, lambda: AnalizMotoru(ogrenci).tam_analiz()))
+
+
+def onbellekli_korelasyon(ogrenci: Ogrenci, yontem: str = "pearson", gecikme: int = 0) -> KorelasyonSonucu:
+    """core.korelasyon.ogrenci_korelasyonlari."""
+    anahtar = analiz_anahtari("korelasyon", ogrenci, yontem, gecikme)
+    return analiz_onbellegi().getir(
+        anahtar, lambda: ogrenci_korelasyonlari(ogrenci, yontem=yontem, gecikme=gecikme),
+    )
+
+
+def onbellekli_hata_haritasi(ogrenci: Ogrenci) -> pd.DataFrame:
+    """AnalizMotoru.hata_yogunluk_haritasi; bekleyen tekrar sayısı tarihe bağlı olduğundan tarih anahtara girer."""
+    anahtar = analiz_anahtari("hata_haritasi", ogrenci, date.today().isoformat())
+    return analiz_onbellegi().getir(anahtar, lambda: AnalizMotoru(ogrenci).hata_yogunluk_haritasi()).copy()
@@ -0,0 +1,209 @@
+"""
+OmniPDR – core/anomali.py
+====================================
+Deneme kayıtlarında sağlam (robust) anomali tespiti.
+
+Yanlış girilmiş netler ve tek seferlik uç denemeler burnout/ZPD
+sonuçlarını bozar. Her deneme iki ölçüte göre değerlendirilir:
+
+  ① Öğrencinin kendi geçmişi: toplam netin, öğrencinin aynı bölümdeki
+     (TYT/AYT/LGS) denemelerinin medyanından sapması; MAD ile ölçeklenmiş
+     robust z = 0.6745 · (x − medyan) / MAD
+  ② Aynı sınav etkinliğinin kohortu: aynı gün aynı bölümü çözen
+     öğrencilerin kendi medyanlarından sapmalarının dağılımı. Etkinlik
+     herkes için zorsa (toplu düşüş) tek öğrencinin düşüşü anomali sayılmaz.
+
+Deneme, ① eşiği aşar ve ② de (etkinlik kohortu yeterliyse) aşarsa, bir
+dersin neti öğrencinin o dersteki geçmişinden çok saparsa ya da net soru
+sayısı sınırlarının dışındaysa şüpheli işaretlenir. Şüpheli kayıtlar
+danışman onaylayana kadar trend hesaplarına girmez (DenemeKaydi.trende_dahil).
+
+Tüm medyan/MAD hesapları groupby ile vektörel yapılır; kurum geneli
+tarama her toplu içe aktarmada çalıştırılabilecek kadar hızlıdır.
+
+Kullanım:
+    tablo = anomali_tablosu(repo.hepsini_getir())
+    anomalileri_isaretle(repo.hepsini_getir())
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.puan_hesaplama import (
+    AYT_DERS_SIRASI, LGS_DERS_SIRASI, TYT_DERS_SIRASI, YANLIS_BOLENI,
+    deneme_bolumu, netleri_matrise, soru_sayisi_vektoru,
+)
+from models.ogrenci_sinifi import Ogrenci
+
+
+# ──────────────────────────────────────────────
+# Sabitler
+# ──────────────────────────────────────────────
+ROBUST_Z_ESIGI = 3.5            # Iglewicz–Hoaglin önerisi
+DERS_Z_ESIGI = 5.0              # Ders netleri daha oynak; daha yüksek eşik
+MIN_OGRENCI_GECMISI = 5         # Bölümde bu kadar denemeden azsa ① hesaplanmaz
+MIN_ETKINLIK_KATILIMI = 8       # Etkinlikte bu kadar öğrenciden azsa ② hesaplanmaz
+MAD_TABANI = 1.0                # Neredeyse sabit geçmişte z patlamasın (net)
+_MAD_OLCEGI = 0.6745            # Normal dağılımda MAD = 0.6745 · σ
+
+BOLUM_DERSLERI = {"TYT": TYT_DERS_SIRASI, "AYT": AYT_DERS_SIRASI, "LGS": LGS_DERS_SIRASI}
+
+TABLO_SUTUNLARI = [
+    "ogrenci_id", "deneme_id", "tarih", "bolum", "toplam_net",
+    "z_ogrenci", "z_kohort", "z_ders", "ders", "gecersiz_ders",
+    "anomali", "onaylandi",
+]
+
+
+# ──────────────────────────────────────────────
+# Vektörel robust z
+# ──────────────────────────────────────────────
+def _robust_z(degerler: pd.DataFrame, gruplar, min_grup: int) -> pd.DataFrame:
+    """
+    Her sütun için grup medyanı ve MAD'ına göre robust z. Grup boyutu
+    min_grup'tan küçükse NaN. gruplar, groupby'a verilebilecek anahtar(lar)dır.
+    """
+    g = degerler.groupby(gruplar)
+    medyan = g.transform("median")
+    sapma = (degerler - medyan).abs()
+    mad = sapma.groupby(gruplar).transform("median").clip(lower=MAD_TABANI)
+    z = _MAD_OLCEGI * (degerler - medyan) / mad
+    return z.where(g.transform("count") >= min_grup)
+
+
+def _bolum(ogrenci: Ogrenci, netleri: Dict[str, float]) -> str:
+    return "LGS" if ogrenci.sinav_turu == "LGS" else deneme_bolumu(netleri)
+
+
+# ──────────────────────────────────────────────
+# Kurum geneli tablo
+# ──────────────────────────────────────────────
+def anomali_tablosu(ogrenciler: Sequence[Ogrenci]) -> pd.DataFrame:
+    """
+    Her deneme için robust z skorları ve anomali kararı. Satırlar
+    öğrenci ve deneme sırasındadır; tüm denemeler (şüpheliler dahil) yer alır.
+    """
+    satirlar = [(o, k, _bolum(o, k.netleri)) for o in ogrenciler for k in o.deneme_kayitlari]
+    if not satirlar:
+        return pd.DataFrame(columns=TABLO_SUTUNLARI)
+
+    tablo = pd.DataFrame({
+        "ogrenci_id": [o.ogrenci_id for o, _, _ in satirlar],
+        "deneme_id": [k.id for _, k, _ in satirlar],
+        "tarih": [k.tarih for _, k, _ in satirlar],
+        "bolum": [b for _, _, b in satirlar],
+        "toplam_net": np.fromiter((k.toplam_net for _, k, _ in satirlar), dtype=np.float64, count=len(satirlar)),
+        "onaylandi": [k.onaylandi for _, k, _ in satirlar],
+    })
+    ogr_bolum = [tablo["ogrenci_id"], tablo["bolum"]]
+
+    # ① Öğrencinin kendi geçmişine göre
+    tablo["z_ogrenci"] = _robust_z(tablo[["toplam_net"]], ogr_bolum, MIN_OGRENCI_GECMISI)["toplam_net"]
+
+    # ② Aynı etkinlikteki (gün × bölüm) öğrencilerin kendi medyanından sapmalarına göre
+    sapma = tablo["toplam_net"] - tablo.groupby(ogr_bolum)["toplam_net"].transform("median")
+    sapma = sapma.where(tablo["z_ogrenci"].notna())
+    tablo["z_kohort"] = _robust_z(
+        sapma.to_frame("sapma"), [tablo["tarih"], tablo["bolum"]], MIN_ETKINLIK_KATILIMI,
+    )["sapma"]
+
+    # Ders bazında: bölüm başına yoğun matris (eksik ders 0 net), öğrenci geçmişine göre z;
+    # etkinlik kohortunun da olağan bulduğu sapmalar 0 sayılır
+    tablo["z_ders"] = np.nan
+    tablo["ders"] = ""
+    tablo["gecersiz_ders"] = ""
+    for bolum, dersler in BOLUM_DERSLERI.items():
+        secim = np.flatnonzero((tablo["bolum"] == bolum).to_numpy())
+        if not len(secim):
+            continue
+        matris = netleri_matrise([satirlar[i][1].netleri for i in secim], dersler)
+        tavan = soru_sayisi_vektoru(dersler, bolum)
+        # Yanlışlar doğruyu götürür: net ∈ [−soru/bölen, soru]; bölen YKS'de 4, LGS'de 3
+        bolen = YANLIS_BOLENI["LGS" if bolum == "LGS" else "YKS"]
+        gecersiz = (matris > tavan) | (matris < -tavan / bolen)
+        tablo.iloc[secim, tablo.columns.get_loc("gecersiz_ders")] = [
+            ", ".join(d for d, g in zip(dersler, satir) if g) for satir in gecersiz
+        ]
+        netler = pd.DataFrame(matris, columns=dersler)
+        ogr = tablo["ogrenci_id"].iloc[secim].to_numpy()
+        z = _robust_z(netler, ogr, MIN_OGRENCI_GECMISI)
+        # Toplam netteki gibi: etkinlikte herkes o derste düştüyse sapma sayılmaz
+        ders_sapmasi = (netler - netler.groupby(ogr).transform("median")).where(z.notna())
+        z_kohort = _robust_z(
+            ders_sapmasi, tablo["tarih"].iloc[secim].to_numpy(), MIN_ETKINLIK_KATILIMI,
+        )
+        z = z.abs().where(z_kohort.isna() | (z_kohort.abs() > ROBUST_Z_ESIGI), 0.0).to_numpy()
+        dolu = ~np.isnan(z).all(axis=1)
+        en_kotu = np.argmax(np.nan_to_num(z, nan=-1.0), axis=1)
+        tablo.iloc[secim[dolu], tablo.columns.get_loc("z_ders")] = z[dolu, en_kotu[dolu]]
+        tablo.iloc[secim[dolu], tablo.columns.get_loc("ders")] = np.asarray(dersler, dtype=object)[en_kotu[dolu]]
+
+    ogrenci_sapmasi = tablo["z_ogrenci"].abs() > ROBUST_Z_ESIGI
+    kohort_destekli = tablo["z_kohort"].isna() | (tablo["z_kohort"].abs() > ROBUST_Z_ESIGI)
+    tablo["anomali"] = (
+        (ogrenci_sapmasi & kohort_destekli)
+        | (tablo["z_ders"] > DERS_Z_ESIGI)
+        | (tablo["gecersiz_ders"] != "")
+    )
+    return tablo[TABLO_SUTUNLARI]
+
+
+def _bulgu(satir) -> dict:
+    """Tablo satırından DenemeKaydi.anomali sözlüğü (gerekçeleriyle)."""
+    nedenler: List[str] = []
+    if satir.gecersiz_ders:
+        nedenler.append(f"Net soru sayısı sınırlarının dışında: {satir.gecersiz_ders}")
+    if abs(satir.z_ogrenci) > ROBUST_Z_ESIGI and not abs(satir.z_kohort) <= ROBUST_Z_ESIGI:
+        yon = "üstünde" if satir.z_ogrenci > 0 else "altında"
+        ek = "" if np.isnan(satir.z_kohort) else f"; aynı gün denemeye girenlere göre de olağan dışı (z={satir.z_kohort:.1f})"
+        nedenler.append(f"Toplam net öğrencinin olağan düzeyinin çok {yon} (z={satir.z_ogrenci:.1f}){ek}")
+    if satir.z_ders > DERS_Z_ESIGI:
+        nedenler.append(f"{satir.ders} neti öğrencinin geçmişinden çok farklı (z={satir.z_ders:.1f})")
+
+    def _yuvarla(x: float) -> Optional[float]:
+        return None if np.isnan(x) else round(float(x), 2)
+
+    return {
+        "z_ogrenci": _yuvarla(satir.z_ogrenci),
+        "z_kohort": _yuvarla(satir.z_kohort),
+        "z_ders": _yuvarla(satir.z_ders),
+        "ders": satir.ders or None,
+        "nedenler": nedenler,
+    }
+
+
+def anomalileri_isaretle(
+    ogrenciler: Sequence[Ogrenci],
+    hedefler: Optional[Sequence[Ogrenci]] = None,
+) -> pd.DataFrame:
+    """
+    Tabloyu tüm öğrenciler üzerinden hesaplar (etkinlik kohortu için) ve
+    hedefler (verilmezse hepsi) üzerindeki DenemeKaydi.anomali alanlarını
+    günceller. İşareti değişen öğrencinin veri sürümü artar; böylece akış
+    istatistikleri, çerçeve ve tahmin önbellekleri yenilenir.
+    Şüpheli satırları döndürür.
+    """
+    tablo = anomali_tablosu(ogrenciler)
+    hedef_idleri = {o.ogrenci_id for o in (ogrenciler if hedefler is None else hedefler)}
+    bulgular = {
+        (satir.ogrenci_id, satir.deneme_id): _bulgu(satir)
+        for satir in tablo[tablo["anomali"] & tablo["ogrenci_id"].isin(hedef_idleri)].itertuples(index=False)
+    }
+    for o in ogrenciler:
+        if o.ogrenci_id not in hedef_idleri:
+            continue
+        degisti = False
+        for k in o.deneme_kayitlari:
+            yeni = bulgular.get((o.ogrenci_id, k.id))
+            if (yeni is None) != (k.anomali is None):
+                degisti = True
+                if yeni is None:
+                    k.onaylandi = False     # Artık olağan; onay bir sonraki işarete taşınmaz
+            k.anomali = yeni
+        if degisti:
+            o.veri_degisti()
+    return tablo[tablo["anomali"]].reset_index(drop=True)
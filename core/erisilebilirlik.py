@@ -0,0 +1,309 @@
+"""
+OmniPDR – core/erisilebilirlik.py
+=====================================
+Kurum geneli öğrenci × program erişilebilirlik matrisi.
+
+Her YKS öğrencisinin güncel tahmini puanı (son denemelerin ortalama
+netleriyle, vektörel puanlama) katalogdaki her programın taban puanıyla
+karşılaştırılır. Sonuç, program ekseninde bit düzeyinde paketlenmiş bir
+uint8 matrisinde tutulur (5.000 × 20.000 ≈ 12,5 MB). Program, şehir ve
+üniversite özetleri matris taranmadan, sıralı puanlar üzerinde
+searchsorted ile hesaplanır.
+
+Puan türü eşleşmesi: Hedef puan türündeki (SAY/EA/SOZ) programlar
+yerleştirme puanıyla, TYT programları TYT puanıyla karşılaştırılır.
+YDT programları, yabancı dil netleri tutulmadığından puanlanmaz (hiçbir
+öğrenci için ulaşılabilir sayılmaz).
+
+Matris toplu iş olarak kurulup data/erisim_matrisi.npz dosyasına yazılır;
+arayüz kayıtlı matrisi okur (kayitli_erisim_matrisi), her çizimde kurmaz.
+
+Kullanım:
+    matris = kayitli_erisim_matrisi() or erisim_matrisi_olustur(repo.hepsini_getir())
+    matris.program_ozeti().head(20)
+    matris.sehir_ozeti()
+
+Komut satırı (zamanlanmış iş olarak):
+    python -m core.erisilebilirlik --cikti data/erisim_matrisi.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.puan_hesaplama import (
+    AYT_DERS_SIRASI, AYT_PUAN_KATSAYILARI, TYT_DERS_SIRASI, ayt_puan_vektorel, deneme_bolumu,
+    netleri_matrise, tyt_puan_vektorel, yerlestirme_puani_vektorel,
+)
+from core.yokatlas_verileri import PUAN_TURLERI, BolumBilgisi, BolumKatalogu, katalog, oneri_katalogu
+from core.taban_gecmisi import program_kimligi
+from models.ogrenci_sinifi import Ogrenci
+
+PUAN_TURU_SIRASI = tuple(sorted(PUAN_TURLERI))
+VARSAYILAN_SON_N = 3            # Güncel puan: son 3 denemenin ortalama netleri
+_SATIR_PARCASI = 512            # Matris bu kadar öğrencilik parçalar halinde kurulur
+VARSAYILAN_MATRIS_YOLU = Path(__file__).parent.parent / "data" / "erisim_matrisi.npz"
+
+
+# ──────────────────────────────────────────────
+# Kohort puanları (vektörel)
+# ──────────────────────────────────────────────
+def _ortalama_netler(kayitlar: List[Dict[str, float]], dersler: Sequence[str]) -> Optional[np.ndarray]:
+    if not kayitlar:
+        return None
+    return netleri_matrise(kayitlar, dersler).mean(axis=0)
+
+
+def kohort_puanlari(ogrenciler: Sequence[Ogrenci], son_n: int = VARSAYILAN_SON_N) -> np.ndarray:
+    """
+    Öğrenci × puan türü (PUAN_TURU_SIRASI) tahmini puan matrisi; uygun olmayan
+    hücreler NaN. Netler trende giren son_n denemenin ortalamasıdır; puanlama puan türü
+    grupları halinde vektörel yapılır.
+    """
+    n = len(ogrenciler)
+    puanlar = np.full((n, len(PUAN_TURU_SIRASI)), np.nan)
+    tyt = np.zeros((n, len(TYT_DERS_SIRASI)))
+    ayt = np.zeros((n, len(AYT_DERS_SIRASI)))
+    tyt_var = np.zeros(n, dtype=bool)
+    ayt_var = np.zeros(n, dtype=bool)
+
+    for i, ogr in enumerate(ogrenciler):
+        if ogr.sinav_turu != "YKS":
+            continue
+        tyt_kayit = [k.netleri for k in ogr.trend_kayitlari if deneme_bolumu(k.netleri) == "TYT"][-son_n:]
+        ayt_kayit = [k.netleri for k in ogr.trend_kayitlari if deneme_bolumu(k.netleri) == "AYT"][-son_n:]
+        for kayit, dersler, hedef, var in ((tyt_kayit, TYT_DERS_SIRASI, tyt, tyt_var), (ayt_kayit, AYT_DERS_SIRASI, ayt, ayt_var)):
+            ortalama = _ortalama_netler(kayit, dersler)
+            if ortalama is not None:
+                hedef[i] = ortalama
+                var[i] = True
+
+    tyt_puanlari = tyt_puan_vektorel(tyt)
+    puanlar[tyt_var, PUAN_TURU_SIRASI.index("TYT")] = tyt_puanlari[tyt_var]
+
+    obp = np.array([o.obp for o in ogrenciler], dtype=float)
+    hedefler = np.array([o.hedef_puan_turu for o in ogrenciler])
+    for j, pt in enumerate(PUAN_TURU_SIRASI):
+        secili = tyt_var & ayt_var & (hedefler == pt)
+        if pt not in AYT_PUAN_KATSAYILARI or not secili.any():
+            continue    # TYT yukarıda; YDT için dil netleri yok
+        puanlar[secili, j] = yerlestirme_puani_vektorel(
+            tyt_puanlari[secili], ayt_puan_vektorel(ayt[secili], pt), obp[secili],
+        )
+    return np.round(puanlar, 2)
+
+
+# ──────────────────────────────────────────────
+# Matris
+# ──────────────────────────────────────────────
+def _katalog_ozeti(k: BolumKatalogu) -> str:
+    """Kayıtlı matrisin hangi katalogla kurulduğunu doğrulamak için program kimliklerinin özeti."""
+    ham = "\n".join(program_kimligi(b) for b in k.bolumler)
+    return hashlib.blake2b(ham.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class ErisimMatrisi:
+    """Paketlenmiş öğrenci × program erişim matrisi ve özet sorguları."""
+    ogrenci_idleri: List[str]
+    puanlar: np.ndarray             # (S, T) — PUAN_TURU_SIRASI
+    bitler: np.ndarray              # (S, ⌈P/8⌉) uint8, program ekseninde paketli
+    tolerans: float
+    katalog: BolumKatalogu = field(repr=False)
+
+    def __post_init__(self):
+        self._satirlar = {oid: i for i, oid in enumerate(self.ogrenci_idleri)}
+        self._pt_kodlari = np.array([PUAN_TURU_SIRASI.index(pt) for pt in self.katalog.dizi("puan_turu")])
+
+    @property
+    def boyut_bayt(self) -> int:
+        return int(self.bitler.nbytes)
+
+    # ── Tekil sorgular ───────────────────────
+    def ogrenci_programlari(self, ogrenci_id: str) -> List[BolumBilgisi]:
+        """Öğrencinin ulaşabildiği programlar (taban puana göre azalan)."""
+        satir = np.unpackbits(self.bitler[self._satirlar[ogrenci_id]], count=len(self.katalog)).astype(bool)
+        dizinler = np.flatnonzero(satir)
+        dizinler = dizinler[np.argsort(-self.katalog.dizi("taban_puan")[dizinler], kind="stable")]
+        return self.katalog.getir(dizinler)
+
+    def program_ogrencileri(self, program_dizini: int) -> List[str]:
+        """Bir programa ulaşabilen öğrencilerin kimlikleri."""
+        bayt, bit = divmod(program_dizini, 8)
+        maske = (self.bitler[:, bayt] >> (7 - bit)) & 1
+        return [self.ogrenci_idleri[i] for i in np.flatnonzero(maske)]
+
+    # ── Özetler (searchsorted) ───────────────
+    def program_sayimlari(self) -> np.ndarray:
+        """Her programa ulaşabilen öğrenci sayısı."""
+        tabanlar = self.katalog.dizi("taban_puan") - self.tolerans
+        sayimlar = np.zeros(len(self.katalog), dtype=np.int64)
+        for j in range(len(PUAN_TURU_SIRASI)):
+            sutun = self.puanlar[:, j]
+            sirali = np.sort(sutun[~np.isnan(sutun)])
+            secili = self._pt_kodlari == j
+            sayimlar[secili] = len(sirali) - np.searchsorted(sirali, tabanlar[secili], side="left")
+        return sayimlar
+
+    def ogrenci_sayimlari(self) -> np.ndarray:
+        """Her öğrencinin ulaşabildiği program sayısı."""
+        tabanlar = self.katalog.dizi("taban_puan") - self.tolerans
+        sayimlar = np.zeros(len(self.ogrenci_idleri), dtype=np.int64)
+        for j in range(len(PUAN_TURU_SIRASI)):
+            sirali = np.sort(tabanlar[self._pt_kodlari == j])
+            sutun = self.puanlar[:, j]
+            var = ~np.isnan(sutun)
+            sayimlar[var] += np.searchsorted(sirali, sutun[var], side="right")
+        return sayimlar
+
+    def program_ozeti(self) -> pd.DataFrame:
+        """Program başına ulaşabilen öğrenci sayısı (çoktan aza)."""
+        k = self.katalog
+        df = pd.DataFrame({
+            "universite": k.dizi("universite"),
+            "bolum": k.dizi("bolum"),
+            "sehir": k.dizi("sehir"),
+            "puan_turu": k.dizi("puan_turu"),
+            "taban_puan": k.dizi("taban_puan"),
+            "ulasan_ogrenci": self.program_sayimlari(),
+        })
+        return df.sort_values(["ulasan_ogrenci", "taban_puan"], ascending=False, kind="stable").reset_index(drop=True)
+
+    def _grup_ozeti(self, alan: str) -> pd.DataFrame:
+        """
+        Grup (şehir/üniversite) başına: program sayısı, en az bir programına
+        ulaşabilen tekil öğrenci sayısı. Grubun her puan türündeki en düşük
+        tabanı bulunur; öğrenci herhangi bir türde bunu geçiyorsa sayılır.
+        """
+        gruplar, kodlar = np.unique(self.katalog.dizi(alan), return_inverse=True)
+        en_dusuk = np.full((len(gruplar), len(PUAN_TURU_SIRASI)), np.inf)
+        np.minimum.at(en_dusuk, (kodlar, self._pt_kodlari), self.katalog.dizi("taban_puan") - self.tolerans)
+
+        puanlar = np.nan_to_num(self.puanlar, nan=-np.inf)
+        ulasan = np.zeros((len(gruplar), len(puanlar)), dtype=bool)
+        for j in range(len(PUAN_TURU_SIRASI)):
+            ulasan |= puanlar[None, :, j] >= en_dusuk[:, j, None]
+        return pd.DataFrame({
+            alan: gruplar,
+            "program_sayisi": np.bincount(kodlar, minlength=len(gruplar)),
+            "ulasan_ogrenci": ulasan.sum(axis=1),
+        }).sort_values("ulasan_ogrenci", ascending=False, kind="stable").reset_index(drop=True)
+
+    def sehir_ozeti(self) -> pd.DataFrame:
+        return self._grup_ozeti("sehir")
+
+    def universite_ozeti(self) -> pd.DataFrame:
+        return self._grup_ozeti("universite")
+
+    # ── Kalıcılık ─────────────────────────────
+    def kaydet(self, yol: Path) -> None:
+        """Matrisi sıkıştırılmış .npz olarak yazar."""
+        yol = Path(yol)
+        yol.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            yol,
+            ogrenci_idleri=np.array(self.ogrenci_idleri),
+            puanlar=self.puanlar,
+            bitler=self.bitler,
+            tolerans=self.tolerans,
+            katalog_ozeti=_katalog_ozeti(self.katalog),
+        )
+
+    @classmethod
+    def yukle(cls, yol: Path, k: Optional[BolumKatalogu] = None) -> "ErisimMatrisi":
+        """Kayıtlı matrisi yükler; farklı bir katalogla kurulmuşsa ValueError."""
+        k = k or oneri_katalogu()
+        with np.load(Path(yol)) as veri:
+            if str(veri["katalog_ozeti"]) != _katalog_ozeti(k):
+                raise ValueError("Erişim matrisi farklı bir katalogla oluşturulmuş; yeniden oluşturun.")
+            return cls(
+                ogrenci_idleri=veri["ogrenci_idleri"].tolist(),
+                puanlar=veri["puanlar"],
+                bitler=veri["bitler"],
+                tolerans=float(veri["tolerans"]),
+                katalog=k,
+            )
+
+
+_KAYITLI: Dict[str, tuple] = {}    # yol → (mtime_ns, katalog, matris)
+
+
+def kayitli_erisim_matrisi(yol: Path = VARSAYILAN_MATRIS_YOLU) -> Optional[ErisimMatrisi]:
+    """
+    Toplu işle kaydedilmiş matris; dosya yoksa, okunamıyorsa ya da güncel
+    katalogla kurulmamışsa None. Dosya değişmedikçe süreç içinde bir kez okunur.
+    """
+    yol = Path(yol)
+    try:
+        mtime = yol.stat().st_mtime_ns
+    except OSError:
+        return None
+    k = oneri_katalogu()
+    onceki = _KAYITLI.get(str(yol))
+    if onceki is not None and onceki[0] == mtime and onceki[1] is k:
+        return onceki[2]
+    try:
+        matris = ErisimMatrisi.yukle(yol, k)
+    except (OSError, KeyError, ValueError):
+        matris = None   # Eski katalog ya da bozuk dosya: yeniden oluşturulmalı
+    _KAYITLI[str(yol)] = (mtime, k, matris)
+    return matris
+
+
+def erisim_matrisi_olustur(
+    ogrenciler: Sequence[Ogrenci],
+    tolerans: float = 0.0,
+    son_n: int = VARSAYILAN_SON_N,
+    projeksiyon: bool = True,
+) -> ErisimMatrisi:
+    """
+    Kohortun güncel puanlarıyla tüm katalog için erişim matrisini kurar.
+    tolerans: Puanın tabanın bu kadar altında kalması da "ulaşılabilir" sayılır.
+    """
+    k = oneri_katalogu() if projeksiyon else katalog()
+    puanlar = kohort_puanlari(ogrenciler, son_n)
+    pt_kodlari = np.array([PUAN_TURU_SIRASI.index(pt) for pt in k.dizi("puan_turu")])
+    tabanlar = (k.dizi("taban_puan") - tolerans).astype(np.float32)
+
+    # NaN karşılaştırmaları False döner: uygun olmayan puan türleri kendiliğinden elenir
+    bitler = np.zeros((len(ogrenciler), (len(k) + 7) // 8), dtype=np.uint8)
+    puanlar32 = puanlar.astype(np.float32)
+    for bas in range(0, len(ogrenciler), _SATIR_PARCASI):
+        parca = puanlar32[bas:bas + _SATIR_PARCASI][:, pt_kodlari]
+        bitler[bas:bas + _SATIR_PARCASI] = np.packbits(parca >= tabanlar, axis=1)
+
+    return ErisimMatrisi(
+        ogrenci_idleri=[o.ogrenci_id for o in ogrenciler],
+        puanlar=puanlar,
+        bitler=bitler,
+        tolerans=tolerans,
+        katalog=k,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Kurum geneli erişim matrisini oluşturup .npz olarak yazar ve özet basar."""
+    from core.veritabani import OgrenciRepository
+
+    ayr = argparse.ArgumentParser(description="OmniPDR öğrenci × program erişim matrisi")
+    ayr.add_argument("--tolerans", type=float, default=0.0)
+    ayr.add_argument("--son-n", type=int, default=VARSAYILAN_SON_N)
+    ayr.add_argument("--cikti", type=Path, default=VARSAYILAN_MATRIS_YOLU)
+    args = ayr.parse_args(argv)
+
+    matris = erisim_matrisi_olustur(OgrenciRepository(yaz=False).hepsini_getir(), args.tolerans, args.son_n)
+    matris.kaydet(args.cikti)
+    print(f"{len(matris.ogrenci_idleri)} öğrenci × {len(matris.katalog)} program "
+          f"({matris.boyut_bayt / 1e6:.1f} MB) → {args.cikti}")
+    print(matris.sehir_ozeti().head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+OmniPDR – core/erken_uyari.py
+=================================
+Arka planda çalışan erken uyarı taraması ve kalıcı uyarı deposu.
+
+Tarama, son çalışmadan bu yana verisi değişen öğrenciler için
+AnalizMotoru.tam_analiz'i (kalıcı analiz önbelleği üzerinden, bkz.
+core/analiz_onbellegi.py) çalıştırır ve burnout, uyku, ZPD ve kurum
+kuralı uyarılarını zaman damgası ve seviyeleriyle data/uyarilar.json dosyasına yazar.
+Değişiklik tespiti öğrenci başına O(1) bir özetle (veri sürümü, deneme
+sayısı, son deneme kimliği, hedef) yapılır; her çalışmanın analiz işi
+değişen öğrenci sayısıyla orantılıdır. Öğrenci dosyası değişmemişse
+tarama hiç yapılmaz.
+
+Başarısız taramalar loglanır ve depoya (son_hata, son_hata_zamani)
+yazılır; arayüz taramanın aksadığını buradan gösterir.
+
+Uygulama uyarıları çizim sırasında hesaplamaz, depodan okur; yalnızca
+az önce değişen (özeti tutmayan) öğrenci anında yeniden analiz edilir.
+
+Kullanım:
+    servis = arka_plan_servisi_baslat(repo.dosya_yolu)    # sunucu içinde thread
+    uyari_deposu().tum_uyarilar(UyariSeviyesi.UYARI)
+
+Komut satırı (zamanlanmış iş olarak):
+    python -m core.erken_uyari --bir-kez
+    python -m core.erken_uyari --aralik 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from core.analiz_motoru import UyariSeviyesi
+from core.analiz_onbellegi import onbellekli_tam_analiz
+from core.kural_motoru import kural_kumesi
+from models.ogrenci_sinifi import Ogrenci
+
+_log = logging.getLogger(__name__)
+
+_VERI_DIZINI = Path(__file__).parent.parent / "data"
+_VARSAYILAN_DEPO_YOLU = _VERI_DIZINI / "uyarilar.json"
+_VARSAYILAN_OGRENCI_YOLU = _VERI_DIZINI / "ogrenciler.json"
+VARSAYILAN_ARALIK_SN = 300.0
+
+# ZPD durumlarından uyarı sayılanlar (AnalizMotoru.zpd_analizi metinleri)
+_ZPD_UYARI_ONEKLERI = ("Hedef ZPD Üstü", "Hedef ZPD Altı")
+
+
+# ──────────────────────────────────────────────
+# Uyarı yapısı
+# ──────────────────────────────────────────────
+@dataclass
+class Uyari:
+    """Bir öğrenci için kalıcı uyarı kaydı."""
+    ogrenci_id: str
+    ad: str
+    kaynak: str             # "burnout", "uyku", "zpd", "kural"
+    seviye: str             # UyariSeviyesi adı
+    mesaj: str
+    detay: str = ""
+    zaman: str = ""         # İlk tespit zamanı (ISO); uyarı sürdükçe korunur
+
+    @property
+    def seviye_degeri(self) -> int:
+        return UyariSeviyesi[self.seviye].value
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Uyari":
+        return cls(**d)
+
+
+@dataclass
+class _OgrenciKaydi:
+    ozet: str
+    analiz_zamani: str
+    uyarilar: List[Uyari] = field(default_factory=list)
+
+
+@dataclass
+class TaramaSonucu:
+    """Bir tarama çalışmasının özeti."""
+    analiz_edilen: int
+    degismeyen: int
+    silinen: int
+    sure_sn: float
+
+
+def ogrenci_ozeti(ogrenci: Ogrenci) -> str:
+    """Analizi etkileyen öğrenci verilerinin O(1) özeti; değiştiyse yeniden analiz gerekir."""
+    son = ogrenci.son_deneme
+    return "|".join(map(str, (
+        ogrenci.veri_surumu, len(ogrenci.deneme_kayitlari), son.id if son else "",
+        ogrenci.hedef_net, ogrenci.sinav_turu,
+        kural_kumesi().surum,   # Kurallar değişince uyarılar yeniden üretilir
+    )))
+
+
+def analizden_uyarilar(ogrenci: Ogrenci, zaman: str) -> List[Uyari]:
+    """tam_analiz çıktısından kalıcı uyarıları üretir (NORMAL durumlar uyarı değildir)."""
+    rapor = onbellekli_tam_analiz(ogrenci)
+    uyarilar = []
+    if rapor.burnout.seviye != UyariSeviyesi.NORMAL:
+        uyarilar.append(Uyari(
+            ogrenci.ogrenci_id, ogrenci.ad, "burnout", rapor.burnout.seviye.name,
+            rapor.burnout.mesaj, rapor.burnout.detay, zaman,
+        ))
+    if rapor.uyku_uyarisi:
+        uyarilar.append(Uyari(
+            ogrenci.ogrenci_id, ogrenci.ad, "uyku", UyariSeviyesi.DIKKAT.name,
+            "😴 Yetersiz uyku", rapor.uyku_uyarisi, zaman,
+        ))
+    for k in rapor.kural_uyarilari:
+        uyarilar.append(Uyari(
+            ogrenci.ogrenci_id, ogrenci.ad, "kural", k.seviye.name, k.mesaj, k.detay, zaman,
+        ))
+    if rapor.zpd.durum.startswith(_ZPD_UYARI_ONEKLERI):
+        uyarilar.append(Uyari(
+            ogrenci.ogrenci_id, ogrenci.ad, "zpd", UyariSeviyesi.DIKKAT.name,
+            f"📐 {rapor.zpd.durum}", rapor.zpd.aciklama, zaman,
+        ))
+    return uyarilar
+
+
+# ──────────────────────────────────────────────
+# Kalıcı depo
+# ──────────────────────────────────────────────
+class UyariDeposu:
+    """
+    Öğrenci başına son analiz özeti ve etkin uyarıları JSON dosyasında tutar.
+    Aynı süreçteki thread'ler arasında kilitle korunur; yazım atomiktir.
+    """
+
+    def __init__(self, dosya_yolu: Path = _VARSAYILAN_DEPO_YOLU):
+        self.dosya_yolu = Path(dosya_yolu)
+        self._kilit = threading.RLock()
+        self._kayitlar: Dict[str, _OgrenciKaydi] = {}
+        self.son_tarama: Optional[str] = None
+        self.son_hata: Optional[str] = None          # Son başarısız taramanın hatası (başarılı taramada silinir)
+        self.son_hata_zamani: Optional[str] = None
+        self._yukle()
+
+    def _yukle(self) -> None:
+        if not self.dosya_yolu.exists():
+            return
+        try:
+            with open(self.dosya_yolu, "r", encoding="utf-8") as f:
+                ham = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return  # Bozuk depo: bir sonraki taramada baştan oluşur
+        self.son_tarama = ham.get("son_tarama")
+        self.son_hata = ham.get("son_hata")
+        self.son_hata_zamani = ham.get("son_hata_zamani")
+        for oid, k in ham.get("ogrenciler", {}).items():
+            self._kayitlar[oid] = _OgrenciKaydi(
+                k["ozet"], k["analiz_zamani"], [Uyari.from_dict(u) for u in k.get("uyarilar", [])],
+            )
+
+    def kaydet(self) -> None:
+        """Depoyu diske yazar (atomic write)."""
+        with self._kilit:
+            veri = {
+                "son_tarama": self.son_tarama,
+                "son_hata": self.son_hata,
+                "son_hata_zamani": self.son_hata_zamani,
+                "ogrenciler": {
+                    oid: {"ozet": k.ozet, "analiz_zamani": k.analiz_zamani,
+                          "uyarilar": [u.to_dict() for u in k.uyarilar]}
+                    for oid, k in self._kayitlar.items()
+                },
+            }
+            self.dosya_yolu.parent.mkdir(parents=True, exist_ok=True)
+            # Geçici dosya yazar başına tekil: komut satırı işi ile sunucu thread'i yarışabilir
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.dosya_yolu.parent,
+                prefix=f".{self.dosya_yolu.stem}.", suffix=".tmp", delete=False,
+            ) as f:
+                json.dump(veri, f, ensure_ascii=False, indent=2)
+            try:
+                os.replace(f.name, self.dosya_yolu)  # Atomic rename
+            except OSError:
+                Path(f.name).unlink(missing_ok=True)
+                raise
+
+    def hata_kaydet(self, hata: BaseException) -> None:
+        """Başarısız taramayı kaydeder; arayüz taramanın aksadığını gösterebilsin diye diske yazılır."""
+        with self._kilit:
+            self.son_hata = f"{type(hata).__name__}: {hata}"
+            self.son_hata_zamani = datetime.now().isoformat(timespec="seconds")
+            self.kaydet()
+
+    def guncel_mi(self, ogrenci: Ogrenci) -> bool:
+        k = self._kayitlar.get(ogrenci.ogrenci_id)
+        return k is not None and k.ozet == ogrenci_ozeti(ogrenci)
+
+    def analiz_et(self, ogrenci: Ogrenci, zaman: Optional[str] = None) -> List[Uyari]:
+        """Öğrenciyi yeniden analiz eder; süren uyarıların ilk tespit zamanı korunur."""
+        zaman = zaman or datetime.now().isoformat(timespec="seconds")
+        yeni = analizden_uyarilar(ogrenci, zaman)
+        with self._kilit:
+            eski = self._kayitlar.get(ogrenci.ogrenci_id)
+            if eski is not None:
+                onceki = {(u.kaynak, u.seviye, u.mesaj): u.zaman for u in eski.uyarilar}
+                for u in yeni:
+                    u.zaman = onceki.get((u.kaynak, u.seviye, u.mesaj), u.zaman)
+            self._kayitlar[ogrenci.ogrenci_id] = _OgrenciKaydi(ogrenci_ozeti(ogrenci), zaman, yeni)
+        return yeni
+
+    def ogrenci_uyarilari(self, ogrenci: Ogrenci) -> List[Uyari]:
+        """
+        Öğrencinin uyarıları: depodaki kayıt güncelse doğrudan, değilse
+        (ör. deneme az önce eklendi) yalnızca bu öğrenci analiz edilip yazılır.
+        """
+        with self._kilit:
+            if self.guncel_mi(ogrenci):
+                return list(self._kayitlar[ogrenci.ogrenci_id].uyarilar)
+        uyarilar = self.analiz_et(ogrenci)
+        self.kaydet()
+        return uyarilar
+
+    def tum_uyarilar(self, min_seviye: UyariSeviyesi = UyariSeviyesi.DIKKAT) -> List[Uyari]:
+        """Tüm öğrencilerin etkin uyarıları; en ağır ve en eski önce."""
+        with self._kilit:
+            uyarilar = [u for k in self._kayitlar.values() for u in k.uyarilar if u.seviye_degeri >= min_seviye.value]
+        return sorted(uyarilar, key=lambda u: (-u.seviye_degeri, u.zaman, u.ad))
+
+    def tara(self, ogrenciler: Iterable[Ogrenci]) -> TaramaSonucu:
+        """Yalnızca özeti değişen öğrencileri analiz eder; silinen öğrencilerin kayıtlarını kaldırır."""
+        bas = time.perf_counter()
+        zaman = datetime.now().isoformat(timespec="seconds")
+        ogrenciler = list(ogrenciler)
+        analiz, degismeyen = 0, 0
+        for o in ogrenciler:
+            if self.guncel_mi(o):
+                degismeyen += 1
+            else:
+                self.analiz_et(o, zaman)
+                analiz += 1
+        with self._kilit:
+            mevcut = {o.ogrenci_id for o in ogrenciler}
+            silinecek = [oid for oid in self._kayitlar if oid not in mevcut]
+            for oid in silinecek:
+                del self._kayitlar[oid]
+            self.son_tarama = zaman
+            hata_vardi = self.son_hata is not None
+            self.son_hata = self.son_hata_zamani = None
+        if analiz or silinecek or hata_vardi:
+            self.kaydet()
+        return TaramaSonucu(analiz, degismeyen, len(silinecek), round(time.perf_counter() - bas, 4))
+
+
+_DEPOLAR: Dict[Path, UyariDeposu] = {}
+_DEPO_KILIDI = threading.Lock()
+
+
+def uyari_deposu(dosya_yolu: Path = _VARSAYILAN_DEPO_YOLU) -> UyariDeposu:
+    """Süreç içinde yol başına tek depo (thread ile uygulama aynı nesneyi paylaşır)."""
+    yol = Path(dosya_yolu).resolve()
+    with _DEPO_KILIDI:
+        if yol not in _DEPOLAR:
+            _DEPOLAR[yol] = UyariDeposu(yol)
+        return _DEPOLAR[yol]
+
+
+# ──────────────────────────────────────────────
+# Zamanlanmış tarama
+# ──────────────────────────────────────────────
+def dosyadan_tara(ogrenci_yolu: Path, depo: UyariDeposu) -> TaramaSonucu:
+    """Öğrenci dosyasını yeniden okuyup tarar (başka süreçlerin yazdıkları da görülür)."""
+    from core.veritabani import OgrenciRepository
+
+    # Salt okunur: tarama öğrenci dosyasını asla yeniden yazmaz (arayüz kayıtlarıyla yarışmaz)
+    return depo.tara(OgrenciRepository(Path(ogrenci_yolu), yaz=False).hepsini_getir())
+
+
+class ArkaPlanUyariServisi:
+    """
+    Öğrenci dosyasını belirli aralıklarla tarayan daemon thread.
+    Dosyanın değiştirilme zamanı ve kural kümesi son taramadan beri aynıysa
+    tarama atlanır.
+    """
+
+    def __init__(
+        self,
+        ogrenci_yolu: Path = _VARSAYILAN_OGRENCI_YOLU,
+        depo: Optional[UyariDeposu] = None,
+        aralik_sn: float = VARSAYILAN_ARALIK_SN,
+    ):
+        self.ogrenci_yolu = Path(ogrenci_yolu)
+        self.depo = depo or uyari_deposu()
+        self.aralik_sn = aralik_sn
+        self.son_sonuc: Optional[TaramaSonucu] = None
+        self._son_imza: Optional[tuple] = None
+        self._dur = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def bir_kez_calistir(self) -> Optional[TaramaSonucu]:
+        """Dosya değiştiyse bir tarama yapar; değişmediyse None."""
+        try:
+            mtime = self.ogrenci_yolu.stat().st_mtime_ns
+        except OSError:
+            return None
+        imza = (mtime, kural_kumesi().surum)   # Kural dosyası düzeltilince de yeniden taranır
+        if imza == self._son_imza:
+            return None
+        self.son_sonuc = dosyadan_tara(self.ogrenci_yolu, self.depo)
+        self._son_imza = imza
+        return self.son_sonuc
+
+    def _dongu(self) -> None:
+        while not self._dur.is_set():
+            try:
+                self.bir_kez_calistir()
+            except Exception as e:  # Thread ölmesin; bir sonraki turda yeniden denenir
+                _log.exception("Erken uyarı taraması başarısız: %s", self.ogrenci_yolu)
+                try:
+                    self.depo.hata_kaydet(e)
+                except OSError:
+                    _log.exception("Tarama hatası uyarı deposuna yazılamadı")
+            self._dur.wait(self.aralik_sn)
+
+    def baslat(self) -> "ArkaPlanUyariServisi":
+        if self._thread is None or not self._thread.is_alive():
+            self._dur.clear()
+            self._thread = threading.Thread(target=self._dongu, name="omnipdr-erken-uyari", daemon=True)
+            self._thread.start()
+        return self
+
+    def durdur(self, bekle: bool = True) -> None:
+        self._dur.set()
+        if bekle and self._thread is not None:
+            self._thread.join()
+
+    @property
+    def calisiyor(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+_SERVIS: Optional[ArkaPlanUyariServisi] = None
+
+
+def arka_plan_servisi_baslat(
+    ogrenci_yolu: Path = _VARSAYILAN_OGRENCI_YOLU,
+    aralik_sn: float = VARSAYILAN_ARALIK_SN,
+) -> ArkaPlanUyariServisi:
+    """Süreç başına tek arka plan servisi başlatır (Streamlit yeniden çalıştırmalarında tekrar başlamaz)."""
+    global _SERVIS
+    with _DEPO_KILIDI:
+        if _SERVIS is None:
+            _SERVIS = ArkaPlanUyariServisi(ogrenci_yolu, aralik_sn=aralik_sn)
+    return _SERVIS.baslat()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Erken uyarı taramasını bir kez veya belirli aralıklarla çalıştırır."""
+    ayr = argparse.ArgumentParser(description="OmniPDR erken uyarı taraması")
+    ayr.add_argument("--ogrenciler", type=Path, default=_VARSAYILAN_OGRENCI_YOLU)
+    ayr.add_argument("--depo", type=Path, default=_VARSAYILAN_DEPO_YOLU)
+    ayr.add_argument("--aralik", type=float, default=VARSAYILAN_ARALIK_SN, help="Saniye")
+    ayr.add_argument("--bir-kez", action="store_true", help="Tek tarama yapıp çık")
+    args = ayr.parse_args(argv)
+
+    servis = ArkaPlanUyariServisi(args.ogrenciler, UyariDeposu(args.depo), args.aralik)
+    while True:
+        sonuc = servis.bir_kez_calistir()
+        if sonuc is not None:
+            print(f"{sonuc.analiz_edilen} analiz, {sonuc.degismeyen} değişmeyen, "
+                  f"{sonuc.silinen} silinen ({sonuc.sure_sn:.2f} sn) → {args.depo}")
+            for u in servis.depo.tum_uyarilar(UyariSeviyesi.UYARI)[:10]:
+                print(f"  [{u.seviye}] {u.ad}: {u.mesaj}")
+        if args.bir_kez:
+            break
+        time.sleep(args.aralik)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+OmniPDR – core/faset_indeksi.py
+===================================
+Katalog filtreleri için önceden hesaplanmış faset (değer + sayı) indeksi.
+
+Tasarım kararı: Her faset alanı (şehir, üniversite, bölüm, puan türü, tür)
+katalog yüklenirken bir kez Türkçe alfabetik sıralı değer listesine ve
+kayıt başına int32 koda dönüştürülür. Filtre altındaki sayılar, kod
+dizileri üzerinde maske + np.bincount ile hesaplanır; filtre widget'ları
+büyük katalogda da anında çizilir.
+
+Kullanım:
+    faset = FasetIndeksi({"sehir": [...], "puan_turu": [...]})
+    faset.sayimlar("sehir", {"puan_turu": "SAY"})   # [("Adana", 41), ...]
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.turkce import tr_siralama_anahtari
+
+Filtre = Mapping[str, Union[str, Sequence[str], None]]
+
+
+class FasetIndeksi:
+    """Alan başına sıralı değerler ve kayıt kodları; filtreli sayım sorguları."""
+
+    def __init__(self, sutunlar: Mapping[str, Sequence[str]]):
+        self._degerler: Dict[str, List[str]] = {}
+        self._kod_sozlugu: Dict[str, Dict[str, int]] = {}
+        self._kodlar: Dict[str, np.ndarray] = {}
+        self._kayit_sayisi = 0
+        for alan, sutun in sutunlar.items():
+            degerler = sorted(set(sutun), key=tr_siralama_anahtari)
+            sozluk = {d: i for i, d in enumerate(degerler)}
+            self._degerler[alan] = degerler
+            self._kod_sozlugu[alan] = sozluk
+            self._kodlar[alan] = np.fromiter((sozluk[d] for d in sutun), dtype=np.int32, count=len(sutun))
+            self._kayit_sayisi = len(sutun)
+        self._toplam_sayimlar = {
+            alan: np.bincount(kodlar, minlength=len(self._degerler[alan]))
+            for alan, kodlar in self._kodlar.items()
+        }
+
+    @property
+    def alanlar(self) -> List[str]:
+        return list(self._degerler)
+
+    def degerler(self, alan: str) -> List[str]:
+        """Alanın tekil değerleri, Türkçe alfabetik sırada."""
+        return list(self._degerler[alan])
+
+    def maske(self, filtreler: Optional[Filtre] = None, haric: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Filtrelere uyan kayıtlar için boolean maske (filtre yoksa None).
+        Filtre değeri tek değer veya değer listesi olabilir; boş/None yok sayılır.
+        haric: Bu alanın filtresi uygulanmaz (faset kendi seçeneklerini daraltmasın diye).
+        """
+        sonuc: Optional[np.ndarray] = None
+        for alan, secim in (filtreler or {}).items():
+            if alan == haric or not secim:
+                continue
+            secimler = [secim] if isinstance(secim, str) else list(secim)
+            kodlar = [self._kod_sozlugu[alan][s] for s in secimler if s in self._kod_sozlugu[alan]]
+            if len(kodlar) == 1:
+                alan_maskesi = self._kodlar[alan] == kodlar[0]
+            else:
+                alan_maskesi = np.isin(self._kodlar[alan], kodlar)
+            sonuc = alan_maskesi if sonuc is None else sonuc & alan_maskesi
+        return sonuc
+
+    def sayimlar(
+        self,
+        alan: str,
+        filtreler: Optional[Filtre] = None,
+        sifirlari_dahil_et: bool = False,
+    ) -> List[Tuple[str, int]]:
+        """
+        Alanın (değer, kayıt sayısı) listesi, etkin filtreler altında ve
+        Türkçe alfabetik sırada. Alanın kendi filtresi sayımlara uygulanmaz.
+        """
+        maske = self.maske(filtreler, haric=alan)
+        if maske is None:
+            sayim = self._toplam_sayimlar[alan]
+        else:
+            sayim = np.bincount(self._kodlar[alan][maske], minlength=len(self._degerler[alan]))
+        return [
+            (d, int(n)) for d, n in zip(self._degerler[alan], sayim)
+            if sifirlari_dahil_et or n
+        ]
+
+    def __len__(self) -> int:
+        return self._kayit_sayisi
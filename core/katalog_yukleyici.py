@@ -0,0 +1,225 @@
+"""
+OmniPDR – core/katalog_yukleyici.py
+=======================================
+CSV/JSON veri dosyalarından katalog yükleyici.
+
+Tasarım kararı: Yükleyici şemaya dayalıdır; YÖK Atlas bölüm kataloğu ve
+LGS lise kataloğu aynı altyapıyı kullanır. Ayrıştırılmış ve doğrulanmış
+satırlar, dosyanın SHA-256 özetiyle adlandırılan kompakt bir pickle
+anlık görüntüsüne yazılır. Dosya değişmedikçe sonraki açılışlarda yalnızca
+bu görüntü okunur (milisaniyeler).
+
+Kullanım:
+    sonuc = tablo_yukle(Path("data/yokatlas_katalog.csv"), BOLUM_SEMASI)
+    bolumler = [BolumBilgisi(*s) for s in sonuc.satirlar]
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import pickle
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+_VARSAYILAN_ONBELLEK_DIZINI = Path(__file__).parent.parent / "data" / ".onbellek"
+_AYRISTIRICI_SURUMU = 2      # Sayı ayrıştırma kuralları değişince eski anlık görüntüler okunmaz
+_BINLIK_DESENI = re.compile(r"^[+-]?\d{1,3}(\.\d{3})+(,\d+)?$")   # "1.100", "1.234,5"
+
+
+class KatalogHatasi(ValueError):
+    """Katalog dosyası okunamadığında veya doğrulanamadığında fırlatılır."""
+
+
+# ──────────────────────────────────────────────
+# Şema Tanımı
+# ──────────────────────────────────────────────
+@dataclass(frozen=True)
+class Alan:
+    """Katalogdaki tek bir sütun."""
+    ad: str
+    tip: type                              # str, int veya float
+    zorunlu: bool = True
+    varsayilan: object = None
+    izinli: Optional[FrozenSet[str]] = None
+
+
+@dataclass(frozen=True)
+class Sema:
+    """
+    Satırların sütun sırası ve doğrulama kuralları.
+    kontrol: Ayrıştırılmış satırı alır, geçersizse hata mesajı döndürür.
+    """
+    ad: str
+    alanlar: Tuple[Alan, ...]
+    kontrol: Optional[Callable[[Dict[str, object]], Optional[str]]] = None
+
+    @property
+    def surum(self) -> str:
+        """Şema değişirse eski anlık görüntüler kullanılmasın diye alan tanımlarının özeti."""
+        ham = repr([(a.ad, a.tip.__name__, a.zorunlu, a.varsayilan, sorted(a.izinli or [])) for a in self.alanlar])
+        ham += f"|{_AYRISTIRICI_SURUMU}"
+        return hashlib.sha1(ham.encode("utf-8")).hexdigest()[:8]
+
+
+@dataclass
+class YuklemeSonucu:
+    """Yükleme çıktısı: şema sırasıyla demetler ve atlanan satırların hataları."""
+    satirlar: List[tuple]
+    hatalar: List[str] = field(default_factory=list)
+    ozet: str = ""
+    onbellekten: bool = False
+
+
+# ──────────────────────────────────────────────
+# Ayrıştırma
+# ──────────────────────────────────────────────
+def _sayi_cevir(deger: object, tip: type):
+    """
+    Türkçe yazımı da kabul eden sayı dönüşümü ("489,2" → 489.2, "1.100" → 1100,
+    "1.234,5" → 1234.5). Nokta yalnızca binlik deseninde ayırıcı sayılır;
+    "350.0" gibi ondalıklı yazılmış tam sayılar kabul edilir, kesirli değerler
+    tam sayı alanında ValueError fırlatır.
+    """
+    if isinstance(deger, bool):
+        raise ValueError("sayı değil")
+    if isinstance(deger, (int, float)):
+        sayi = float(deger)
+    else:
+        metin = str(deger).strip().replace(" ", "")
+        # Float alanlarda "489.123" ondalıktır; binlik noktası yalnızca virgülle birlikte ayıklanır
+        if _BINLIK_DESENI.match(metin) and (tip is int or "," in metin):
+            metin = metin.replace(".", "")
+        if "," in metin and "." not in metin:
+            metin = metin.replace(",", ".")
+        try:
+            sayi = float(metin)
+        except ValueError:
+            raise ValueError("sayı değil") from None
+    if not math.isfinite(sayi):
+        raise ValueError("sayı değil")
+    if tip is int:
+        if not sayi.is_integer():
+            raise ValueError("tam sayı değil")
+        return int(deger) if isinstance(deger, int) else int(sayi)
+    return sayi
+
+
+def _satir_ayristir(ham: Dict[str, object], sema: Sema) -> tuple:
+    degerler: Dict[str, object] = {}
+    for alan in sema.alanlar:
+        deger = ham.get(alan.ad)
+        if deger is None or (isinstance(deger, str) and not deger.strip()):
+            if alan.zorunlu:
+                raise ValueError(f"'{alan.ad}' alanı eksik")
+            degerler[alan.ad] = alan.varsayilan
+            continue
+        if alan.tip is str:
+            deger = str(deger).strip()
+        else:
+            try:
+                deger = _sayi_cevir(deger, alan.tip)
+            except ValueError as e:
+                raise ValueError(f"'{alan.ad}' {e}: {deger!r}") from None
+        if alan.izinli is not None and deger not in alan.izinli:
+            raise ValueError(f"'{alan.ad}' geçersiz: {deger!r}")
+        degerler[alan.ad] = deger
+
+    if sema.kontrol:
+        hata = sema.kontrol(degerler)
+        if hata:
+            raise ValueError(hata)
+    return tuple(degerler[a.ad] for a in sema.alanlar)
+
+
+def _ham_satirlar(icerik: bytes, uzanti: str) -> List[Dict[str, object]]:
+    metin = icerik.decode("utf-8-sig")
+    if uzanti == ".json":
+        veri = json.loads(metin)
+        if isinstance(veri, dict):
+            # {"bolumler": [...]} veya {"liseler": [...]} gibi tek anahtarlı sarmalayıcı
+            veri = next((v for v in veri.values() if isinstance(v, list)), [])
+        return list(veri)
+    if uzanti == ".csv":
+        ornek = metin[:4096]
+        ayirici = ";" if ornek.count(";") > ornek.count(",") else ","
+        return list(csv.DictReader(io.StringIO(metin), delimiter=ayirici))
+    raise KatalogHatasi(f"Desteklenmeyen katalog biçimi: {uzanti}")
+
+
+# ──────────────────────────────────────────────
+# Anlık Görüntülü Yükleme
+# ──────────────────────────────────────────────
+def tablo_yukle(
+    yol: Path,
+    sema: Sema,
+    onbellek_dizini: Optional[Path] = _VARSAYILAN_ONBELLEK_DIZINI,
+    kati: bool = False,
+) -> YuklemeSonucu:
+    """
+    Katalog dosyasını okur, doğrular ve anlık görüntüsünü önbelleğe yazar.
+    kati=True ise ilk geçersiz satırda KatalogHatasi fırlatılır; aksi halde
+    geçersiz satırlar atlanıp hatalar listesine eklenir.
+    onbellek_dizini=None ise anlık görüntü kullanılmaz.
+    """
+    yol = Path(yol)
+    if not yol.exists():
+        raise KatalogHatasi(f"Katalog dosyası bulunamadı: {yol}")
+
+    icerik = yol.read_bytes()
+    ozet = hashlib.sha256(icerik).hexdigest()[:16]
+    goruntu = None
+    if onbellek_dizini is not None:
+        goruntu = onbellek_dizini / f"{sema.ad}_{sema.surum}_{ozet}.pkl"
+        if goruntu.exists():
+            try:
+                with open(goruntu, "rb") as f:
+                    satirlar, hatalar = pickle.load(f)
+                return YuklemeSonucu(satirlar, hatalar, ozet, onbellekten=True)
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+                pass  # Bozuk görüntü: dosyadan yeniden ayrıştır
+
+    satirlar: List[tuple] = []
+    hatalar: List[str] = []
+    for no, ham in enumerate(_ham_satirlar(icerik, yol.suffix.lower()), start=1):
+        try:
+            satirlar.append(_satir_ayristir(ham, sema))
+        except (ValueError, TypeError, AttributeError) as e:
+            if kati:
+                raise KatalogHatasi(f"{yol.name} satır {no}: {e}") from None
+            hatalar.append(f"satır {no}: {e}")
+
+    if not satirlar:
+        raise KatalogHatasi(f"{yol.name} içinde geçerli satır yok.")
+
+    if goruntu is not None:
+        _goruntu_yaz(goruntu, (satirlar, hatalar), sema)
+    return YuklemeSonucu(satirlar, hatalar, ozet)
+
+
+def _goruntu_yaz(goruntu: Path, veri: tuple, sema: Sema) -> None:
+    """Anlık görüntüyü atomik yazar ve aynı şemanın eski görüntülerini siler."""
+    goruntu.parent.mkdir(parents=True, exist_ok=True)
+    tmp_yol = goruntu.with_suffix(".tmp")
+    with open(tmp_yol, "wb") as f:
+        pickle.dump(veri, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_yol, goruntu)  # Atomic rename
+    for eski in goruntu.parent.glob(f"{sema.ad}_*.pkl"):
+        if eski != goruntu:
+            eski.unlink(missing_ok=True)
+
+
+def tablo_disa_aktar(yol: Path, satirlar: Sequence[tuple], sema: Sema) -> None:
+    """Satırları şema sütunlarıyla CSV olarak yazar (veri dosyası şablonu üretmek için)."""
+    yol = Path(yol)
+    yol.parent.mkdir(parents=True, exist_ok=True)
+    with open(yol, "w", encoding="utf-8", newline="") as f:
+        yazici = csv.writer(f)
+        yazici.writerow([a.ad for a in sema.alanlar])
+        yazici.writerows(satirlar)
@@ -0,0 +1,163 @@
+"""
+OmniPDR – core/kohort_analizi.py
+====================================
+Kurum geneli toplu risk taraması.
+
+AnalizMotoru'nun tükenmişlik (burnout), ZPD ve trend kurallarının
+girdileri, tüm denemelerin uzun tablosu (deneme_tablosu) üzerinde grup
+işlemleriyle vektörel hesaplanır (bkz. kural_motoru.ozellik_tablosu);
+öğrenci başına AnalizMotoru kurulmaz. Burnout ve kurum uyarı
+kuralları core/kural_motoru.py'deki derlenmiş kural kümesiyle öğrenci ×
+özellik dizileri üzerinde tek geçişte değerlendirilir; tekil analiz aynı
+kümeyi kullandığından ikisi aynı sonucu verir.
+
+deneme_tablosu, trende giren tüm denemeleri tek uzun tabloda toplar (toplu
+analizler için; onaylanmamış şüpheli denemeler hariç).
+
+Kullanım:
+    tablo = kohort_risk_tablosu(repo.hepsini_getir())
+    tablo[tablo["risk_kodu"] >= UyariSeviyesi.UYARI.value]
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.analiz_motoru import AnalizMotoru, BurnoutTipi, UyariSeviyesi
+from core.kural_motoru import kural_kumesi, ozellik_tablosu
+from models.ogrenci_sinifi import Ogrenci
+
+ZPD_HEDEF_CARPANI = 1.07        # AnalizMotoru.zpd_analizi ile aynı (+%7 kısa vadeli hedef)
+TREND_ESIGI = 2.0               # |son − önceki| > 2 net → yükseliş/düşüş
+
+ZPD_DURUMLARI = {
+    "yetersiz": "Yetersiz veri",
+    "kaygi": "Hedef ZPD Üstü (Kaygı Bölgesi)",
+    "sikilma": "Hedef ZPD Altı (Sıkılma Bölgesi)",
+    "optimal": "✅ Hedef ZPD'de (Optimal Bölge)",
+    "hedefsiz": "ZPD Hesaplandı",
+}
+
+TABLO_SUTUNLARI = [
+    "ogrenci_id", "ad", "sinav_turu", "deneme_sayisi",
+    "seviye", "risk_kodu", "burnout_tipi", "kural", "kural_uyarilari",
+    "ort_net_eski", "ort_net_yeni", "ort_calisma_eski", "ort_calisma_yeni",
+    "son_stres", "son_uyku",
+    "zpd_baz", "zpd_alt", "zpd_ust", "zpd_hedef", "zpd_durumu",
+    "son_net", "trend_farki", "trend",
+]
+
+
+# ──────────────────────────────────────────────
+# Uzun deneme tablosu
+# ──────────────────────────────────────────────
+def deneme_tablosu(ogrenciler: Sequence[Ogrenci]) -> pd.DataFrame:
+    """
+    Tüm öğrencilerin denemeleri tek tabloda: (ogr, sira, toplam_net,
+    calisma_saati, stres_puani, uyku_saati). ogr öğrenci listesindeki
+    dizin, sira öğrencinin trend denemeleri içindeki konumudur.
+    """
+    kayitlar = [(i, k) for i, o in enumerate(ogrenciler) for k in o.trend_kayitlari]
+    n = len(kayitlar)
+    ogr = np.fromiter((i for i, _ in kayitlar), dtype=np.int64, count=n)
+    sayilar = np.bincount(ogr, minlength=len(ogrenciler))
+    # Grup başlangıçlarından sıra numarası: arange − grup başlangıcı
+    baslangic = np.cumsum(sayilar) - sayilar
+    sira = np.arange(n) - np.repeat(baslangic, sayilar)
+    return pd.DataFrame({
+        "ogr": ogr,
+        "sira": sira,
+        "toplam_net": np.fromiter((sum(k.netleri.values()) for _, k in kayitlar), dtype=np.float64, count=n),
+        "calisma_saati": np.fromiter((k.calisma_saati for _, k in kayitlar), dtype=np.float64, count=n),
+        "stres_puani": np.fromiter((k.stres_puani for _, k in kayitlar), dtype=np.float64, count=n),
+        "uyku_saati": np.fromiter((k.uyku_saati for _, k in kayitlar), dtype=np.float64, count=n),
+    })
+
+
+# ──────────────────────────────────────────────
+# Toplu kurallar
+# ──────────────────────────────────────────────
+def kohort_risk_tablosu(ogrenciler: Sequence[Ogrenci]) -> pd.DataFrame:
+    """
+    Her öğrenci için burnout tipi ve uyarı seviyesi, ZPD sınırları ve
+    haftalık trend. Sonuç risk seviyesine (yüksekten düşüğe), sonra trend
+    farkına (en çok düşenden) göre sıralıdır.
+    """
+    S = len(ogrenciler)
+    if S == 0:
+        return pd.DataFrame(columns=TABLO_SUTUNLARI)
+    oz = ozellik_tablosu(ogrenciler)
+    sayi = oz["deneme_sayisi"].astype(np.int64)
+    zpd_baz, son_net, onceki_net = oz["zpd_baz"], oz["son_net"], oz["onceki_net"]
+
+    # Burnout: ilk eşleşen kural; yetersiz veride kurallar çalışmaz (AnalizMotoru.burnout_analizi gibi)
+    kume = kural_kumesi()
+    kod = np.where(sayi >= AnalizMotoru.MIN_KAYIT_BURNOUT, kume.burnout_kodlari(oz), -1) + 1
+    tipler = np.array([BurnoutTipi.YOK] + [k.tip for k in kume.burnout_kurallari], dtype=object)
+    seviyeler = np.array([UyariSeviyesi.NORMAL] + [k.seviye for k in kume.burnout_kurallari], dtype=object)
+    kural_adlari = np.array([""] + [k.ad for k in kume.burnout_kurallari], dtype=object)
+    uyari_adlari = [k.ad for k in kume.uyari_kurallari]
+    kural_uyarilari = [
+        ", ".join(ad for ad, e in zip(uyari_adlari, satir) if e) for satir in kume.uyari_matrisi(oz)
+    ]
+
+    # ── ZPD: son 3 denemenin ortalaması ──
+    zpd_alt = zpd_baz * AnalizMotoru.ZPD_ALT_YUZDE
+    zpd_ust = zpd_baz * AnalizMotoru.ZPD_UST_YUZDE
+    hedef_net = oz["hedef_net"]
+    zpd_durumu = np.select(
+        [sayi < AnalizMotoru.MIN_KAYIT_ZPD, np.isnan(hedef_net), hedef_net > zpd_ust, hedef_net < zpd_alt],
+        ["yetersiz", "hedefsiz", "kaygi", "sikilma"], default="optimal",
+    )
+
+    # ── Haftalık trend: son iki deneme farkı ──
+    trend_farki = son_net - onceki_net
+    trend = np.select(
+        [np.isnan(trend_farki), trend_farki > TREND_ESIGI, trend_farki < -TREND_ESIGI],
+        ["Yetersiz veri", "↑ Yükseliyor", "↓ Düşüyor"], default="→ Sabit",
+    )
+
+    seviye = seviyeler[kod]
+    tablo = pd.DataFrame({
+        "ogrenci_id": [o.ogrenci_id for o in ogrenciler],
+        "ad": [o.ad for o in ogrenciler],
+        "sinav_turu": [o.sinav_turu for o in ogrenciler],
+        "deneme_sayisi": sayi,
+        "seviye": seviye,
+        "risk_kodu": np.array([s.value for s in seviyeler])[kod],
+        "burnout_tipi": tipler[kod],
+        "kural": kural_adlari[kod],
+        "kural_uyarilari": kural_uyarilari,
+        "ort_net_eski": oz["ort_net_eski"],
+        "ort_net_yeni": oz["ort_net_yeni"],
+        "ort_calisma_eski": oz["ort_calisma_eski"],
+        "ort_calisma_yeni": oz["ort_calisma_yeni"],
+        "son_stres": oz["son_stres"],
+        "son_uyku": oz["son_uyku"],
+        "zpd_baz": zpd_baz,
+        "zpd_alt": np.round(zpd_alt, 1),
+        "zpd_ust": np.round(zpd_ust, 1),
+        "zpd_hedef": np.round(zpd_baz * ZPD_HEDEF_CARPANI, 1),
+        "zpd_durumu": pd.Series(zpd_durumu).map(ZPD_DURUMLARI).to_numpy(),
+        "son_net": son_net,
+        "trend_farki": trend_farki,
+        "trend": trend,
+    }, columns=TABLO_SUTUNLARI)
+    return tablo.sort_values(
+        ["risk_kodu", "trend_farki"], ascending=[False, True], na_position="last", kind="stable",
+    ).reset_index(drop=True)
+
+
+def risk_ozeti(tablo: pd.DataFrame) -> pd.DataFrame:
+    """Burnout tipi × uyarı seviyesi başına öğrenci sayısı."""
+    if tablo.empty:
+        return pd.DataFrame(columns=["Seviye", "Burnout Tipi", "Öğrenci"])
+    ozet = (
+        tablo.assign(Seviye=tablo["seviye"].map(lambda s: s.name),
+                     **{"Burnout Tipi": tablo["burnout_tipi"].map(lambda t: t.value)})
+        .groupby(["risk_kodu", "Seviye", "Burnout Tipi"]).size().rename("Öğrenci").reset_index()
+    )
+    return ozet.sort_values("risk_kodu", ascending=False).drop(columns="risk_kodu").reset_index(drop=True)
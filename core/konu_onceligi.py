@@ -0,0 +1,328 @@
+"""
+OmniPDR – core/konu_onceligi.py
+====================================
+Hata geçmişi × sınav soru ağırlığı ile konu öncelik skoru.
+
+Her öğrenci ve konu için:
+
+    öncelik = beklenen soru sayısı × hata oranı × (1 − ilerleme)
+
+  • Beklenen soru: models/konu_istatistikleri.py'deki son 5 yıl
+    ortalaması; orada olmayan konular için models/soru_dagilimi.py,
+    o da yoksa dersin soru sayısından bilinen konuların payı düşülerek
+    kalan soruların eşit dağıtılması.
+  • Hata oranı: konudaki hata kaydı sayısının Beta(1, 2) önseliyle
+    düzleştirilmiş hâli, (h + 1) / (h + 3). Hiç hata yoksa 1/3; her
+    hata oranı 1'e yaklaştırır. Hata kaydı olmayan ama hiç çalışılmamış
+    ağır konular böylece sıfırlanmaz.
+  • İlerleme: Konu Takibi sekmesindeki yüzde (0–100) → 0–1.
+
+Skor, sınavda o konudan "kaybedilmesi beklenen soru" olarak okunabilir.
+
+Tüm konular tek bir katalogda tamsayı kimliklerle (konu_id) kodlanır.
+Serbest metin hata kayıtları (ders/konu) Türkçe katlamalı eşleştirmeyle
+bir kez koda çevrilir; öğrenci × konu matrisleri bincount ve dizinleme
+ile kurulur, yani birleştirmeler sözlük döngüsü yerine tamsayı dizileri
+üzerinde yapılır. Öğrenci tablosu önbelleğe alınır; kohort görünümü
+aynı matrislerden tek geçişte hesaplanır.
+
+Kullanım:
+    tablo = konu_oncelikleri(ogrenci).head(10)
+    sinif = kohort_konu_oncelikleri(repo.hepsini_getir())
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.onbellek import LRUOnbellek
+from core.puan_hesaplama import AYT_DERSLER, AYT_PUAN_KATSAYILARI, LGS_DERSLER, TYT_DERSLER
+from core.turkce import tr_katla
+from models.konu_istatistikleri import SORU_DAGILIMLARI
+from models.konu_verileri import AYT_KONULARI, LGS_KONULARI, TYT_KONULARI
+from models.ogrenci_sinifi import HataKaydi, Ogrenci
+from models.soru_dagilimi import AYT_DAGILIM, TYT_DAGILIM
+
+
+# ──────────────────────────────────────────────
+# Sabitler
+# ──────────────────────────────────────────────
+HATA_ONSEL_A = 1.0              # Beta önseli: (h + a) / (h + a + b)
+HATA_ONSEL_B = 2.0
+ILK_N = 5                       # Kohort görünümünde "öğrencinin ilk N konusu"
+_MIN_KISMI_ESLESME = 4          # Kısa metinler (ör. "mat") konu adının içinde aranmaz
+
+_BOLUMLER = (
+    ("YKS", "TYT", TYT_KONULARI, TYT_DERSLER, TYT_DAGILIM),
+    ("YKS", "AYT", AYT_KONULARI, AYT_DERSLER, AYT_DAGILIM),
+    ("LGS", "LGS", LGS_KONULARI, LGS_DERSLER, {}),
+)
+
+TABLO_SUTUNLARI = [
+    "konu_id", "bolum", "ders", "konu", "beklenen_soru", "kaynak",
+    "hata_sayisi", "hata_orani", "ilerleme", "oncelik",
+]
+KOHORT_SUTUNLARI = [
+    "konu_id", "bolum", "ders", "konu", "beklenen_soru",
+    "ogrenci_sayisi", "ilk_n_ogrenci", "ortalama_oncelik",
+    "toplam_hata", "ortalama_ilerleme",
+]
+
+_ONCELIK_ONBELLEGI = LRUOnbellek("konu_onceligi", kapasite=1024)
+
+
+# ──────────────────────────────────────────────
+# Konu kataloğu (konu_id ↔ sınav/ders/konu)
+# ──────────────────────────────────────────────
+def _ortalama(sayilar) -> float:
+    degerler = list(sayilar)
+    return float(sum(degerler)) / len(degerler) if degerler else 0.0
+
+
+@lru_cache(maxsize=None)
+def konu_katalogu() -> pd.DataFrame:
+    """
+    Tüm sınav konularının tablosu; indeks konu_id (0..K-1). Sütunlar:
+    aile (YKS/LGS), bolum, ders, konu, beklenen_soru, kaynak.
+    Paylaşılan nesnedir; değiştirilmemelidir.
+    """
+    satirlar: List[dict] = []
+    for aile, bolum, konular, ders_bilgisi, dagilim in _BOLUMLER:
+        istatistik = SORU_DAGILIMLARI.get(bolum, {})
+        for ders, konu_listesi in konular.items():
+            ders_istatistigi = istatistik.get(ders, {})
+            ders_dagilimi = {tr_katla(k): v for k, v in dagilim.get(ders, {}).items()}
+            ders_satirlari = []
+            for konu in konu_listesi:
+                if konu in ders_istatistigi:
+                    beklenen, kaynak = _ortalama(ders_istatistigi[konu].values()), "istatistik"
+                elif tr_katla(konu) in ders_dagilimi:
+                    beklenen, kaynak = _ortalama(ders_dagilimi[tr_katla(konu)]), "dagilim"
+                else:
+                    beklenen, kaynak = np.nan, "tahmini"
+                ders_satirlari.append({
+                    "aile": aile, "bolum": bolum, "ders": ders, "konu": konu,
+                    "beklenen_soru": beklenen, "kaynak": kaynak,
+                })
+            # Verisi olmayan konular: dersin kalan soruları eşit paylaştırılır
+            bilinmeyen = [s for s in ders_satirlari if s["kaynak"] == "tahmini"]
+            if bilinmeyen:
+                bilinen = sum(s["beklenen_soru"] for s in ders_satirlari if s["kaynak"] != "tahmini")
+                toplam = ders_bilgisi.get(ders, {}).get("soru_sayisi", 0)
+                pay = max(toplam - bilinen, 0.0) / len(bilinmeyen)
+                for s in bilinmeyen:
+                    s["beklenen_soru"] = pay
+            satirlar.extend(ders_satirlari)
+
+    katalog = pd.DataFrame(satirlar)
+    katalog.index = pd.RangeIndex(len(katalog), name="konu_id")
+    return katalog
+
+
+@lru_cache(maxsize=None)
+def _katlanmis_katalog() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(aile, katlanmış ders, katlanmış konu) dizileri; serbest metin eşleştirmesi için."""
+    katalog = konu_katalogu()
+    return (
+        katalog["aile"].to_numpy(),
+        np.array([tr_katla(d) for d in katalog["ders"]], dtype=object),
+        np.array([tr_katla(k) for k in katalog["konu"]], dtype=object),
+    )
+
+
+@lru_cache(maxsize=None)
+def _ilerleme_indeksi() -> Dict[Tuple[str, str, str], Tuple[int, ...]]:
+    """(aile, ders, konu) → konu_id'ler. YKS'de aynı ad TYT ve AYT'de bulunabilir."""
+    indeks: Dict[Tuple[str, str, str], Tuple[int, ...]] = {}
+    katalog = konu_katalogu()
+    for konu_id, (aile, ders, konu) in enumerate(zip(katalog["aile"], katalog["ders"], katalog["konu"])):
+        indeks[(aile, ders, konu)] = indeks.get((aile, ders, konu), ()) + (konu_id,)
+    return indeks
+
+
+@lru_cache(maxsize=8192)
+def hata_konu_kodu(aile: str, ders: str, konu: str) -> int:
+    """
+    Serbest metin hata kaydını konu_id'ye çevirir; eşleşmezse -1.
+
+    Ders adı katlanmış hâlde katalogdaki ders adını içeriyorsa ya da
+    onun içinde geçiyorsa aday sayılır ("Tarih" → Tarih, Tarih-1).
+    Konu önce birebir, sonra katalog adı metnin içinde ("Türev sorusu"),
+    en son metin katalog adının içinde ("paragraf") aranır. Birden çok
+    aday kalırsa en çok soru beklenen konu seçilir.
+    """
+    aileler, dersler, konular = _katlanmis_katalog()
+    beklenen = konu_katalogu()["beklenen_soru"].to_numpy()
+    ders_k, konu_k = tr_katla(ders), tr_katla(konu)
+    if not konu_k:
+        return -1
+
+    aday = aileler == aile
+    if ders_k:
+        ders_uyumu = aday & np.array([ders_k in d or d in ders_k for d in dersler])
+        if ders_uyumu.any():
+            aday = ders_uyumu
+
+    kosullar = [lambda k: k == konu_k, lambda k: k in konu_k]
+    if len(konu_k) >= _MIN_KISMI_ESLESME:
+        kosullar.append(lambda k: konu_k in k)
+    for kosul in kosullar:
+        eslesen = np.flatnonzero(aday & np.array([kosul(k) for k in konular]))
+        if len(eslesen):
+            return int(eslesen[np.argmax(beklenen[eslesen])])
+    return -1
+
+
+@lru_cache(maxsize=None)
+def _ilgili_konular(sinav_turu: str, puan_turu: str) -> np.ndarray:
+    """
+    Öğrencinin sınavında soru çıkabilecek konuların maskesi. YKS'de AYT
+    konuları yalnızca hedef puan türünde katsayısı olan derslerden gelir.
+    """
+    katalog = konu_katalogu()
+    if sinav_turu == "LGS":
+        return (katalog["bolum"] == "LGS").to_numpy()
+    katsayilar = AYT_PUAN_KATSAYILARI.get(puan_turu, AYT_PUAN_KATSAYILARI["SAY"])
+    ayt_gecerli = katalog["ders"].map(lambda d: katsayilar.get(d, 0.0) > 0)
+    return ((katalog["bolum"] == "TYT") | ((katalog["bolum"] == "AYT") & ayt_gecerli)).to_numpy()
+
+
+# ──────────────────────────────────────────────
+# Öğrenci verisini koda çevirme
+# ──────────────────────────────────────────────
+def _aile(ogrenci: Ogrenci) -> str:
+    return "LGS" if ogrenci.sinav_turu == "LGS" else "YKS"
+
+
+def _hata_kodlari(ogrenci: Ogrenci) -> np.ndarray:
+    aile = _aile(ogrenci)
+    return np.fromiter(
+        (hata_konu_kodu(aile, h.ders, h.konu) for h in ogrenci.hata_kayitlari),
+        dtype=np.int32, count=len(ogrenci.hata_kayitlari),
+    )
+
+
+def _ilerleme_kodlari(ogrenci: Ogrenci) -> Tuple[np.ndarray, np.ndarray]:
+    indeks = _ilerleme_indeksi()
+    aile = _aile(ogrenci)
+    kodlar: List[int] = []
+    degerler: List[float] = []
+    for ders, konular in ogrenci.konu_ilerlemeleri.items():
+        for konu, ilerleme in konular.items():
+            for konu_id in indeks.get((aile, ders, konu), ()):
+                kodlar.append(konu_id)
+                degerler.append(ilerleme)
+    return np.array(kodlar, dtype=np.int32), np.clip(np.array(degerler, dtype=float) / 100.0, 0.0, 1.0)
+
+
+def eslesmeyen_hatalar(ogrenci: Ogrenci) -> List[HataKaydi]:
+    """Hiçbir katalog konusuna eşleşmeyen (önceliğe katılmayan) hata kayıtları."""
+    kodlar = _hata_kodlari(ogrenci)
+    return [h for h, kod in zip(ogrenci.hata_kayitlari, kodlar) if kod < 0]
+
+
+# ──────────────────────────────────────────────
+# Öğrenci × konu matrisleri
+# ──────────────────────────────────────────────
+def _matrisler(ogrenciler: Sequence[Ogrenci]) -> Dict[str, np.ndarray]:
+    """
+    (öğrenci, konu) boyutlu hata sayısı, hata oranı, ilerleme, ilgililik
+    maskesi ve öncelik matrisleri. Birleştirmeler konu_id üzerinden:
+    hata sayıları bincount, ilerlemeler dizinli atama ile yerleşir.
+    """
+    beklenen = konu_katalogu()["beklenen_soru"].to_numpy()
+    S, K = len(ogrenciler), len(beklenen)
+
+    hata_kodlari = [_hata_kodlari(o) for o in ogrenciler]
+    satir = np.repeat(np.arange(S), [len(k) for k in hata_kodlari])
+    kod = np.concatenate(hata_kodlari) if S else np.empty(0, dtype=np.int32)
+    gecerli = kod >= 0
+    hata = np.bincount(satir[gecerli] * K + kod[gecerli], minlength=S * K).reshape(S, K).astype(float)
+
+    ilerleme = np.zeros((S, K))
+    for i, o in enumerate(ogrenciler):
+        kodlar, degerler = _ilerleme_kodlari(o)
+        ilerleme[i, kodlar] = degerler
+
+    maske = np.array(
+        [_ilgili_konular(o.sinav_turu, o.hedef_puan_turu) for o in ogrenciler], dtype=bool,
+    ).reshape(S, K)
+    oran = (hata + HATA_ONSEL_A) / (hata + HATA_ONSEL_A + HATA_ONSEL_B)
+    oncelik = np.where(maske, beklenen * oran * (1.0 - ilerleme), np.nan)
+    return {"hata": hata, "oran": oran, "ilerleme": ilerleme, "maske": maske, "oncelik": oncelik}
+
+
+def _oncelik_anahtari(ogrenci: Ogrenci) -> Tuple:
+    # HataKaydi'nın ders/konu alanları oluşturulduktan sonra değişmez; kimlik yeterli
+    return (
+        ogrenci.ogrenci_id, ogrenci.sinav_turu, ogrenci.hedef_puan_turu,
+        tuple(h.id for h in ogrenci.hata_kayitlari),
+        tuple((d, k, v) for d, konular in ogrenci.konu_ilerlemeleri.items() for k, v in konular.items()),
+    )
+
+
+def _ogrenci_tablosu(ogrenci: Ogrenci) -> pd.DataFrame:
+    m = _matrisler([ogrenci])
+    secim = np.flatnonzero(m["maske"][0])
+    tablo = konu_katalogu().iloc[secim].drop(columns="aile").reset_index()
+    tablo["hata_sayisi"] = m["hata"][0, secim].astype(int)
+    tablo["hata_orani"] = m["oran"][0, secim]
+    tablo["ilerleme"] = m["ilerleme"][0, secim]
+    tablo["oncelik"] = m["oncelik"][0, secim]
+    return tablo.sort_values(["oncelik", "beklenen_soru"], ascending=False, kind="stable")[
+        TABLO_SUTUNLARI
+    ].reset_index(drop=True)
+
+
+# ──────────────────────────────────────────────
+# Genel API
+# ──────────────────────────────────────────────
+def konu_oncelikleri(ogrenci: Ogrenci) -> pd.DataFrame:
+    """
+    Öğrencinin sınavındaki tüm konular, öncelik skoruna göre azalan sırada.
+    Hata kayıtları ya da konu ilerlemesi değişmedikçe önbellekten gelir.
+    """
+    tablo = _ONCELIK_ONBELLEGI.getir(_oncelik_anahtari(ogrenci), lambda: _ogrenci_tablosu(ogrenci))
+    return tablo.copy()
+
+
+def kohort_konu_oncelikleri(ogrenciler: Sequence[Ogrenci], ilk_n: int = ILK_N) -> pd.DataFrame:
+    """
+    Sınıf/kurum için "sıradaki ders" görünümü: her konu için o konunun
+    sınavında yer aldığı öğrenci sayısı, kaç öğrencinin ilk ilk_n
+    önceliği arasında olduğu ve ortalama öncelik. ilk_n_ogrenci ve
+    ortalama önceliğe göre sıralıdır.
+    """
+    if not ogrenciler:
+        return pd.DataFrame(columns=KOHORT_SUTUNLARI)
+    m = _matrisler(ogrenciler)
+    oncelik = m["oncelik"]
+    S, K = oncelik.shape
+
+    # Her öğrencinin ilk ilk_n konusu (ilgisiz konular −∞)
+    n = min(ilk_n, K)
+    sirali = np.where(np.isnan(oncelik), -np.inf, oncelik)
+    ilkler = np.argpartition(-sirali, n - 1, axis=1)[:, :n]
+    ilkler_maskesi = np.zeros((S, K), dtype=bool)
+    ilkler_maskesi[np.arange(S)[:, None], ilkler] = True
+    ilkler_maskesi &= m["maske"]
+
+    ogrenci_sayisi = m["maske"].sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ortalama_oncelik = np.nansum(oncelik, axis=0) / ogrenci_sayisi
+        ortalama_ilerleme = (m["ilerleme"] * m["maske"]).sum(axis=0) / ogrenci_sayisi
+
+    tablo = konu_katalogu().drop(columns=["aile", "kaynak"]).reset_index()
+    tablo["ogrenci_sayisi"] = ogrenci_sayisi
+    tablo["ilk_n_ogrenci"] = ilkler_maskesi.sum(axis=0)
+    tablo["ortalama_oncelik"] = ortalama_oncelik
+    tablo["toplam_hata"] = (m["hata"] * m["maske"]).sum(axis=0).astype(int)
+    tablo["ortalama_ilerleme"] = ortalama_ilerleme
+    tablo = tablo[tablo["ogrenci_sayisi"] > 0]
+    return tablo.sort_values(
+        ["ilk_n_ogrenci", "ortalama_oncelik"], ascending=False, kind="stable",
+    )[KOHORT_SUTUNLARI].reset_index(drop=True)
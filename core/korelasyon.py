@@ -0,0 +1,272 @@
+"""
+OmniPDR – core/korelasyon.py
+====================================
+Ders bazında ve gecikmeli korelasyon analizi.
+
+Hedefler (toplam net ve her dersin neti) ile haftalık faktörler (çalışma
+saati, stres, uyku) arasındaki tüm katsayılar tek matris işlemiyle
+hesaplanır: eksik değerler maskelenir ve her (hedef, faktör) çifti için
+ortak gözlemler üzerinden toplamlar matris çarpımlarıyla bulunur; sütun
+başına .corr çağrılmaz.
+
+  - Pearson veya Spearman (sıra dönüşümü ile)
+  - Gecikme: bu haftanın faktörü ile k deneme sonraki net
+  - Kohort: öğrenci içi merkezlenmiş, havuzlanmış korelasyon
+
+Veri kaynağı deneme_cercevesi'dir (AnalizMotoru.veri_cercevesi ile aynı
+önbellekli çerçeve).
+
+Kullanım:
+    sonuc = ogrenci_korelasyonlari(ogrenci, yontem="spearman", gecikme=1)
+    sonuc.katsayilar.loc["net_Matematik", "uyku_saati"]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.analiz_motoru import deneme_cercevesi
+from core.turkce import tr_siralama_anahtari
+from models.ogrenci_sinifi import Ogrenci
+
+FAKTORLER = ("calisma_saati", "stres_puani", "uyku_saati")
+YONTEMLER = ("pearson", "spearman")
+MIN_GOZLEM = 3                  # Daha az ortak gözlemli çiftler NaN döner
+_SABIT_ESIGI = 1e-12            # Göreli varyans eşiği (sabit sütun → NaN)
+
+FAKTOR_ETIKETLERI = {
+    "calisma_saati": "Çalışma Saati",
+    "stres_puani": "Stres",
+    "uyku_saati": "Uyku",
+}
+
+
+@dataclass
+class KorelasyonSonucu:
+    """Hedef × faktör katsayı matrisi ve her çiftin ortak gözlem sayısı."""
+    katsayilar: pd.DataFrame
+    gozlem_sayilari: pd.DataFrame
+    yontem: str = "pearson"
+    gecikme: int = 0
+
+    @property
+    def bos(self) -> bool:
+        return self.katsayilar.empty
+
+    def uzun(self) -> pd.DataFrame:
+        """(hedef, faktör, r, n) satırları; mutlak katsayıya göre azalan."""
+        if self.bos:
+            return pd.DataFrame(columns=["hedef", "faktor", "r", "n"])
+        tablo = pd.DataFrame({
+            "hedef": np.repeat(self.katsayilar.index.to_numpy(), self.katsayilar.shape[1]),
+            "faktor": np.tile(self.katsayilar.columns.to_numpy(), self.katsayilar.shape[0]),
+            "r": self.katsayilar.to_numpy().ravel(),
+            "n": self.gozlem_sayilari.to_numpy().ravel(),
+        }).dropna(subset=["r"])
+        sira = tablo["r"].abs().sort_values(ascending=False, kind="stable").index
+        return tablo.loc[sira].reset_index(drop=True)
+
+
+# ──────────────────────────────────────────────
+# Matris çekirdeği
+# ──────────────────────────────────────────────
+def _merkezle(A: np.ndarray, maske: np.ndarray) -> np.ndarray:
+    """Dolu değerleri sütun ortalamasından çıkarır, eksikleri 0 yapar."""
+    dolu = np.where(maske, A, 0.0)
+    ortalama = dolu.sum(axis=0) / np.maximum(maske.sum(axis=0), 1)
+    return np.where(maske, dolu - ortalama, 0.0)
+
+
+def _maskeli_pearson(X: np.ndarray, Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    X (n × p) ve Y (n × q) sütunları arasındaki Pearson katsayıları; her
+    çift yalnızca ikisinin de dolu olduğu satırları kullanır. Toplamlar
+    maskeli matris çarpımlarıyla tek seferde hesaplanır. (r, n) döner.
+    """
+    mx, my = ~np.isnan(X), ~np.isnan(Y)
+    # Kaydırma katsayıyı değiştirmez; sütun ortalamasından merkezlemek
+    # N·Σxy − Σx·Σy farkındaki sayısal sadeleşmeyi azaltır.
+    X0, Y0 = _merkezle(X, mx), _merkezle(Y, my)
+    MX, MY = mx.astype(np.float64), my.astype(np.float64)
+
+    n = MX.T @ MY
+    sx, sy = X0.T @ MY, MX.T @ Y0
+    sxx, syy = (X0 * X0).T @ MY, MX.T @ (Y0 * Y0)
+    sxy = X0.T @ Y0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pay = n * sxy - sx * sy
+        vx, vy = n * sxx - sx * sx, n * syy - sy * sy
+        # Ortak satırlarda sabit sütunun varyansı yuvarlamadan ötürü sıfır
+        # yerine çok küçük çıkabilir; göreli eşiğin altı sabit sayılır.
+        sabit = (vx <= _SABIT_ESIGI * n * sxx) | (vy <= _SABIT_ESIGI * n * syy)
+        r = np.where(sabit, np.nan, pay / np.sqrt(vx * vy))
+    r = np.clip(r, -1.0, 1.0)
+    r[n < MIN_GOZLEM] = np.nan
+    return r, n.astype(np.int64)
+
+
+def _sira_donusumu(A: np.ndarray) -> np.ndarray:
+    """Sütun bazında ortalama sıra (eşitlikler için ortalama)."""
+    return pd.DataFrame(A).rank(method="average").to_numpy()
+
+
+def _maskeli_spearman(X: np.ndarray, Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Spearman katsayıları. Sıralar her çiftin ortak satırları üzerinden
+    alınmalıdır; bunun için sütunlar eksiklik desenine göre gruplanır
+    (ör. TYT/AYT dönüşümlü denemelerde birkaç desen) ve her desen çifti
+    için sıra dönüşümü + Pearson bir blok matris işlemiyle yapılır.
+    """
+    r = np.full((X.shape[1], Y.shape[1]), np.nan)
+    n = np.zeros((X.shape[1], Y.shape[1]), dtype=np.int64)
+    if not X.size or not Y.size:
+        return r, n
+    desen_x, grup_x = np.unique(~np.isnan(X).T, axis=0, return_inverse=True)
+    desen_y, grup_y = np.unique(~np.isnan(Y).T, axis=0, return_inverse=True)
+    grup_x, grup_y = np.ravel(grup_x), np.ravel(grup_y)
+    for a, dx in enumerate(desen_x):
+        sx = np.flatnonzero(grup_x == a)
+        for b, dy in enumerate(desen_y):
+            sy = np.flatnonzero(grup_y == b)
+            satir = dx & dy
+            if not satir.any():
+                continue
+            r_blok, n_blok = _maskeli_pearson(
+                _sira_donusumu(X[np.ix_(satir, sx)]), _sira_donusumu(Y[np.ix_(satir, sy)]),
+            )
+            r[np.ix_(sx, sy)] = r_blok
+            n[np.ix_(sx, sy)] = n_blok
+    return r, n
+
+
+def _korelasyon(X: np.ndarray, Y: np.ndarray, yontem: str) -> Tuple[np.ndarray, np.ndarray]:
+    if yontem not in YONTEMLER:
+        raise ValueError(f"Bilinmeyen korelasyon yöntemi: {yontem!r} (beklenen: {', '.join(YONTEMLER)})")
+    return _maskeli_pearson(X, Y) if yontem == "pearson" else _maskeli_spearman(X, Y)
+
+
+def _sonuc(r: np.ndarray, n: np.ndarray, hedefler: List[str], faktorler: Sequence[str],
+           yontem: str, gecikme: int) -> KorelasyonSonucu:
+    return KorelasyonSonucu(
+        katsayilar=pd.DataFrame(r, index=hedefler, columns=list(faktorler)),
+        gozlem_sayilari=pd.DataFrame(n, index=hedefler, columns=list(faktorler)),
+        yontem=yontem, gecikme=gecikme,
+    )
+
+
+def _bos_sonuc(faktorler: Sequence[str], yontem: str, gecikme: int) -> KorelasyonSonucu:
+    return _sonuc(np.empty((0, len(faktorler))), np.empty((0, len(faktorler)), dtype=np.int64),
+                  [], faktorler, yontem, gecikme)
+
+
+# ──────────────────────────────────────────────
+# Çerçeve ve öğrenci düzeyi
+# ──────────────────────────────────────────────
+def hedef_sutunlari(df: pd.DataFrame) -> List[str]:
+    """toplam_net ve ders netleri (net_*), çerçevedeki sırayla."""
+    return [s for s in df.columns if s == "toplam_net" or s.startswith("net_")]
+
+
+def korelasyon_matrisi(
+    df: pd.DataFrame,
+    faktorler: Sequence[str] = FAKTORLER,
+    hedefler: Optional[Sequence[str]] = None,
+    yontem: str = "pearson",
+    gecikme: int = 0,
+) -> KorelasyonSonucu:
+    """
+    Tarihe göre sıralı deneme çerçevesinde hedef × faktör korelasyonları.
+    gecikme = k > 0 ise t. satırdaki faktör, t + k. satırdaki hedefle
+    eşleştirilir (bu haftanın uykusu → sonraki denemenin neti).
+    """
+    if gecikme < 0:
+        raise ValueError("gecikme negatif olamaz")
+    faktorler = [f for f in faktorler if f in df.columns]
+    hedefler = hedef_sutunlari(df) if hedefler is None else [h for h in hedefler if h in df.columns]
+    if df.empty or not hedefler or not faktorler or len(df) <= gecikme:
+        return _bos_sonuc(faktorler, yontem, gecikme)
+
+    X = df[hedefler].to_numpy(dtype=np.float64)[gecikme:]
+    Y = df[faktorler].to_numpy(dtype=np.float64)[:len(df) - gecikme]
+    r, n = _korelasyon(X, Y, yontem)
+    return _sonuc(r, n, hedefler, faktorler, yontem, gecikme)
+
+
+def ogrenci_korelasyonlari(
+    ogrenci: Ogrenci,
+    yontem: str = "pearson",
+    gecikme: int = 0,
+    faktorler: Sequence[str] = FAKTORLER,
+) -> KorelasyonSonucu:
+    """Öğrencinin önbellekli deneme çerçevesi üzerinde korelasyon matrisi."""
+    return korelasyon_matrisi(deneme_cercevesi(ogrenci), faktorler, yontem=yontem, gecikme=gecikme)
+
+
+# ──────────────────────────────────────────────
+# Kohort düzeyi (havuzlanmış)
+# ──────────────────────────────────────────────
+def _grup_ici_merkezle(A: np.ndarray, grup: np.ndarray) -> np.ndarray:
+    """
+    Her sütunu grup (öğrenci) ortalamasından çıkarır. Grupta tek gözlemi
+    olan değerler merkezlenince 0 olur, bilgi taşımaz; NaN yapılır.
+    """
+    maske = ~np.isnan(A)
+    G = int(grup.max()) + 1
+    sonuc = np.full_like(A, np.nan)
+    for j in range(A.shape[1]):
+        sayi = np.bincount(grup, weights=maske[:, j], minlength=G)
+        toplam = np.bincount(grup, weights=np.where(maske[:, j], A[:, j], 0.0), minlength=G)
+        ortalama = toplam / np.maximum(sayi, 1)
+        gecerli = maske[:, j] & (sayi[grup] >= 2)
+        sonuc[gecerli, j] = A[gecerli, j] - ortalama[grup[gecerli]]
+    return sonuc
+
+
+def kohort_korelasyonlari(
+    ogrenciler: Sequence[Ogrenci],
+    yontem: str = "pearson",
+    gecikme: int = 0,
+    merkezle: bool = True,
+    faktorler: Sequence[str] = FAKTORLER,
+) -> KorelasyonSonucu:
+    """
+    Tüm öğrencilerin denemeleri tek tabloda havuzlanarak korelasyon.
+    Gecikme her öğrencinin kendi deneme dizisi içinde uygulanır. merkezle
+    açıkken her sütun öğrenci ortalamasından çıkarılır; böylece öğrenciler
+    arası düzey farkları (ör. yüksek netli öğrencinin daha çok çalışması)
+    yerine öğrenci içi ilişki ölçülür.
+    """
+    if gecikme < 0:
+        raise ValueError("gecikme negatif olamaz")
+    min_satir = 2 if merkezle else 1
+    cerceveler = [df for df in map(deneme_cercevesi, ogrenciler) if len(df) - gecikme >= min_satir]
+    if not cerceveler:
+        return _bos_sonuc(faktorler, yontem, gecikme)
+
+    dersler = {s for df in cerceveler for s in df.columns if s.startswith("net_")}
+    hedefler = ["toplam_net"] + sorted(dersler, key=tr_siralama_anahtari)
+    faktorler = [f for f in faktorler if f in cerceveler[0].columns]
+    konum = {s: j for j, s in enumerate(hedefler)}
+
+    # Öğrenci çerçeveleri ortak sütun düzenine yazılır; gecikme öğrenci içinde
+    uzunluklar = np.array([len(df) - gecikme for df in cerceveler])
+    sinirlar = np.concatenate([[0], np.cumsum(uzunluklar)])
+    X = np.full((sinirlar[-1], len(hedefler)), np.nan)
+    Y = np.empty((sinirlar[-1], len(faktorler)))
+    for df, bas, son in zip(cerceveler, sinirlar[:-1], sinirlar[1:]):
+        # Çerçeve başına tek dönüşüm; sütun başına Series erişimi yapılmaz
+        sutunlar = hedef_sutunlari(df)
+        A = df[sutunlar + faktorler].to_numpy(dtype=np.float64)
+        X[bas:son, [konum[s] for s in sutunlar]] = A[gecikme:, :len(sutunlar)]
+        Y[bas:son] = A[:len(df) - gecikme, len(sutunlar):]
+
+    if merkezle:
+        grup = np.repeat(np.arange(len(cerceveler)), uzunluklar)
+        X, Y = _grup_ici_merkezle(X, grup), _grup_ici_merkezle(Y, grup)
+    r, n = _korelasyon(X, Y, yontem)
+    return _sonuc(r, n, hedefler, faktorler, yontem, gecikme)
@@ -0,0 +1,645 @@
+"""
+OmniPDR – core/kural_motoru.py
+====================================
+Bildirimsel (veriyle tanımlı) burnout ve uyarı kuralları.
+
+Kurallar kodda if zinciri olarak değil, bir sözlükte tanımlanır ve
+öğrenci × özellik dizileri üzerinde çalışan vektörel yüklemlere derlenir.
+Aynı derlenmiş kurallar tek öğrenci için (AnalizMotoru.burnout_analizi)
+ve kurum geneli tek geçişte (kohort_analizi.kohort_risk_tablosu) çalışır.
+
+Tanım üç bölümden oluşur:
+
+  esikler   {"yuksek_stres": 7, ...}            → ifadelerde "$yuksek_stres"
+  olgular   {"net_dusmus": [...], ...}          → adlandırılmış, paylaşılan koşullar
+  kurallar  [{"ad", "grup", "kosul", ...}, ...] → sıra önemlidir
+
+İfadeler JSON listeleridir:
+  ["son_stres", ">=", "$yuksek_stres"]            karşılaştırma (<, <=, >, >=, ==, !=)
+  ["ort_calisma_eski", "*", "$calisma_artis"]     aritmetik (+, -, *, /)
+  ["hepsi", a, b, ...] / ["herhangi", ...] / ["degil", a]
+Dizgeler özellik adı (OZELLIKLER), olgu adı ya da "$" önekli eşik olabilir.
+Katı karşılaştırmalar (<, >) KARSILASTIRMA_TOLERANSI kadar paylıdır; eksik
+özellik (NaN) içeren karşılaştırmalar yanlıştır.
+
+Gruplar:
+  burnout  Sırayla denenir, ilk eşleşen kural öğrencinin burnout tipini ve
+           uyarı seviyesini belirler (tip: BurnoutTipi adı).
+  uyari    Eşleşen her kural ayrı bir uyarı üretir (erken uyarı deposuna yazılır).
+
+Varsayılanlar VARSAYILAN_KURALLAR'dadır. data/kurallar.json (ya da
+OMNIPDR_KURALLAR ortam değişkenindeki yol) varsa üzerine birleştirilir:
+eşik ve olgular güncellenir; kurallar "ad" ile eşleşip alan alan güncellenir,
+"devre_disi": true kuralı kaldırır, yeni adlar eklenir, "sira" sıralamayı belirler.
+Dosya değişince (mtime) yeniden yüklenir. Derlenemeyen dosya analizleri
+durdurmaz: varsayılan kurallar kullanılır, hata kural_yukleme_hatasi() ile
+arayüzde gösterilir; --dogrula aynı hatayla çıkış kodu 1 döndürür.
+
+Kullanım:
+    kume = kural_kumesi()
+    kodlar = kume.burnout_kodlari(ozellik_tablosu(ogrenciler))
+    python -m core.kural_motoru --disa-aktar data/kurallar.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.analiz_motoru import AnalizMotoru, BurnoutTipi, UyariSeviyesi
+from models.deneme_akisi import VARSAYILAN_EWMA_ALFA, VARSAYILAN_SON_K
+from models.ogrenci_sinifi import Ogrenci
+
+_log = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────
+# Sabitler
+# ──────────────────────────────────────────────
+KURAL_YOLU_ORTAM = "OMNIPDR_KURALLAR"
+_VERI_DIZINI = Path(__file__).parent.parent / "data"
+_VARSAYILAN_KURAL_YOLU = _VERI_DIZINI / "kurallar.json"
+
+GRUPLAR = ("burnout", "uyari")
+
+# Kuralların görebildiği öğrenci özellikleri (bkz. ozellik_tablosu)
+OZELLIKLER = (
+    "deneme_sayisi",
+    "ort_net_eski", "ort_net_yeni",             # Denemelerin ilk / ikinci yarısı
+    "ort_calisma_eski", "ort_calisma_yeni",
+    "son_stres", "son_uyku", "ort_stres", "ort_uyku",
+    "son_net", "onceki_net", "net_ewma",
+    "zpd_baz",                                  # Son 3 denemenin ortalaması
+    "hedef_net",
+)
+
+_KARSILASTIRMALAR = {
+    "<": lambda a, b: a < b - AnalizMotoru.KARSILASTIRMA_TOLERANSI,
+    "<=": np.less_equal,
+    ">": lambda a, b: a > b + AnalizMotoru.KARSILASTIRMA_TOLERANSI,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+_ARITMETIK = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}
+
+VARSAYILAN_KURALLAR: dict = {
+    "esikler": {
+        "yuksek_stres": AnalizMotoru.YUKSEK_STRES_ESIGI,
+        "dusuk_uyku": AnalizMotoru.DUSUK_UYKU_ESIGI,
+        "calisma_artis": AnalizMotoru.CALISMA_ARTIS_ESIGI,
+    },
+    "olgular": {
+        "net_dusmus": ["ort_net_yeni", "<", "ort_net_eski"],
+        "calisma_artmis": ["ort_calisma_yeni", ">", ["ort_calisma_eski", "*", "$calisma_artis"]],
+        "calisma_dusmus": ["ort_calisma_yeni", "<", ["ort_calisma_eski", "/", "$calisma_artis"]],
+        "yuksek_stres": ["son_stres", ">=", "$yuksek_stres"],
+        "dusuk_uyku": ["son_uyku", "<", "$dusuk_uyku"],
+    },
+    "kurallar": [
+        {
+            "ad": "akademik_tukenme",
+            "grup": "burnout",
+            "sira": 10,
+            "tip": "AKADEMIK_TUKENME",
+            "seviye": "KRITIK",
+            "kosul": ["hepsi", "calisma_artmis", "net_dusmus", "yuksek_stres"],
+            "mesaj": "🚨 KRİTİK UYARI: Akademik Tükenmişlik Riski!",
+            "detay": (
+                "Çalışma saati artmasına rağmen ({ort_calisma_eski:.1f}h → {ort_calisma_yeni:.1f}h) "
+                "netler düşüyor ({ort_net_eski:.1f} → {ort_net_yeni:.1f}). "
+                "Stres puanı: {son_stres:.0f}/10. Bu klasik tükenmişlik göstergesidir."
+            ),
+            "oneriler": [
+                "📅 Bu hafta çalışma süresini %25-30 azaltın.",
+                "🎯 'Derin çalışma' tekniğine geçin: 90 dk odaklanma + 20 dk tam dinlenme.",
+                "🏃 Günde en az 30 dk hafif egzersiz ekleyin (yürüyüş yeterli).",
+                "📵 Sosyal medyayı çalışma saatleri dışında tamamen kesin.",
+                "🛌 Uyku düzenini sabitleyin (aynı saat kalkış-yatış).",
+                "📞 Bu haftayı 'toparlanma haftası' olarak ilan edin; danışmanınızla görüşün.",
+            ],
+        },
+        {
+            "ad": "kaygi_kacinma",
+            "grup": "burnout",
+            "sira": 20,
+            "tip": "KAYGI_KACINMA",
+            "seviye": "UYARI",
+            "kosul": ["hepsi", "calisma_dusmus", "net_dusmus", "yuksek_stres"],
+            "mesaj": "⚠️ UYARI: Kaygı Kaynaklı Kaçınma Davranışı!",
+            "detay": (
+                "Hem çalışma saati ({ort_calisma_eski:.1f}h → {ort_calisma_yeni:.1f}h) "
+                "hem de netler ({ort_net_eski:.1f} → {ort_net_yeni:.1f}) düşüyor. "
+                "Yüksek stres ({son_stres:.0f}/10) ile birleştiğinde, kaçınma davranışı olasıdır."
+            ),
+            "oneriler": [
+                "🧘 Günde 10 dk mindfulness/nefes egzersizi yapın.",
+                "✍️ 'Endişe defteri' tutun: Sınav kaygılarını kâğıda dökün, zihninizi boşaltın.",
+                "🎯 Çalışma hedeflerini küçültün: 'Bugün şu konuyu bitireceğim' değil, "
+                "'Bugün şu konudan 10 soru çözeceğim.'",
+                "👨‍👩‍👧 Güvendiğiniz biriyle (aile, arkadaş) duygularınızı paylaşın.",
+                "📊 Geçmiş başarılarınızı listeleyin; kaygı gerçekçi değil.",
+            ],
+        },
+        {
+            "ad": "uyku_bozuklugu",
+            "grup": "burnout",
+            "sira": 30,
+            "tip": "UYKU_BOZUKLUGU",
+            "seviye": "UYARI",
+            "kosul": ["hepsi", "dusuk_uyku", "net_dusmus"],
+            "mesaj": "😴 UYARI: Yetersiz Uyku Performansı Olumsuz Etkiliyor!",
+            "detay": (
+                "Ortalama {son_uyku:.1f} saat uyku, bilişsel performans için yetersiz. "
+                "Araştırmalar, 7 saatin altındaki uykunun hafıza konsolidasyonunu "
+                "önemli ölçüde bozduğunu göstermektedir."
+            ),
+            "oneriler": [
+                "🛌 Hedef: Gece 7-8 saat kesintisiz uyku.",
+                "📵 Yatmadan 1 saat önce ekranları kapatın (mavi ışık melatonini engeller).",
+                "☕ Öğleden sonra 14:00'ten sonra kafein almayın.",
+                "🌡️ Oda sıcaklığını 18-20°C'ye ayarlayın.",
+                "⏰ Hafta sonu bile aynı saatte kalkın (ritim bozulmaz).",
+            ],
+        },
+        {
+            "ad": "motivasyon_kaybi",
+            "grup": "burnout",
+            "sira": 40,
+            "tip": "MOTIVASYON_KAYBI",
+            "seviye": "DIKKAT",
+            "kosul": ["hepsi", "net_dusmus", ["degil", "yuksek_stres"], "calisma_dusmus"],
+            "mesaj": "💡 DİKKAT: Motivasyon Düşüşü Belirtileri",
+            "detay": (
+                "Çalışma süresi ve netler düşüyor, ancak stres düşük. "
+                "Bu genellikle motivasyon kaybına işaret eder."
+            ),
+            "oneriler": [
+                "Kısa vadeli, somut hedefler belirleyin (haftalık mini hedefler).",
+                "Çalışma ortamını değiştirin (kütüphane, kafe).",
+                "Hedef bölümünüzle ilgili motivasyon kaynaklarına bakın.",
+                "Grup çalışması veya çalışma arkadaşı edinin.",
+            ],
+        },
+    ],
+}
+
+
+class KuralHatasi(ValueError):
+    """Kural tanımı geçersiz (bilinmeyen ad, hatalı ifade, eksik alan)."""
+
+
+# ──────────────────────────────────────────────
+# Özellik tablosu
+# ──────────────────────────────────────────────
+def _nan(x: Optional[float]) -> float:
+    return np.nan if x is None else x
+
+
+def _ogrenci_ozellikleri(ogrenci: Ogrenci) -> Tuple[float, ...]:
+    """OZELLIKLER sırasında değerler, öğrencinin akış istatistiklerinden O(1); eksikler NaN."""
+    hedef = ogrenci.hedef_net if ogrenci.hedef_net else np.nan
+    akis = ogrenci.deneme_akisi
+    n = akis.n
+    if n == 0:
+        return (0,) + (np.nan,) * (len(OZELLIKLER) - 2) + (hedef,)
+    yarim = max(1, n // 2)
+    net, calisma = akis.alan("toplam_net"), akis.alan("calisma_saati")
+    stres, uyku = akis.alan("stres_puani"), akis.alan("uyku_saati")
+    son_netler = net.son_degerler
+    return (
+        n,
+        _nan(net.pencere_ortalamasi(0, yarim)), _nan(net.pencere_ortalamasi(yarim, n)),
+        _nan(calisma.pencere_ortalamasi(0, yarim)), _nan(calisma.pencere_ortalamasi(yarim, n)),
+        stres.son_degerler[-1], uyku.son_degerler[-1], stres.ortalama, uyku.ortalama,
+        son_netler[-1], son_netler[-2] if len(son_netler) >= 2 else np.nan, net.ewma,
+        net.son_ortalama,
+        hedef,
+    )
+
+
+def ogrenci_ozellik_tablosu(ogrenci: Ogrenci) -> Dict[str, np.ndarray]:
+    """Tek öğrencinin özellik tablosu (tek elemanlı diziler), akış istatistiklerinden O(1)."""
+    return {ad: np.array([deger], dtype=np.float64) for ad, deger in zip(OZELLIKLER, _ogrenci_ozellikleri(ogrenci))}
+
+
+def _grup_ortalamasi(ogr: np.ndarray, deger: np.ndarray, maske: np.ndarray, boyut: int) -> np.ndarray:
+    """Maskedeki satırların öğrenci başına ortalaması; satırı olmayan öğrencide NaN."""
+    toplam = np.bincount(ogr[maske], weights=deger[maske], minlength=boyut)
+    sayi = np.bincount(ogr[maske], minlength=boyut)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(sayi > 0, toplam / sayi, np.nan)
+
+
+def _sondan(deger: np.ndarray, son: np.ndarray, kayma: int, maske: np.ndarray) -> np.ndarray:
+    """Her öğrencinin sondan kayma'ncı satırındaki değer; maske dışında NaN."""
+    sonuc = np.full(len(son), np.nan)
+    sonuc[maske] = deger[son[maske] - kayma]
+    return sonuc
+
+
+def ozellik_tablosu(ogrenciler: Sequence[Ogrenci]) -> Dict[str, np.ndarray]:
+    """
+    Özellik adı → öğrenci sırasında float dizisi (kuralların girdisi).
+    Trende giren tüm denemeler tek uzun tabloda toplanır, özellikler grup
+    işlemleriyle (bincount) vektörel hesaplanır; değerler akış
+    istatistikleriyle (ogrenci_ozellik_tablosu) aynıdır.
+    """
+    from core.kohort_analizi import deneme_tablosu  # döngüsel içe aktarmayı önler
+
+    S = len(ogrenciler)
+    df = deneme_tablosu(ogrenciler)
+    ogr, sira = df["ogr"].to_numpy(), df["sira"].to_numpy()
+    net, calisma = df["toplam_net"].to_numpy(), df["calisma_saati"].to_numpy()
+    stres, uyku = df["stres_puani"].to_numpy(), df["uyku_saati"].to_numpy()
+
+    sayi = np.bincount(ogr, minlength=S)
+    n_satir = sayi[ogr]
+    eski = sira < np.maximum(1, n_satir // 2)
+    hepsi = np.ones(len(df), dtype=bool)
+    son = np.cumsum(sayi) - 1           # Öğrencinin son satırı (uzun tabloda)
+    var, iki = sayi >= 1, sayi >= 2
+
+    # EWMA açılımı: x_0'ın ağırlığı (1−α)^(n−1), x_i'nin α(1−α)^(n−1−i)
+    alfa = VARSAYILAN_EWMA_ALFA
+    agirlik = np.where(sira == 0, 1.0, alfa) * (1 - alfa) ** (n_satir - 1 - sira)
+    ewma = np.where(var, np.bincount(ogr, weights=agirlik * net, minlength=S), np.nan)
+
+    return {
+        "deneme_sayisi": sayi.astype(np.float64),
+        "ort_net_eski": _grup_ortalamasi(ogr, net, eski, S),
+        "ort_net_yeni": _grup_ortalamasi(ogr, net, ~eski, S),
+        "ort_calisma_eski": _grup_ortalamasi(ogr, calisma, eski, S),
+        "ort_calisma_yeni": _grup_ortalamasi(ogr, calisma, ~eski, S),
+        "son_stres": _sondan(stres, son, 0, var),
+        "son_uyku": _sondan(uyku, son, 0, var),
+        "ort_stres": _grup_ortalamasi(ogr, stres, hepsi, S),
+        "ort_uyku": _grup_ortalamasi(ogr, uyku, hepsi, S),
+        "son_net": _sondan(net, son, 0, var),
+        "onceki_net": _sondan(net, son, 1, iki),
+        "net_ewma": ewma,
+        "zpd_baz": _grup_ortalamasi(ogr, net, sira >= n_satir - VARSAYILAN_SON_K, S),
+        "hedef_net": np.array([o.hedef_net if o.hedef_net else np.nan for o in ogrenciler], dtype=np.float64),
+    }
+
+
+# ──────────────────────────────────────────────
+# İfade derleyici
+# ──────────────────────────────────────────────
+# Derlenmiş ifade: (özellikler, olgu belleği) → dizi ya da skaler
+_Yuklem = Callable[[Dict[str, np.ndarray], Dict[str, np.ndarray]], np.ndarray]
+
+
+class _Derleyici:
+    """Bir tanımdaki ifadeleri yüklemlere çevirir; olgular bir kez derlenir, değerlendirmede bir kez hesaplanır."""
+
+    def __init__(self, esikler: Dict[str, float], olgular: Dict[str, object]):
+        self.esikler = esikler
+        self.olgular = olgular
+        self._derlenmis: Dict[str, _Yuklem] = {}
+        self._yigin: List[str] = []
+
+    def olgu(self, ad: str) -> _Yuklem:
+        if ad in self._derlenmis:
+            return self._derlenmis[ad]
+        if ad in self._yigin:
+            raise KuralHatasi(f"Döngüsel olgu tanımı: {' → '.join(self._yigin + [ad])}")
+        self._yigin.append(ad)
+        ic = self.derle(self.olgular[ad])
+        self._yigin.pop()
+
+        def yuklem(oz, bellek):
+            if ad not in bellek:
+                bellek[ad] = ic(oz, bellek)
+            return bellek[ad]
+
+        self._derlenmis[ad] = yuklem
+        return yuklem
+
+    def derle(self, ifade) -> _Yuklem:
+        if isinstance(ifade, bool) or ifade is None:
+            raise KuralHatasi(f"Geçersiz ifade: {ifade!r}")
+        if isinstance(ifade, (int, float)):
+            sabit = float(ifade)
+            return lambda oz, bellek: sabit
+        if isinstance(ifade, str):
+            return self._ad(ifade)
+        if isinstance(ifade, list) and ifade:
+            bas = ifade[0]
+            if bas in ("hepsi", "herhangi") and len(ifade) >= 2:
+                parcalar = [self.derle(p) for p in ifade[1:]]
+                birlestir = np.logical_and if bas == "hepsi" else np.logical_or
+
+                def mantiksal(oz, bellek):
+                    sonuc = parcalar[0](oz, bellek)
+                    for p in parcalar[1:]:
+                        sonuc = birlestir(sonuc, p(oz, bellek))
+                    return sonuc
+
+                return mantiksal
+            if bas == "degil" and len(ifade) == 2:
+                ic = self.derle(ifade[1])
+                return lambda oz, bellek: np.logical_not(ic(oz, bellek))
+            if len(ifade) == 3 and isinstance(ifade[1], str):
+                islem = _KARSILASTIRMALAR.get(ifade[1]) or _ARITMETIK.get(ifade[1])
+                if islem is not None:
+                    sol, sag = self.derle(ifade[0]), self.derle(ifade[2])
+                    return lambda oz, bellek: islem(sol(oz, bellek), sag(oz, bellek))
+        raise KuralHatasi(f"Geçersiz ifade: {ifade!r}")
+
+    def _ad(self, ad: str) -> _Yuklem:
+        if ad.startswith("$"):
+            if ad[1:] not in self.esikler:
+                raise KuralHatasi(f"Bilinmeyen eşik: {ad}")
+            sabit = float(self.esikler[ad[1:]])
+            return lambda oz, bellek: sabit
+        if ad in OZELLIKLER:
+            return lambda oz, bellek: oz[ad]
+        if ad in self.olgular:
+            return self.olgu(ad)
+        raise KuralHatasi(f"Bilinmeyen özellik/olgu: {ad!r}")
+
+
+# ──────────────────────────────────────────────
+# Kural ve kural kümesi
+# ──────────────────────────────────────────────
+@dataclass
+class Kural:
+    """Derlenmiş tek kural."""
+    ad: str
+    grup: str
+    seviye: UyariSeviyesi
+    mesaj: str
+    detay: str = ""
+    oneriler: List[str] = field(default_factory=list)
+    tip: BurnoutTipi = BurnoutTipi.YOK
+    yuklem: Optional[_Yuklem] = field(default=None, repr=False)
+
+    def detay_yaz(self, degerler: Dict[str, float]) -> str:
+        """Detay şablonunu öğrencinin özellik değerleriyle doldurur."""
+        return self.detay.format(**degerler)
+
+
+@dataclass
+class KuralSonucu:
+    """Bir öğrenci için eşleşen kuralın doldurulmuş çıktısı."""
+    ad: str
+    seviye: UyariSeviyesi
+    mesaj: str
+    detay: str
+    oneriler: List[str] = field(default_factory=list)
+    tip: BurnoutTipi = BurnoutTipi.YOK
+
+
+@dataclass
+class KuralKumesi:
+    """Derlenmiş kurallar; değerlendirme öğrenci × özellik dizileri üzerinde vektöreldir."""
+    esikler: Dict[str, float]
+    burnout_kurallari: List[Kural]
+    uyari_kurallari: List[Kural]
+    tanim: dict = field(repr=False, default_factory=dict)
+    surum: str = ""
+
+    def _degerlendir(self, kurallar: List[Kural], oz: Dict[str, np.ndarray]) -> np.ndarray:
+        """(öğrenci, kural) boyutlu eşleşme matrisi; olgular tek seferde hesaplanır."""
+        S = len(oz["deneme_sayisi"])
+        bellek: Dict[str, np.ndarray] = {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sutunlar = [np.broadcast_to(k.yuklem(oz, bellek), (S,)) for k in kurallar]
+        return np.column_stack(sutunlar).astype(bool) if sutunlar else np.zeros((S, 0), dtype=bool)
+
+    def burnout_kodlari(self, oz: Dict[str, np.ndarray]) -> np.ndarray:
+        """Öğrenci başına ilk eşleşen burnout kuralının burnout_kurallari dizini; yoksa -1."""
+        eslesme = self._degerlendir(self.burnout_kurallari, oz)
+        return np.where(eslesme.any(axis=1), eslesme.argmax(axis=1), -1)
+
+    def uyari_matrisi(self, oz: Dict[str, np.ndarray]) -> np.ndarray:
+        """(öğrenci, uyari_kurallari) boyutlu eşleşme matrisi."""
+        return self._degerlendir(self.uyari_kurallari, oz)
+
+
+# ──────────────────────────────────────────────
+# Tanımı derleme ve yükleme
+# ──────────────────────────────────────────────
+def _kurali_derle(tanim: dict, derleyici: _Derleyici) -> Kural:
+    ad = tanim.get("ad")
+    if not ad:
+        raise KuralHatasi(f"Kuralın adı yok: {tanim!r}")
+    try:
+        grup = tanim.get("grup", "burnout")
+        if grup not in GRUPLAR:
+            raise KuralHatasi(f"bilinmeyen grup {grup!r} (beklenen: {', '.join(GRUPLAR)})")
+        try:
+            seviye = UyariSeviyesi[tanim.get("seviye", "DIKKAT")]
+            tip = BurnoutTipi[tanim["tip"]] if grup == "burnout" else BurnoutTipi.YOK
+        except KeyError as e:
+            raise KuralHatasi(f"bilinmeyen tip/seviye {e}") from None
+        if "kosul" not in tanim:
+            raise KuralHatasi("'kosul' alanı eksik")
+        kural = Kural(
+            ad=ad, grup=grup, seviye=seviye, tip=tip,
+            mesaj=tanim.get("mesaj", ad), detay=tanim.get("detay", ""),
+            oneriler=list(tanim.get("oneriler", [])),
+            yuklem=derleyici.derle(tanim["kosul"]),
+        )
+        # Şablondaki adlar yükleme anında denetlenir, gösterim anında değil
+        kural.detay_yaz(dict.fromkeys(OZELLIKLER, 0.0))
+    except KuralHatasi as e:
+        raise KuralHatasi(f"'{ad}' kuralı: {e}") from None
+    except (KeyError, ValueError, IndexError) as e:
+        raise KuralHatasi(f"'{ad}' kuralının detay şablonu geçersiz: {e!r}") from None
+    return kural
+
+
+def kural_kumesi_derle(tanim: dict) -> KuralKumesi:
+    """Tanım sözlüğünü derler; hatalı tanımda KuralHatasi."""
+    esikler = dict(tanim.get("esikler", {}))
+    for ad, deger in esikler.items():
+        if isinstance(deger, bool) or not isinstance(deger, (int, float)):
+            raise KuralHatasi(f"'{ad}' eşiği sayı değil: {deger!r}")
+    derleyici = _Derleyici(esikler, dict(tanim.get("olgular", {})))
+    for ad in derleyici.olgular:
+        derleyici.olgu(ad)
+    kurallar = sorted(
+        (k for k in tanim.get("kurallar", []) if not k.get("devre_disi")),
+        key=lambda k: k.get("sira", float("inf")),
+    )
+    derlenmis = [_kurali_derle(k, derleyici) for k in kurallar]
+    adlar = [k.ad for k in derlenmis]
+    if len(set(adlar)) != len(adlar):
+        raise KuralHatasi("Kural adları benzersiz olmalıdır.")
+    kume = KuralKumesi(
+        esikler=esikler,
+        burnout_kurallari=[k for k in derlenmis if k.grup == "burnout"],
+        uyari_kurallari=[k for k in derlenmis if k.grup == "uyari"],
+        tanim=tanim,
+        surum=hashlib.sha1(json.dumps(tanim, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:12],
+    )
+    # Değerlendirme hataları da yükleme anında çıksın (tek satırlık örnek tablo)
+    ornek = {ad: np.zeros(1) for ad in OZELLIKLER}
+    try:
+        kume.burnout_kodlari(ornek)
+        kume.uyari_matrisi(ornek)
+    except (TypeError, ValueError) as e:
+        raise KuralHatasi(f"Kurallar değerlendirilemiyor: {e}") from None
+    return kume
+
+
+def kurallari_birlestir(temel: dict, ek: dict) -> dict:
+    """
+    ek tanımını temel üzerine uygular: eşik ve olgular güncellenir,
+    kurallar ada göre alan alan güncellenir ya da eklenir.
+    """
+    sonuc = copy.deepcopy(temel)
+    sonuc.setdefault("esikler", {}).update(ek.get("esikler", {}))
+    sonuc.setdefault("olgular", {}).update(ek.get("olgular", {}))
+    kurallar = sonuc.setdefault("kurallar", [])
+    konum = {k["ad"]: i for i, k in enumerate(kurallar)}
+    for k in ek.get("kurallar", []):
+        if k.get("ad") in konum:
+            kurallar[konum[k["ad"]]].update(k)
+        else:
+            kurallar.append(dict(k))
+    return sonuc
+
+
+_KUME: Optional[KuralKumesi] = None
+_KUME_KAYNAGI: Optional[Tuple[Optional[Path], Optional[int]]] = None   # (yol, mtime_ns)
+_YUKLEME_HATASI: Optional[str] = None
+_KUME_KILIDI = threading.Lock()
+
+
+def etkin_kural_yolu() -> Optional[Path]:
+    """OMNIPDR_KURALLAR, o yoksa (varsa) data/kurallar.json; ikisi de yoksa None."""
+    ortam = os.environ.get(KURAL_YOLU_ORTAM)
+    if ortam:
+        return Path(ortam)
+    return _VARSAYILAN_KURAL_YOLU if _VARSAYILAN_KURAL_YOLU.exists() else None
+
+
+def kurallari_yukle(yol: Optional[Path] = None) -> KuralKumesi:
+    """
+    Varsayılan kuralları, yol (verilmezse etkin_kural_yolu()) varsa onunla
+    birleştirip derler. Katıdır: hatalı dosyada KuralHatasi fırlatır; etkin
+    kümeyi değiştirmez (bkz. kural_kumesi).
+    """
+    if yol is None:
+        yol = etkin_kural_yolu()
+
+    tanim = VARSAYILAN_KURALLAR
+    if yol is not None:
+        try:
+            with open(yol, encoding="utf-8") as f:
+                ek = json.load(f)
+        except FileNotFoundError:
+            raise KuralHatasi(f"Kural dosyası bulunamadı: {yol}") from None
+        except json.JSONDecodeError as e:
+            raise KuralHatasi(f"{Path(yol).name}: {e}") from None
+        if not isinstance(ek, dict):
+            raise KuralHatasi(f"{Path(yol).name}: kök öğe bir nesne olmalıdır")
+        try:
+            return kural_kumesi_derle(kurallari_birlestir(VARSAYILAN_KURALLAR, ek))
+        except KuralHatasi as e:
+            raise KuralHatasi(f"{Path(yol).name}: {e}") from None
+        except (AttributeError, TypeError, KeyError, ValueError) as e:
+            raise KuralHatasi(f"{Path(yol).name}: tanım yapısı geçersiz ({e!r})") from None
+    return kural_kumesi_derle(tanim)
+
+
+@lru_cache(maxsize=1)
+def _varsayilan_kume() -> KuralKumesi:
+    return kural_kumesi_derle(VARSAYILAN_KURALLAR)
+
+
+def _kaynak_imzasi(yol: Optional[Path]) -> Tuple[Optional[Path], Optional[int]]:
+    if yol is None:
+        return None, None
+    try:
+        return yol, yol.stat().st_mtime_ns
+    except OSError:
+        return yol, None
+
+
+def kural_kumesi() -> KuralKumesi:
+    """
+    Etkin kural kümesi. Kural dosyası değiştikçe (yol ya da mtime) yeniden
+    yüklenir; hatalı dosyada analizler durmasın diye varsayılan kurallara
+    dönülür ve hata kural_yukleme_hatasi() ile okunur.
+    """
+    global _KUME, _KUME_KAYNAGI, _YUKLEME_HATASI
+    imza = _kaynak_imzasi(etkin_kural_yolu())
+    if _KUME is not None and imza == _KUME_KAYNAGI:
+        return _KUME
+    with _KUME_KILIDI:
+        if _KUME is None or imza != _KUME_KAYNAGI:
+            try:
+                _KUME, _YUKLEME_HATASI = kurallari_yukle(imza[0]), None
+            except KuralHatasi as e:
+                _log.error("Kural dosyası yüklenemedi, varsayılan kurallar kullanılıyor: %s", e)
+                _KUME, _YUKLEME_HATASI = _varsayilan_kume(), str(e)
+            _KUME_KAYNAGI = imza
+        return _KUME
+
+
+def kural_yukleme_hatasi() -> Optional[str]:
+    """Etkin kural dosyası derlenemediyse hata mesajı (varsayılanlar kullanılıyordur); yoksa None."""
+    kural_kumesi()
+    return _YUKLEME_HATASI
+
+
+# ──────────────────────────────────────────────
+# Tek öğrenci
+# ──────────────────────────────────────────────
+def _sonuc(kural: Kural, degerler: Dict[str, float]) -> KuralSonucu:
+    return KuralSonucu(
+        kural.ad, kural.seviye, kural.mesaj, kural.detay_yaz(degerler), list(kural.oneriler), kural.tip,
+    )
+
+
+def ogrenci_kurallari(ogrenci: Ogrenci) -> Tuple[Optional[KuralSonucu], List[KuralSonucu]]:
+    """Öğrenci için (eşleşen burnout kuralı ya da None, eşleşen uyarı kuralları)."""
+    kume = kural_kumesi()
+    oz = ogrenci_ozellik_tablosu(ogrenci)
+    degerler = {ad: float(d[0]) for ad, d in oz.items()}
+    kod = int(kume.burnout_kodlari(oz)[0])
+    burnout = _sonuc(kume.burnout_kurallari[kod], degerler) if kod >= 0 else None
+    eslesen = kume.uyari_matrisi(oz)[0]
+    return burnout, [_sonuc(k, degerler) for k, e in zip(kume.uyari_kurallari, eslesen) if e]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Kural dosyasını doğrular ya da varsayılanları düzenlenebilir dosyaya yazar."""
+    ayr = argparse.ArgumentParser(description="OmniPDR kural motoru")
+    ayr.add_argument("--dogrula", type=Path, default=None, help="Kural dosyasını derleyip özetle")
+    ayr.add_argument("--disa-aktar", type=Path, default=None, help="Varsayılan kuralları JSON'a yaz")
+    args = ayr.parse_args(argv)
+
+    if args.disa_aktar is not None:
+        args.disa_aktar.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.disa_aktar, "w", encoding="utf-8") as f:
+            json.dump(VARSAYILAN_KURALLAR, f, ensure_ascii=False, indent=2)
+        print(f"Varsayılan kurallar → {args.disa_aktar}")
+    try:
+        kume = kurallari_yukle(args.dogrula)
+    except KuralHatasi as e:
+        print(f"Kural dosyası geçersiz: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Kural kümesi {kume.surum}: {len(kume.burnout_kurallari)} burnout, "
+          f"{len(kume.uyari_kurallari)} uyarı kuralı")
+    for k in kume.burnout_kurallari + kume.uyari_kurallari:
+        print(f"  [{k.grup}/{k.seviye.name}] {k.ad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+OmniPDR – core/lise_verileri.py
+===================================
+LGS lise kataloğu ve lise tercih önerileri.
+
+Gömülü liste, büyük şehirlerdeki bilinen liselerin 2024 LGS taban puanı,
+yüzdelik dilimi ve kontenjanlarından oluşur. Tam katalog
+data/lgs_lise_katalog.csv|json dosyasından veya OMNIPDR_LISE_KATALOG ile
+verilen yoldan, YÖK Atlas kataloğuyla aynı şemalı yükleyiciyle
+(bkz. core/katalog_yukleyici.py) yüklenir.
+
+LGS yerleştirmesi yüzdelik dilime göre yapıldığından öneriler yüzdelik
+indeksinden, puan bazlı sorgular taban puan indeksinden bisect ile
+yanıtlanır.
+
+Not: Veriler yaklaşık değerlerdir ve bilgi amaçlıdır.
+Resmi güncel veriler için: https://www.meb.gov.tr
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.katalog_yukleyici import Alan, Sema, tablo_yukle
+from core.sirali_indeks import SiraliIndeks, filtre_gruplari, sehir_eslesmeleri
+from core.turkce import tr_siralama_anahtari
+
+
+@dataclass
+class LiseBilgisi:
+    """LGS ile öğrenci alan bir liseyi temsil eder."""
+    okul: str
+    ilce: str
+    sehir: str
+    tur: str                # Fen Lisesi, Anadolu Lisesi, ...
+    taban_puan: float       # 2024 LGS taban puanı (0-500)
+    yuzdelik: float         # 2024 taban yüzdelik dilimi (küçük = daha başarılı)
+    kontenjan: int
+    yil: int = 2024
+    okul_kodu: str = ""     # MEB kurum kodu (veri dosyasından yüklenince dolu)
+
+
+LISE_TURLERI = frozenset({
+    "Fen Lisesi",
+    "Sosyal Bilimler Lisesi",
+    "Anadolu Lisesi",
+    "Anadolu İmam Hatip Lisesi",
+    "Mesleki ve Teknik Anadolu Lisesi",
+})
+
+
+# ──────────────────────────────────────────────
+# LGS 2024 Taban Puanları (Yaklaşık Değerler)
+# ──────────────────────────────────────────────
+LISE_VERILERI: List[LiseBilgisi] = [
+    # ── İSTANBUL ──────────────────────────────
+    LiseBilgisi("Galatasaray Lisesi", "Beyoğlu", "İstanbul", "Anadolu Lisesi", 497.9, 0.02, 100),
+    LiseBilgisi("İstanbul Erkek Lisesi", "Fatih", "İstanbul", "Anadolu Lisesi", 494.6, 0.06, 150),
+    LiseBilgisi("İstanbul Atatürk Fen Lisesi", "Kadıköy", "İstanbul", "Fen Lisesi", 493.8, 0.08, 150),
+    LiseBilgisi("Kabataş Erkek Lisesi", "Beşiktaş", "İstanbul", "Anadolu Lisesi", 491.2, 0.14, 150),
+    LiseBilgisi("Cağaloğlu Anadolu Lisesi", "Fatih", "İstanbul", "Anadolu Lisesi", 489.7, 0.19, 120),
+    LiseBilgisi("Kadıköy Anadolu Lisesi", "Kadıköy", "İstanbul", "Anadolu Lisesi", 486.3, 0.31, 150),
+    LiseBilgisi("Kartal Anadolu İmam Hatip Lisesi", "Kartal", "İstanbul", "Anadolu İmam Hatip Lisesi", 482.1, 0.52, 150),
+    LiseBilgisi("Vefa Lisesi", "Fatih", "İstanbul", "Anadolu Lisesi", 478.5, 0.85, 180),
+    LiseBilgisi("Haydarpaşa Lisesi", "Kadıköy", "İstanbul", "Anadolu Lisesi", 472.9, 1.32, 180),
+    LiseBilgisi("İstanbul Sosyal Bilimler Lisesi", "Şişli", "İstanbul", "Sosyal Bilimler Lisesi", 470.3, 1.61, 90),
+    LiseBilgisi("Beşiktaş Anadolu Lisesi", "Beşiktaş", "İstanbul", "Anadolu Lisesi", 458.4, 3.20, 210),
+    LiseBilgisi("Üsküdar Anadolu Lisesi", "Üsküdar", "İstanbul", "Anadolu Lisesi", 445.6, 5.40, 240),
+    LiseBilgisi("Bahçelievler Anadolu Lisesi", "Bahçelievler", "İstanbul", "Anadolu Lisesi", 421.8, 10.80, 270),
+    LiseBilgisi("Pendik Mesleki ve Teknik Anadolu Lisesi", "Pendik", "İstanbul", "Mesleki ve Teknik Anadolu Lisesi", 380.2, 24.50, 300),
+
+    # ── ANKARA ─────────────────────────────────
+    LiseBilgisi("Ankara Fen Lisesi", "Çankaya", "Ankara", "Fen Lisesi", 492.4, 0.11, 150),
+    LiseBilgisi("Ankara Atatürk Anadolu Lisesi", "Çankaya", "Ankara", "Anadolu Lisesi", 487.5, 0.26, 150),
+    LiseBilgisi("Ankara Anadolu Lisesi", "Çankaya", "Ankara", "Anadolu Lisesi", 484.9, 0.38, 150),
+    LiseBilgisi("Gazi Anadolu Lisesi", "Çankaya", "Ankara", "Anadolu Lisesi", 481.0, 0.58, 150),
+    LiseBilgisi("Ankara Sosyal Bilimler Lisesi", "Yenimahalle", "Ankara", "Sosyal Bilimler Lisesi", 466.2, 2.05, 90),
+    LiseBilgisi("Keçiören Anadolu İmam Hatip Lisesi", "Keçiören", "Ankara", "Anadolu İmam Hatip Lisesi", 448.7, 4.80, 180),
+    LiseBilgisi("Etimesgut Anadolu Lisesi", "Etimesgut", "Ankara", "Anadolu Lisesi", 430.5, 8.60, 240),
+    LiseBilgisi("Sincan Mesleki ve Teknik Anadolu Lisesi", "Sincan", "Ankara", "Mesleki ve Teknik Anadolu Lisesi", 372.4, 27.30, 300),
+
+    # ── İZMİR ──────────────────────────────────
+    LiseBilgisi("İzmir Fen Lisesi", "Bornova", "İzmir", "Fen Lisesi", 491.6, 0.13, 150),
+    LiseBilgisi("Bornova Anadolu Lisesi", "Bornova", "İzmir", "Anadolu Lisesi", 488.8, 0.22, 150),
+    LiseBilgisi("İzmir Atatürk Lisesi", "Konak", "İzmir", "Anadolu Lisesi", 476.1, 1.02, 180),
+    LiseBilgisi("Karşıyaka Anadolu Lisesi", "Karşıyaka", "İzmir", "Anadolu Lisesi", 452.3, 4.20, 210),
+    LiseBilgisi("Buca Mesleki ve Teknik Anadolu Lisesi", "Buca", "İzmir", "Mesleki ve Teknik Anadolu Lisesi", 365.7, 29.80, 300),
+
+    # ── BURSA ──────────────────────────────────
+    LiseBilgisi("Bursa Fen Lisesi", "Yıldırım", "Bursa", "Fen Lisesi", 487.0, 0.27, 150),
+    LiseBilgisi("Bursa Anadolu Lisesi", "Osmangazi", "Bursa", "Anadolu Lisesi", 474.2, 1.18, 180),
+    LiseBilgisi("Nilüfer Anadolu İmam Hatip Lisesi", "Nilüfer", "Bursa", "Anadolu İmam Hatip Lisesi", 436.9, 7.10, 180),
+
+    # ── KONYA ──────────────────────────────────
+    LiseBilgisi("Konya Meram Fen Lisesi", "Meram", "Konya", "Fen Lisesi", 479.3, 0.74, 150),
+    LiseBilgisi("Konya Selçuklu Anadolu Lisesi", "Selçuklu", "Konya", "Anadolu Lisesi", 441.8, 6.20, 210),
+]
+
+
+# ──────────────────────────────────────────────
+# İndeksli Katalog
+# ──────────────────────────────────────────────
+_Anahtar = Tuple[Optional[str], Optional[str]]  # (sehir, tur); None = hepsi
+
+
+class LiseKatalogu:
+    """
+    Lise listesi üzerinde (şehir, tür) bileşimleri için taban puan ve
+    yüzdelik dilim indeksleri (bkz. core/sirali_indeks.py).
+
+    Kullanım:
+        katalog = LiseKatalogu(LISE_VERILERI)
+        katalog.yuzdelik_araligi(0.5, 2.0, sehir="İstanbul")
+    """
+
+    def __init__(self, liseler: Sequence[LiseBilgisi]):
+        self.liseler: List[LiseBilgisi] = list(liseler)
+        self.sehirler: List[str] = sorted({l.sehir for l in self.liseler}, key=tr_siralama_anahtari)
+        self.turler: List[str] = sorted({l.tur for l in self.liseler}, key=tr_siralama_anahtari)
+        self._diziler: Dict[str, np.ndarray] = {}
+
+        gruplar = filtre_gruplari([(l.sehir, l.tur) for l in self.liseler])
+        self._taban = SiraliIndeks(gruplar, [l.taban_puan for l in self.liseler], esitlikte_ters=True)
+        self._yuzdelik = SiraliIndeks(gruplar, [l.yuzdelik for l in self.liseler])
+
+    def __len__(self) -> int:
+        return len(self.liseler)
+
+    def _anahtarlar(self, sehir: Optional[str], tur: Optional[str]) -> List[_Anahtar]:
+        return [(s, tur or None) for s in sehir_eslesmeleri(self.sehirler, sehir)]
+
+    def taban_araligi(
+        self,
+        min_puan: Optional[float] = None,
+        max_puan: Optional[float] = None,
+        sehir: Optional[str] = None,
+        tur: Optional[str] = None,
+        min_dahil: bool = True,
+        max_dahil: bool = True,
+    ) -> List[int]:
+        """Taban puanı aralıktaki liselerin dizinleri, artan taban puan sırasıyla."""
+        return self._taban.aralik(self._anahtarlar(sehir, tur), min_puan, max_puan, min_dahil, max_dahil)
+
+    def yuzdelik_araligi(
+        self,
+        min_yuzdelik: Optional[float] = None,
+        max_yuzdelik: Optional[float] = None,
+        sehir: Optional[str] = None,
+        tur: Optional[str] = None,
+        min_dahil: bool = True,
+        max_dahil: bool = True,
+    ) -> List[int]:
+        """Yüzdelik dilimi aralıktaki liselerin dizinleri, en başarılıdan (küçük yüzdelik) başlayarak."""
+        return self._yuzdelik.aralik(self._anahtarlar(sehir, tur), min_yuzdelik, max_yuzdelik, min_dahil, max_dahil)
+
+    def getir(self, dizinler: Sequence[int]) -> List[LiseBilgisi]:
+        return [self.liseler[i] for i in dizinler]
+
+    def dizi(self, alan: str) -> np.ndarray:
+        """Bir LiseBilgisi alanının katalog sırasıyla numpy dizisi (ilk istekte kurulur)."""
+        if alan not in self._diziler:
+            self._diziler[alan] = np.array([getattr(l, alan) for l in self.liseler])
+        return self._diziler[alan]
+
+
+# ──────────────────────────────────────────────
+# Veri Dosyasından Yükleme
+# ──────────────────────────────────────────────
+LISE_KATALOG_YOLU_ORTAM = "OMNIPDR_LISE_KATALOG"   # Lise kataloğu yolu (CSV/JSON)
+_VERI_DIZINI = Path(__file__).parent.parent / "data"
+_VARSAYILAN_LISE_YOLLARI = (_VERI_DIZINI / "lgs_lise_katalog.csv", _VERI_DIZINI / "lgs_lise_katalog.json")
+
+
+def _lise_kontrol(d: Dict[str, object]) -> Optional[str]:
+    if not 0 <= d["taban_puan"] <= 500:
+        return "taban puan 0-500 aralığında olmalı"
+    if not 0 < d["yuzdelik"] <= 100:
+        return "yüzdelik dilim (0, 100] aralığında olmalı"
+    if d["kontenjan"] < 0:
+        return "kontenjan negatif olamaz"
+    return None
+
+
+# Sütun sırası LiseBilgisi alan sırasıyla aynıdır: LiseBilgisi(*satir)
+LISE_SEMASI = Sema(
+    ad="lgs_lise",
+    alanlar=(
+        Alan("okul", str),
+        Alan("ilce", str),
+        Alan("sehir", str),
+        Alan("tur", str, izinli=LISE_TURLERI),
+        Alan("taban_puan", float),
+        Alan("yuzdelik", float),
+        Alan("kontenjan", int),
+        Alan("yil", int, zorunlu=False, varsayilan=2024),
+        Alan("okul_kodu", str, zorunlu=False, varsayilan=""),
+    ),
+    kontrol=_lise_kontrol,
+)
+
+_LISE_KATALOGU: Optional[LiseKatalogu] = None
+
+
+def lise_katalogu_yukle(yol: Optional[Path] = None) -> LiseKatalogu:
+    """
+    Lise kataloğunu yükleyip etkin katalog yapar.
+    yol verilmezse OMNIPDR_LISE_KATALOG ortam değişkeni, o da yoksa
+    data/lgs_lise_katalog.csv|json denenir; hiçbiri yoksa LISE_VERILERI kullanılır.
+    Dosyada birden çok yıl varsa en güncel yıl kullanılır.
+    """
+    global _LISE_KATALOGU
+    if yol is None:
+        ortam = os.environ.get(LISE_KATALOG_YOLU_ORTAM)
+        yol = Path(ortam) if ortam else next((p for p in _VARSAYILAN_LISE_YOLLARI if p.exists()), None)
+
+    if yol is None:
+        liseler = LISE_VERILERI
+    else:
+        tumu = [LiseBilgisi(*satir) for satir in tablo_yukle(Path(yol), LISE_SEMASI).satirlar]
+        son_yil = max(l.yil for l in tumu)
+        liseler = [l for l in tumu if l.yil == son_yil]
+    _LISE_KATALOGU = LiseKatalogu(liseler)
+    return _LISE_KATALOGU
+
+
+def lise_katalogu() -> LiseKatalogu:
+    """Uygulamanın kullandığı lise kataloğunu döndürür (ilk çağrıda yüklenir)."""
+    if _LISE_KATALOGU is None:
+        lise_katalogu_yukle()
+    return _LISE_KATALOGU
+
+
+# ──────────────────────────────────────────────
+# Öneri Fonksiyonları
+# ──────────────────────────────────────────────
+def lise_oner(
+    yuzdelik: float,
+    sehir: Optional[str] = None,
+    tur: Optional[str] = None,
+    guvenli_bandi: float = 0.3,
+    sans_bandi: float = 0.3,
+    limit: int = 8,
+) -> Dict[str, List[LiseBilgisi]]:
+    """
+    Öğrencinin yüzdelik dilimine göre lise önerileri.
+    Dengeli: taban yüzdeliği [y·(1−sans_bandi), y·(1+guvenli_bandi)] aralığında,
+    Güvenli: y·(1+guvenli_bandi) üstünde (daha kolay),
+    Şans:    y·(1−sans_bandi) altında (daha zor).
+    Her liste öğrencinin dilimine en yakın liselerle başlar.
+    """
+    k = lise_katalogu()
+    alt = yuzdelik * (1 - sans_bandi)
+    ust = yuzdelik * (1 + guvenli_bandi)
+    guvenli = k.yuzdelik_araligi(ust, sehir=sehir, tur=tur, min_dahil=False)[:limit]
+    dengeli = k.yuzdelik_araligi(alt, ust, sehir=sehir, tur=tur)[:limit]
+    sans = k.yuzdelik_araligi(max_yuzdelik=alt, sehir=sehir, tur=tur, max_dahil=False)[-limit:]
+
+    return {
+        "guvenli": k.getir(guvenli),
+        "dengeli": k.getir(dengeli),
+        "sans": k.getir(reversed(sans)),
+    }
+
+
+def lise_oner_puan(
+    puan: float,
+    sehir: Optional[str] = None,
+    tur: Optional[str] = None,
+    tolerans: float = 15.0,
+    limit: int = 8,
+) -> Dict[str, List[LiseBilgisi]]:
+    """
+    LGS puanına göre lise önerileri (3 kategori: Güvenli, Dengeli, Şans).
+    Her liste puana en yakın liselerle başlar.
+    """
+    k = lise_katalogu()
+    yari = tolerans / 2
+    guvenli = k.taban_araligi(max_puan=puan - yari, sehir=sehir, tur=tur, max_dahil=False)[-limit:]
+    dengeli = k.taban_araligi(puan - yari, puan + yari, sehir=sehir, tur=tur)[-limit:]
+    sans = k.taban_araligi(puan + yari, puan + tolerans, sehir=sehir, tur=tur, min_dahil=False)[:limit]
+
+    return {
+        "guvenli": k.getir(reversed(guvenli)),
+        "dengeli": k.getir(reversed(dengeli)),
+        "sans": k.getir(sans),
+    }
+
+
+def lise_sehirleri() -> List[str]:
+    """Katalogdaki şehirler (Türkçe alfabetik)."""
+    return list(lise_katalogu().sehirler)
+
+
+def lise_turleri() -> List[str]:
+    """Katalogdaki lise türleri (Türkçe alfabetik)."""
+    return list(lise_katalogu().turler)
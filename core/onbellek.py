@@ -0,0 +1,136 @@
+"""
+OmniPDR – core/onbellek.py
+==============================
+Süreç içi, boyutu sınırlı ve thread-safe LRU önbellek.
+
+Streamlit her etkileşimde betiği baştan çalıştırır; aynı net kümeleri
+tekrar tekrar puanlanır. Bu modüldeki önbellekler modül seviyesinde
+yaşadığından yeniden çalıştırmalar arasında korunur ve isabet
+istatistikleri ile izlenebilir.
+
+Kullanım:
+    onbellek = LRUOnbellek("puan", kapasite=2048)
+    sonuc = onbellek.getir(anahtar, lambda: pahali_hesap())
+    print(onbellek.istatistik())
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class OnbellekIstatistigi:
+    """Bir önbelleğin anlık kullanım istatistikleri."""
+    ad: str
+    kapasite: int
+    boyut: int
+    isabet: int
+    iska: int
+    tahliye: int
+
+    @property
+    def isabet_orani(self) -> float:
+        toplam = self.isabet + self.iska
+        return self.isabet / toplam if toplam else 0.0
+
+
+# Tüm önbellekler istatistik raporu için burada kaydedilir
+_KAYIT: Dict[str, "LRUOnbellek"] = {}
+
+
+class LRUOnbellek:
+    """
+    En az kullanılanı tahliye eden, kilitle korunan sözlük tabanlı önbellek.
+
+    Hesaplama kilit dışında yapılır; iki thread aynı anahtarı aynı anda
+    kaçırırsa ikisi de hesaplar ve son yazan kazanır (sonuçlar özdeştir).
+    """
+
+    def __init__(self, ad: str, kapasite: int = 1024):
+        if kapasite <= 0:
+            raise ValueError("Önbellek kapasitesi pozitif olmalıdır.")
+        self.ad = ad
+        self.kapasite = kapasite
+        self._veri: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._kilit = threading.Lock()
+        self._isabet = 0
+        self._iska = 0
+        self._tahliye = 0
+        _KAYIT[ad] = self
+
+    def getir(self, anahtar: Hashable, uret: Callable[[], T]) -> T:
+        """Anahtar önbellekteyse döndürür, değilse uret() ile hesaplayıp saklar."""
+        with self._kilit:
+            if anahtar in self._veri:
+                self._veri.move_to_end(anahtar)
+                self._isabet += 1
+                return self._veri[anahtar]  # type: ignore[return-value]
+            self._iska += 1
+
+        deger = uret()
+        self.koy(anahtar, deger)
+        return deger
+
+    def bul(self, anahtar: Hashable) -> Optional[object]:
+        """Anahtarın değerini (yoksa None) döndürür; artımlı güncellenen girdiler için."""
+        with self._kilit:
+            if anahtar in self._veri:
+                self._veri.move_to_end(anahtar)
+                self._isabet += 1
+                return self._veri[anahtar]
+            self._iska += 1
+            return None
+
+    def koy(self, anahtar: Hashable, deger: object) -> None:
+        """Değeri doğrudan yazar (gerekirse en eski girdiyi tahliye eder)."""
+        with self._kilit:
+            self._veri[anahtar] = deger
+            self._veri.move_to_end(anahtar)
+            while len(self._veri) > self.kapasite:
+                self._veri.popitem(last=False)
+                self._tahliye += 1
+
+    def kapasiteyi_genislet(self, kapasite: int) -> None:
+        """Kapasiteyi en az verilen değere çıkarır (küçültmez); kohort boyutuna göre ayarlamak için."""
+        with self._kilit:
+            self.kapasite = max(self.kapasite, kapasite)
+
+    def gecersiz_kil(self, anahtar: Hashable) -> None:
+        """Tek bir anahtarı önbellekten çıkarır."""
+        with self._kilit:
+            self._veri.pop(anahtar, None)
+
+    def temizle(self) -> None:
+        """Tüm girdileri ve istatistikleri sıfırlar."""
+        with self._kilit:
+            self._veri.clear()
+            self._isabet = self._iska = self._tahliye = 0
+
+    def istatistik(self) -> OnbellekIstatistigi:
+        with self._kilit:
+            return OnbellekIstatistigi(
+                ad=self.ad,
+                kapasite=self.kapasite,
+                boyut=len(self._veri),
+                isabet=self._isabet,
+                iska=self._iska,
+                tahliye=self._tahliye,
+            )
+
+    def __len__(self) -> int:
+        return len(self._veri)
+
+    def __repr__(self) -> str:
+        i = self.istatistik()
+        return f"<LRUOnbellek '{self.ad}': {i.boyut}/{i.kapasite} | isabet %{i.isabet_orani * 100:.1f}>"
+
+
+def tum_istatistikler() -> List[OnbellekIstatistigi]:
+    """Süreçteki tüm kayıtlı önbelleklerin istatistiklerini döndürür."""
+    return [o.istatistik() for o in _KAYIT.values()]
@@ -0,0 +1,131 @@
+"""
+OmniPDR – core/puan_gecmisi.py
+==================================
+Deneme bazlı puan ve sıralama geçmişinin kalıcı (materialize) tutulması.
+
+Her DenemeKaydi'na tahmini TYT/AYT/LGS puanı ve sıralaması yazılır.
+Kayıt bir anahtar taşır: puan tablosu sürümü + girdi netleri. Kayıt ya da
+tablolar değişmedikçe yeniden hesaplama yapılmaz; görüntüleme ve kohort
+sorguları yalnızca saklanan değerleri okur.
+
+Not: AYT denemesinin yerleştirme puanı, o tarihe kadarki son TYT denemesiyle
+birlikte hesaplanır. Bu nedenle öncesine TYT denemesi eklenirse AYT kaydının
+anahtarı da değişir ve otomatik olarak yenilenir.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from core.puan_hesaplama import (
+    PUAN_TABLOSU_SURUMU, ayt_puan_hesapla, deneme_bolumu,
+    lgs_puan_hesapla_onbellekli, siralama_tahmin, tam_puan_hesapla_onbellekli,
+    tyt_puan_hesapla,
+)
+from models.ogrenci_sinifi import DenemeKaydi, Ogrenci
+
+
+def _anahtar(*parcalar) -> str:
+    """Girdilerden kısa, kararlı bir özet üretir."""
+    ham = json.dumps([PUAN_TABLOSU_SURUMU, *parcalar], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(ham.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _kayit_puanla(
+    kayit: DenemeKaydi,
+    ogrenci: Ogrenci,
+    onceki_tyt: Optional[Dict[str, float]],
+) -> dict:
+    """Tek bir deneme kaydı için saklanacak puan özetini hesaplar."""
+    if ogrenci.sinav_turu == "LGS":
+        sonuc = lgs_puan_hesapla_onbellekli(kayit.netleri)
+        return {"bolum": "LGS", "puan": sonuc.puan, "siralama": sonuc.tahmini_siralama}
+
+    if deneme_bolumu(kayit.netleri) == "TYT":
+        puan = round(tyt_puan_hesapla(kayit.netleri), 2)
+        return {"bolum": "TYT", "puan": puan, "siralama": siralama_tahmin(puan, "YKS", "TYT")}
+
+    puan_turu = ogrenci.hedef_puan_turu
+    ozet = {
+        "bolum": "AYT",
+        "puan_turu": puan_turu,
+        "puan": round(ayt_puan_hesapla(kayit.netleri, puan_turu), 2),
+        "yerlestirme_puani": None,
+        "siralama": None,
+    }
+    if onceki_tyt is not None:
+        sonuc = tam_puan_hesapla_onbellekli(onceki_tyt, kayit.netleri, puan_turu, ogrenci.obp)
+        ozet["yerlestirme_puani"] = sonuc.yerlestirme_puani
+        ozet["siralama"] = sonuc.tahmini_siralama
+    return ozet
+
+
+def puan_gecmisini_guncelle(ogrenci: Ogrenci) -> int:
+    """
+    Bayatlamış veya hiç hesaplanmamış deneme kayıtlarının puan özetini yeniler.
+    Güncellenen kayıt sayısını döndürür; güncel kayıtlara dokunulmaz.
+    """
+    guncellenen = 0
+    onceki_tyt: Optional[Dict[str, float]] = None
+
+    for kayit in ogrenci.deneme_kayitlari:
+        yks_tyt = ogrenci.sinav_turu == "YKS" and deneme_bolumu(kayit.netleri) == "TYT"
+        anahtar = _anahtar(
+            ogrenci.sinav_turu, ogrenci.hedef_puan_turu, ogrenci.obp, kayit.netleri,
+            None if yks_tyt else onceki_tyt,
+        )
+        if not kayit.puan_kaydi or kayit.puan_kaydi.get("anahtar") != anahtar:
+            kayit.puan_kaydi = {**_kayit_puanla(kayit, ogrenci, onceki_tyt), "anahtar": anahtar}
+            guncellenen += 1
+        if yks_tyt:
+            onceki_tyt = kayit.netleri
+
+    return guncellenen
+
+
+# ──────────────────────────────────────────────
+# Görüntüleme ve Kohort Sorguları (yeniden puanlama yapmaz)
+# ──────────────────────────────────────────────
+def puan_gecmisi_tablosu(ogrenci: Ogrenci) -> pd.DataFrame:
+    """Saklanan puan/sıralama geçmişini tarih sıralı tablo olarak döndürür."""
+    satirlar = [
+        {
+            "Tarih": k.tarih,
+            "Bölüm": k.puan_kaydi["bolum"],
+            "Puan": k.puan_kaydi.get("yerlestirme_puani") or k.puan_kaydi["puan"],
+            "Sıralama": k.puan_kaydi.get("siralama"),
+        }
+        for k in ogrenci.deneme_kayitlari if k.puan_kaydi
+    ]
+    return pd.DataFrame(satirlar, columns=["Tarih", "Bölüm", "Puan", "Sıralama"])
+
+
+def kohort_siralama_tablosu(
+    ogrenciler: Sequence[Ogrenci],
+    bolum: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Her öğrencinin trende giren denemelerinden saklanmış en güncel sıralamasını
+    döndürür (en iyi sıra önce); onaylanmamış şüpheli denemeler atlanır.
+    bolum: "TYT", "AYT" veya "LGS" ile sınırlandırılabilir.
+    """
+    satirlar: List[dict] = []
+    for ogr in ogrenciler:
+        for k in reversed(ogr.trend_kayitlari):
+            pk = k.puan_kaydi
+            if pk and pk.get("siralama") is not None and (bolum is None or pk["bolum"] == bolum):
+                satirlar.append({
+                    "ogrenci_id": ogr.ogrenci_id,
+                    "ad": ogr.ad,
+                    "bolum": pk["bolum"],
+                    "tarih": k.tarih,
+                    "puan": pk.get("yerlestirme_puani") or pk["puan"],
+                    "siralama": pk["siralama"],
+                })
+                break
+    df = pd.DataFrame(satirlar, columns=["ogrenci_id", "ad", "bolum", "tarih", "puan", "siralama"])
+    return df.sort_values("siralama").reset_index(drop=True)
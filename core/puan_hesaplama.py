@@ -13,8 +13,15 @@ Yerleştirme Puanı = TYT × 0.40 + AYT × 0.60 + OBP × 0.12
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import heapq
+from dataclasses import dataclass, field, replace
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.onbellek import LRUOnbellek
 
 
 # ──────────────────────────────────────────────
@@ -81,7 +88,11 @@ LGS_DERSLER = {
 }
 LGS_MAKSIMUM = 500.0
 
+# Bir doğruyu götüren yanlış sayısı (sınav türüne göre)
+YANLIS_BOLENI = {"YKS": 4, "LGS": 3}
+
 # Tahmini sıralama tabloları (yaklaşık değerler, 2024 verileri baz alınmıştır)
+SIRALAMA_YILI = 2024
 TYT_SIRALAMA_TABLOSU = [
     (500, 1), (490, 100), (480, 500), (470, 1500), (460, 3000),
     (450, 5500), (440, 9000), (430, 14000), (420, 20000), (410, 28000),
@@ -125,6 +136,14 @@ LGS_SIRALAMA_TABLOSU = [
 ]
 
 
+# Katsayı ve tablolardan türetilen sürüm; herhangi biri değişirse saklanan puanlar bayatlar
+PUAN_TABLOSU_SURUMU = hashlib.sha1(repr((
+    SIRALAMA_YILI, TYT_DERSLER, TYT_BASLANGIC, TYT_MAKSIMUM, AYT_DERSLER, AYT_PUAN_KATSAYILARI,
+    LGS_DERSLER, LGS_MAKSIMUM, TYT_SIRALAMA_TABLOSU, SAY_SIRALAMA_TABLOSU, EA_SIRALAMA_TABLOSU,
+    SOZ_SIRALAMA_TABLOSU, LGS_SIRALAMA_TABLOSU,
+)).encode("utf-8")).hexdigest()[:12]
+
+
 # ──────────────────────────────────────────────
 # Sonuç Veri Sınıfları
 # ──────────────────────────────────────────────
@@ -152,12 +171,12 @@ class LGSSonucu:
 # ──────────────────────────────────────────────
 def net_hesapla_yks(dogru: int, yanlis: int) -> float:
     """YKS net hesaplama: 4 yanlış = 1 doğruyu götürür."""
-    return max(0.0, dogru - yanlis / 4)
+    return max(0.0, dogru - yanlis / YANLIS_BOLENI["YKS"])
 
 
 def net_hesapla_lgs(dogru: int, yanlis: int) -> float:
     """LGS net hesaplama: 3 yanlış = 1 doğruyu götürür."""
-    return max(0.0, dogru - yanlis / 3)
+    return max(0.0, dogru - yanlis / YANLIS_BOLENI["LGS"])
 
 
 def tyt_puan_hesapla(netleri: Dict[str, float]) -> float:
@@ -256,6 +275,18 @@ def _siralama_tahmin(puan: float, tablo: list) -> int:
     return tablo[-1][1]
 
 
+def _siralama_tablosu(sinav_turu: str, puan_turu: str) -> list:
+    """Sınav ve puan türüne göre sıralama tablosunu döndürür."""
+    if sinav_turu == "LGS":
+        return LGS_SIRALAMA_TABLOSU
+    return {
+        "SAY": SAY_SIRALAMA_TABLOSU,
+        "EA": EA_SIRALAMA_TABLOSU,
+        "SOZ": SOZ_SIRALAMA_TABLOSU,
+        "TYT": TYT_SIRALAMA_TABLOSU,
+    }.get(puan_turu, SAY_SIRALAMA_TABLOSU)
+
+
 def tam_puan_hesapla(
     tyt_netleri: Dict[str, float],
     ayt_netleri: Dict[str, float],
@@ -290,35 +321,471 @@ def tam_puan_hesapla(
     )
 
 
+# ──────────────────────────────────────────────
+# Önbellekli Hesaplama (Streamlit yeniden çalıştırmaları için)
+# ──────────────────────────────────────────────
+_PUAN_ONBELLEGI = LRUOnbellek("puan", kapasite=4096)
+_SIRALAMA_ONBELLEGI = LRUOnbellek("siralama", kapasite=8192)
+_DUYARLILIK_ONBELLEGI = LRUOnbellek("duyarlilik", kapasite=256)
+
+
+def _net_anahtari(netleri: Dict[str, float]) -> Tuple[Tuple[str, float], ...]:
+    """Net sözlüğünü kanonik biçime getirir: sıralı, 2 haneye yuvarlı, sıfırlar atılmış."""
+    return tuple(sorted((d, round(float(n), 2)) for d, n in netleri.items() if n))
+
+
+def tam_puan_hesapla_onbellekli(
+    tyt_netleri: Dict[str, float],
+    ayt_netleri: Dict[str, float],
+    puan_turu: str = "SAY",
+    obp: float = 0.0,
+) -> PuanSonucu:
+    """
+    tam_puan_hesapla'nın önbellekli hali.
+    Anahtar: (puan türü, tablo yılı, OBP, yuvarlanmış netler). Dönen nesne kopyadır.
+    """
+    anahtar = ("YKS", puan_turu, SIRALAMA_YILI, round(float(obp), 2),
+               _net_anahtari(tyt_netleri), _net_anahtari(ayt_netleri))
+    sonuc = _PUAN_ONBELLEGI.getir(
+        anahtar, lambda: tam_puan_hesapla(dict(anahtar[4]), dict(anahtar[5]), puan_turu, anahtar[3]),
+    )
+    return replace(sonuc, detay=dict(sonuc.detay))
+
+
+def lgs_puan_hesapla_onbellekli(netleri: Dict[str, float]) -> LGSSonucu:
+    """lgs_puan_hesapla'nın önbellekli hali. Dönen nesne kopyadır."""
+    anahtar = ("LGS", "LGS", SIRALAMA_YILI, 0.0, _net_anahtari(netleri))
+    sonuc = _PUAN_ONBELLEGI.getir(anahtar, lambda: lgs_puan_hesapla(dict(anahtar[4])))
+    return replace(sonuc, ders_puanlari=dict(sonuc.ders_puanlari))
+
+
+def siralama_tahmin(puan: float, sinav_turu: str = "YKS", puan_turu: str = "SAY") -> int:
+    """Puan türü tablosundan önbellekli sıralama tahmini (puan 2 haneye yuvarlanır)."""
+    anahtar = (sinav_turu, puan_turu, SIRALAMA_YILI, round(float(puan), 2))
+    return _SIRALAMA_ONBELLEGI.getir(
+        anahtar, lambda: _siralama_tahmin(anahtar[3], _siralama_tablosu(sinav_turu, puan_turu)),
+    )
+
+
+# ──────────────────────────────────────────────
+# Vektörel Hesaplama (toplu senaryolar için)
+# ──────────────────────────────────────────────
+# Matris sütunlarının ders sırası; satırlar birbirinden bağımsız net vektörleridir
+TYT_DERS_SIRASI: List[str] = list(TYT_DERSLER)
+AYT_DERS_SIRASI: List[str] = list(AYT_DERSLER)
+LGS_DERS_SIRASI: List[str] = list(LGS_DERSLER)
+
+_TYT_KATSAYI_VEKTORU = np.array([TYT_DERSLER[d]["katsayi"] for d in TYT_DERS_SIRASI])
+_LGS_AGIRLIK_VEKTORU = np.array([LGS_DERSLER[d]["agirlik"] for d in LGS_DERS_SIRASI], dtype=float)
+_LGS_MAX_AGIRLIKLI = float(sum(b["soru_sayisi"] * b["agirlik"] for b in LGS_DERSLER.values()))
+
+
+def soru_sayisi_vektoru(dersler: Sequence[str], bolum: str) -> np.ndarray:
+    """Ders sırasına göre soru sayılarını (net tavanlarını) döndürür."""
+    tablo = {"TYT": TYT_DERSLER, "AYT": AYT_DERSLER, "LGS": LGS_DERSLER}[bolum]
+    return np.array([tablo[d]["soru_sayisi"] for d in dersler], dtype=float)
+
+
+def netleri_matrise(netleri_listesi: Sequence[Dict[str, float]], dersler: Sequence[str]) -> np.ndarray:
+    """Net sözlüklerini (n, ders) boyutlu matrise çevirir; eksik ders 0 net sayılır."""
+    return np.array(
+        [[netleri.get(d, 0.0) for d in dersler] for netleri in netleri_listesi],
+        dtype=float,
+    ).reshape(len(netleri_listesi), len(dersler))
+
+
+def tyt_puan_vektorel(tyt_matrisi: np.ndarray) -> np.ndarray:
+    """tyt_puan_hesapla'nın satır bazlı vektörel karşılığı (sütunlar TYT_DERS_SIRASI)."""
+    return np.minimum(TYT_BASLANGIC + tyt_matrisi @ _TYT_KATSAYI_VEKTORU, TYT_MAKSIMUM)
+
+
+def ayt_puan_vektorel(ayt_matrisi: np.ndarray, puan_turu: str = "SAY") -> np.ndarray:
+    """ayt_puan_hesapla'nın satır bazlı vektörel karşılığı (sütunlar AYT_DERS_SIRASI)."""
+    katsayilar = AYT_PUAN_KATSAYILARI.get(puan_turu, AYT_PUAN_KATSAYILARI["SAY"])
+    vektor = np.array([katsayilar.get(d, 0.0) for d in AYT_DERS_SIRASI])
+    return np.minimum(100.0 + ayt_matrisi @ vektor, TYT_MAKSIMUM)
+
+
+def yerlestirme_puani_vektorel(tyt_puanlari: np.ndarray, ayt_puanlari: np.ndarray, obp=0.0) -> np.ndarray:
+    """yerlestirme_puani_hesapla'nın vektörel karşılığı; obp skaler veya dizi olabilir."""
+    obp_katki = np.minimum(np.asarray(obp, dtype=float) * 0.6, 60.0)
+    return tyt_puanlari * 0.40 + ayt_puanlari * 0.60 + obp_katki
+
+
+def lgs_puan_vektorel(lgs_matrisi: np.ndarray) -> np.ndarray:
+    """lgs_puan_hesapla puanının vektörel karşılığı (sütunlar LGS_DERS_SIRASI)."""
+    return (lgs_matrisi @ _LGS_AGIRLIK_VEKTORU) / _LGS_MAX_AGIRLIKLI * LGS_MAKSIMUM
+
+
+def siralama_tahmin_vektorel(puanlar: np.ndarray, tablo: list) -> np.ndarray:
+    """_siralama_tahmin'in vektörel karşılığı; tablo dışındaki puanlar uçlara sabitlenir."""
+    puan_ekseni = np.array([p for p, _ in reversed(tablo)], dtype=float)
+    sira_ekseni = np.array([s for _, s in reversed(tablo)], dtype=float)
+    return np.interp(puanlar, puan_ekseni, sira_ekseni).astype(np.int64)
+
+
+def deneme_bolumu(netleri: Dict[str, float]) -> str:
+    """
+    Bir YKS deneme kaydının TYT mi AYT mi olduğunu ders adlarından çıkarır.
+    Yalnızca ortak dersler (Fizik, Kimya...) varsa TYT soru sayısını aşan net AYT demektir.
+    """
+    if any(d in TYT_DERSLER and d not in AYT_DERSLER for d in netleri):
+        return "TYT"
+    if any(d in AYT_DERSLER and d not in TYT_DERSLER for d in netleri):
+        return "AYT"
+    if any(n > TYT_DERSLER.get(d, {}).get("soru_sayisi", 0) for d, n in netleri.items()):
+        return "AYT"
+    return "TYT"
+
+
+# ──────────────────────────────────────────────
+# Ne Olur? (What-if) Duyarlılık Analizi
+# ──────────────────────────────────────────────
+@dataclass
+class DuyarlilikSonucu:
+    """Ders × net artışı ızgarasında yerleştirme puanı ve sıralama."""
+    kalemler: List[str]            # "AYT Matematik" biçiminde satır etiketleri
+    deltalar: np.ndarray           # (m,) denenen net artışları
+    puanlar: np.ndarray            # (k, m)
+    siralamalar: np.ndarray        # (k, m)
+    etkin_deltalar: np.ndarray     # (k, m) soru sayısı tavanına kırpılmış gerçek artış
+    mevcut_puan: float
+    mevcut_siralama: int
+
+    @property
+    def siralama_kazanci(self) -> np.ndarray:
+        """Her hücrede mevcut sıraya göre kazanılan sıra sayısı (pozitif = iyileşme)."""
+        return self.mevcut_siralama - self.siralamalar
+
+    @property
+    def net_basina_siralama(self) -> Dict[str, float]:
+        """En büyük artışta net başına kazanılan sıra; ders önceliği için kullanılır."""
+        etkin = self.etkin_deltalar[:, -1]
+        kazanc = np.divide(self.siralama_kazanci[:, -1], etkin, out=np.zeros(len(etkin)), where=etkin > 0)
+        return dict(sorted(zip(self.kalemler, np.round(kazanc, 1).tolist()), key=lambda x: -x[1]))
+
+
+def _durum_anahtari(netleri: Dict[str, Dict[str, float]]) -> Tuple:
+    """Net sözlüklerini önbellek anahtarı olarak kullanılabilir sıralı demete çevirir."""
+    return tuple(
+        (bolum, tuple(sorted((d, round(float(n), 2)) for d, n in dersler.items())))
+        for bolum, dersler in sorted(netleri.items())
+    )
+
+
+def _durumdan_netler(anahtar: Tuple) -> Dict[str, Dict[str, float]]:
+    return {bolum: dict(dersler) for bolum, dersler in anahtar}
+
+
+def _senaryo_kalemleri(sinav_turu: str, puan_turu: str) -> List[Tuple[str, str]]:
+    """Duyarlılık analizinde değiştirilebilecek (bölüm, ders) çiftleri."""
+    if sinav_turu == "LGS":
+        return [("LGS", d) for d in LGS_DERS_SIRASI]
+    katsayilar = AYT_PUAN_KATSAYILARI.get(puan_turu, AYT_PUAN_KATSAYILARI["SAY"])
+    return [("TYT", d) for d in TYT_DERS_SIRASI] + [("AYT", d) for d in AYT_DERS_SIRASI if katsayilar.get(d, 0) > 0]
+
+
+def _senaryolari_puanla(
+    netleri: Dict[str, Dict[str, float]],
+    degisimler: np.ndarray,
+    kalemler: List[Tuple[str, str]],
+    sinav_turu: str,
+    puan_turu: str,
+    obp: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    degisimler: (senaryo, kalem) matrisi. Tüm senaryoları tek geçişte puanlar;
+    netler soru sayısı tavanına kırpılır.
+    """
+    bolumler = ("LGS",) if sinav_turu == "LGS" else ("TYT", "AYT")
+    siralar = {"TYT": TYT_DERS_SIRASI, "AYT": AYT_DERS_SIRASI, "LGS": LGS_DERS_SIRASI}
+    matrisler = {}
+    for bolum in bolumler:
+        dersler = siralar[bolum]
+        taban = netleri_matrise([netleri.get(bolum, {})], dersler)
+        matris = np.repeat(taban, len(degisimler), axis=0)
+        for j, (b, ders) in enumerate(kalemler):
+            if b == bolum:
+                matris[:, dersler.index(ders)] += degisimler[:, j]
+        matrisler[bolum] = np.clip(matris, 0.0, soru_sayisi_vektoru(dersler, bolum))
+
+    if sinav_turu == "LGS":
+        puanlar = lgs_puan_vektorel(matrisler["LGS"])
+    else:
+        puanlar = yerlestirme_puani_vektorel(
+            tyt_puan_vektorel(matrisler["TYT"]),
+            ayt_puan_vektorel(matrisler["AYT"], puan_turu),
+            obp,
+        )
+    return puanlar, siralama_tahmin_vektorel(puanlar, _siralama_tablosu(sinav_turu, puan_turu))
+
+
+def _ders_duyarliligi(
+    durum: Tuple, deltalar: Tuple[float, ...], sinav_turu: str, puan_turu: str, obp: float,
+) -> DuyarlilikSonucu:
+    netleri = _durumdan_netler(durum)
+    kalemler = _senaryo_kalemleri(sinav_turu, puan_turu)
+    k, m = len(kalemler), len(deltalar)
+
+    # İlk satır mevcut durum; ardından her ders için m senaryo (blok köşegen)
+    degisimler = np.zeros((1 + k * m, k))
+    for j in range(k):
+        degisimler[1 + j * m: 1 + (j + 1) * m, j] = deltalar
+    puanlar, siralamalar = _senaryolari_puanla(netleri, degisimler, kalemler, sinav_turu, puan_turu, obp)
+
+    tavanlar = np.array([soru_sayisi_vektoru([d], b)[0] for b, d in kalemler])
+    mevcut = np.array([netleri.get(b, {}).get(d, 0.0) for b, d in kalemler])
+    bosluk = tavanlar - np.clip(mevcut, 0.0, tavanlar)
+    sonuc = DuyarlilikSonucu(
+        kalemler=[f"{b} {d}" for b, d in kalemler],
+        deltalar=np.array(deltalar, dtype=float),
+        puanlar=puanlar[1:].reshape(k, m),
+        siralamalar=siralamalar[1:].reshape(k, m),
+        etkin_deltalar=np.minimum(np.array(deltalar, dtype=float)[None, :], bosluk[:, None]),
+        mevcut_puan=round(float(puanlar[0]), 2),
+        mevcut_siralama=int(siralamalar[0]),
+    )
+    # Önbellekteki sonuç paylaşılır; yanlışlıkla değiştirilmesin
+    for dizi in (sonuc.deltalar, sonuc.puanlar, sonuc.siralamalar, sonuc.etkin_deltalar):
+        dizi.flags.writeable = False
+    return sonuc
+
+
+def ders_duyarliligi(
+    netleri: Dict[str, Dict[str, float]],
+    sinav_turu: str = "YKS",
+    puan_turu: str = "SAY",
+    obp: float = 0.0,
+    deltalar: Sequence[float] = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10),
+) -> DuyarlilikSonucu:
+    """
+    Her dersi tek tek +delta net artırınca puan ve sıralamanın nasıl değiştiğini hesaplar.
+    netleri: {"TYT": {...}, "AYT": {...}} veya {"LGS": {...}}
+    Sonuçlar öğrenci durumu (netler, puan türü, OBP) başına önbelleğe alınır.
+    """
+    anahtar = (
+        _durum_anahtari(netleri), tuple(float(d) for d in deltalar),
+        sinav_turu, puan_turu, round(float(obp), 2),
+    )
+    return _DUYARLILIK_ONBELLEGI.getir(anahtar, lambda: _ders_duyarliligi(*anahtar))
+
+
+def senaryo_izgarasi(
+    netleri: Dict[str, Dict[str, float]],
+    eksenler: Dict[str, Sequence[float]],
+    sinav_turu: str = "YKS",
+    puan_turu: str = "SAY",
+    obp: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Birden fazla dersin birlikte artırıldığı tüm kombinasyonları tek geçişte puanlar.
+    eksenler: {"AYT Matematik": [0, 5, 10], "AYT Fizik": [0, 3]}
+    Dönüş: eksen sırasıyla şekillenmiş (puanlar, siralamalar) dizileri.
+    """
+    kalemler = [tuple(ad.split(" ", 1)) for ad in eksenler]
+    gecerli = set(_senaryo_kalemleri(sinav_turu, puan_turu))
+    for kalem in kalemler:
+        if kalem not in gecerli:
+            raise ValueError(f"Geçersiz ders: {' '.join(kalem)}")
+
+    degisimler = np.array(list(product(*eksenler.values())), dtype=float).reshape(-1, len(kalemler))
+    puanlar, siralamalar = _senaryolari_puanla(netleri, degisimler, kalemler, sinav_turu, puan_turu, obp)
+    sekil = tuple(len(v) for v in eksenler.values())
+    return puanlar.reshape(sekil), siralamalar.reshape(sekil)
+
+
 # ──────────────────────────────────────────────
 # Hedef Analizi
 # ──────────────────────────────────────────────
+@dataclass
+class HedefPlani:
+    """Hedef sıralamaya ulaşmak için en az zorlukla yapılacak net artışları."""
+    hedef_puan: float
+    mevcut_puan: float
+    ulasilabilir: bool
+    artislar: Dict[str, Dict[str, float]] = field(default_factory=dict)  # {"TYT": {"Türkçe": 2.5}}
+    toplam_net_artisi: float = 0.0
+
+    @property
+    def kalem_artislari(self) -> Dict[str, float]:
+        """Artışlar "TYT Türkçe" / "LGS Matematik" biçiminde tek düzey (DuyarlilikSonucu.kalemler gibi)."""
+        return {f"{bolum} {ders}": artis for bolum, dersler in self.artislar.items() for ders, artis in dersler.items()}
+
+
+# Optimizasyonun net adımı: 4 yanlış = 1 doğru olduğundan çeyrek net anlamlı en küçük birimdir
+NET_ADIMI = 0.25
+# Bir ders tavana yaklaştıkça son netlerin maliyeti 1 / (1 - 0.8) = 5 katına çıkar
+DOYMA_KATSAYISI = 0.8
+
+
+# Bölüm puanlarının hedef puandaki ağırlığı: yerleştirme puanında TYT %40 + AYT %60,
+# TYT puan türünde yalnızca TYT puanı
+_BOLUM_AGIRLIKLARI = {False: {"TYT": 0.40, "AYT": 0.60}, True: {"TYT": 1.0}}
+_BOLUM_BASLANGICLARI = {"TYT": TYT_BASLANGIC, "AYT": 100.0}
+
+
+def _tavan_bosluklari(
+    kalemler: List[Tuple[str, str, float, float, float]],
+    netler: List[float],
+    sinav_turu: str,
+    puan_turu: str,
+) -> Dict[str, float]:
+    """
+    TYT ve AYT puanları 500'de kesilir; her bölümün tavana kalan payı hedef
+    puan biriminde. LGS puanı tam netle tam 500 olduğundan sınırsızdır.
+    """
+    if sinav_turu == "LGS":
+        return {"LGS": float("inf")}
+    bosluklar = {
+        bolum: agirlik * (TYT_MAKSIMUM - _BOLUM_BASLANGICLARI[bolum])
+        for bolum, agirlik in _BOLUM_AGIRLIKLARI[puan_turu == "TYT"].items()
+    }
+    for (bolum, _, _, _, kazanc), net in zip(kalemler, netler):
+        bosluklar[bolum] -= net * kazanc
+    return bosluklar
+
+
+def _hedef_kalemleri(
+    netleri: Dict[str, Dict[str, float]],
+    sinav_turu: str,
+    puan_turu: str,
+) -> List[Tuple[str, str, float, float, float]]:
+    """
+    Her ders için (bölüm, ders, mevcut net, soru sayısı, net başına puan) döndürür.
+    Net başına puan, dersin hedef puana (yerleştirme, TYT ya da LGS) doğrudan katkısıdır.
+    """
+    kalemler = []
+    if sinav_turu == "LGS":
+        max_agirlikli = sum(b["soru_sayisi"] * b["agirlik"] for b in LGS_DERSLER.values())
+        lgs = netleri.get("LGS", {})
+        for ders, bilgi in LGS_DERSLER.items():
+            kazanc = bilgi["agirlik"] / max_agirlikli * LGS_MAKSIMUM
+            kalemler.append(("LGS", ders, lgs.get(ders, 0.0), bilgi["soru_sayisi"], kazanc))
+        return kalemler
+
+    tyt = netleri.get("TYT", {})
+    tyt_agirligi = _BOLUM_AGIRLIKLARI[puan_turu == "TYT"]["TYT"]
+    for ders, bilgi in TYT_DERSLER.items():
+        kalemler.append(("TYT", ders, tyt.get(ders, 0.0), bilgi["soru_sayisi"], bilgi["katsayi"] * tyt_agirligi))
+
+    if puan_turu in AYT_PUAN_KATSAYILARI:
+        ayt = netleri.get("AYT", {})
+        for ders, katsayi in AYT_PUAN_KATSAYILARI[puan_turu].items():
+            if katsayi > 0:
+                kalemler.append(("AYT", ders, ayt.get(ders, 0.0), AYT_DERSLER[ders]["soru_sayisi"], katsayi * 0.60))
+    return kalemler
+
+
+def hedef_plani_hesapla(
+    netleri: Dict[str, Dict[str, float]],
+    hedef_siralama: int,
+    sinav_turu: str = "YKS",
+    puan_turu: str = "SAY",
+    obp: float = 0.0,
+    zorluk_agirliklari: Optional[Dict[str, float]] = None,
+) -> HedefPlani:
+    """
+    Hedef sıralamaya ulaşmak için ders bazında en ucuz net artışlarını bulur.
+
+    netleri: {"TYT": {...}, "AYT": {...}} veya {"LGS": {...}}
+    zorluk_agirliklari: {"Fizik": 1.5} gibi ders başına zorluk çarpanı (varsayılan 1.0)
+
+    Her derste bir çeyrek net artışının maliyeti zorluk ağırlığıyla ve dersin
+    doluluk oranıyla birlikte artar; kazanç ise katsayılarla doğrusaldır.
+    Bu dışbükey problemde puan/maliyet oranı en yüksek adımı seçen açgözlü
+    yöntem en iyi sonucu verir. Soru sayıları ve TYT/AYT puanlarının 500
+    tavanı uygulanır; puan_turu "TYT" ise hedef ve mevcut puan TYT puanıdır.
+    """
+    zorluk_agirliklari = zorluk_agirliklari or {}
+    tablo = _siralama_tablosu(sinav_turu, puan_turu)
+    hedef_puan = _puan_from_siralama(hedef_siralama, tablo)
+
+    if sinav_turu == "LGS":
+        mevcut_puan = lgs_puan_hesapla(netleri.get("LGS", {})).puan
+    elif puan_turu == "TYT":
+        mevcut_puan = tyt_puan_hesapla(netleri.get("TYT", {}))
+    else:
+        mevcut_puan = yerlestirme_puani_hesapla(
+            tyt_puan_hesapla(netleri.get("TYT", {})),
+            ayt_puan_hesapla(netleri.get("AYT", {}), puan_turu),
+            obp,
+        )
+
+    puan_farki = hedef_puan - mevcut_puan
+    if puan_farki <= 0:
+        return HedefPlani(round(hedef_puan, 2), round(mevcut_puan, 2), True)
+
+    kalemler = _hedef_kalemleri(netleri, sinav_turu, puan_turu)
+    netler = [min(max(k[2], 0.0), k[3]) for k in kalemler]
+    bosluklar = _tavan_bosluklari(kalemler, netler, sinav_turu, puan_turu)
+
+    def _adim_kazanci(i: int) -> float:
+        """Adımın hedef puana katkısı; bölüm puanı 500'e dayanınca kırpılır."""
+        return min(kalemler[i][4] * NET_ADIMI, max(bosluklar[kalemler[i][0]], 0.0))
+
+    def _adim_orani(i: int) -> float:
+        _, ders, _, soru_sayisi, _ = kalemler[i]
+        doluluk = (netler[i] + NET_ADIMI) / soru_sayisi
+        maliyet = zorluk_agirliklari.get(ders, 1.0) * NET_ADIMI / (1.0 - DOYMA_KATSAYISI * doluluk)
+        return _adim_kazanci(i) / maliyet
+
+    yigin = [(-_adim_orani(i), i) for i, k in enumerate(kalemler) if netler[i] + NET_ADIMI <= k[3]]
+    heapq.heapify(yigin)
+
+    while puan_farki > 1e-9 and yigin:
+        oran, i = heapq.heappop(yigin)
+        guncel = _adim_orani(i)
+        if guncel <= 0:
+            continue        # Bölüm puanı tavanda: bu dersten artış puan getirmez
+        if guncel < -oran - 1e-12:
+            # Tavan payı başka bir ders tarafından tüketildi; oran düştü, sıraya yeniden girer
+            heapq.heappush(yigin, (-guncel, i))
+            continue
+        kazanc = _adim_kazanci(i)
+        netler[i] += NET_ADIMI
+        puan_farki -= kazanc
+        bosluklar[kalemler[i][0]] -= kazanc
+        if netler[i] + NET_ADIMI <= kalemler[i][3]:
+            heapq.heappush(yigin, (-_adim_orani(i), i))
+
+    artislar: Dict[str, Dict[str, float]] = {}
+    toplam = 0.0
+    for (bolum, ders, mevcut, soru_sayisi, _), yeni in zip(kalemler, netler):
+        artis = yeni - min(max(mevcut, 0.0), soru_sayisi)
+        if artis > 0:
+            artislar.setdefault(bolum, {})[ders] = artis
+            toplam += artis
+
+    return HedefPlani(
+        hedef_puan=round(hedef_puan, 2),
+        mevcut_puan=round(mevcut_puan, 2),
+        ulasilabilir=puan_farki <= 1e-9,
+        artislar=artislar,
+        toplam_net_artisi=toplam,
+    )
+
+
 def hedef_net_farki(
     mevcut_netleri: Dict[str, float],
     hedef_siralama: int,
     sinav_turu: str = "YKS",
     puan_turu: str = "SAY",
+    ayt_netleri: Optional[Dict[str, float]] = None,
+    obp: float = 0.0,
 ) -> Dict[str, float]:
     """
     Hedefe ulaşmak için her derste kaç net artması gerektiğini tahmin eder.
-    Basit lineer yaklaşım kullanır.
+    YKS için mevcut_netleri TYT netleridir. Sonuç anahtarları her iki sınavda
+    da "bölüm ders" biçimindedir ("TYT Türkçe", "LGS Türkçe").
     """
     if sinav_turu == "LGS":
-        mevcut = lgs_puan_hesapla(mevcut_netleri)
-        mevcut_puan = mevcut.puan
-        # Hedef puana ulaşmak için gereken puan farkı
-        hedef_puan = _puan_from_siralama(hedef_siralama, LGS_SIRALAMA_TABLOSU)
-        puan_farki = hedef_puan - mevcut_puan
-        if puan_farki <= 0:
-            return {}
-        # Eşit dağıt
-        ders_sayisi = len(mevcut_netleri)
-        if ders_sayisi == 0:
-            return {}
-        net_artis = puan_farki / ders_sayisi / 4  # yaklaşık
-        return {d: round(net_artis, 1) for d in mevcut_netleri}
-
-    return {}
+        plan = hedef_plani_hesapla({"LGS": mevcut_netleri}, hedef_siralama, "LGS")
+    else:
+        plan = hedef_plani_hesapla(
+            {"TYT": mevcut_netleri, "AYT": ayt_netleri or {}},
+            hedef_siralama, "YKS", puan_turu, obp,
+        )
+    return plan.kalem_artislari
 
 
 def _puan_from_siralama(siralama: int, tablo: list) -> float:
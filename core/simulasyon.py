@@ -0,0 +1,225 @@
+"""
+OmniPDR – core/simulasyon.py
+================================
+Monte Carlo puan ve sıralama dağılımı.
+
+Tek bir tam_puan_hesapla çağrısı nokta tahmini verir. Burada öğrencinin
+deneme geçmişindeki ders bazlı ortalama ve varyans kullanılarak binlerce
+olası sınav günü net vektörü üretilir ve hepsi tek seferde vektörel olarak
+puanlanır. Kurum geneli gece çalıştırmaları için süreç havuzu desteklenir.
+
+Kullanım:
+    sonuc = puan_dagilimi_simule(ogrenci, ornek_sayisi=5000)
+    sonuclar = kohort_simulasyonu(repo.hepsini_getir(), max_workers=8)
+
+Komut satırı:
+    python -m core.simulasyon --ornek 5000 --cikti data/simulasyon.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.puan_hesaplama import (
+    AYT_DERS_SIRASI, LGS_DERS_SIRASI, TYT_DERS_SIRASI,
+    _siralama_tablosu, ayt_puan_vektorel, deneme_bolumu, lgs_puan_vektorel,
+    netleri_matrise, siralama_tahmin_vektorel, soru_sayisi_vektoru,
+    tyt_puan_vektorel, yerlestirme_puani_vektorel,
+)
+from models.ogrenci_sinifi import Ogrenci
+
+
+# ──────────────────────────────────────────────
+# Sabitler
+# ──────────────────────────────────────────────
+VARSAYILAN_ORNEK_SAYISI = 5000
+YUZDELIKLER = (5, 25, 50, 75, 95)
+# Tek denemesi olan derslerde varyans bilinmez; soru sayısının %8'i std kabul edilir
+VARSAYILAN_STD_ORANI = 0.08
+# Hiç oynamayan netler bile sınav gününde biraz sapar
+MIN_STD = 0.5
+
+
+@dataclass
+class SimulasyonSonucu:
+    """Bir öğrencinin simüle edilmiş puan/sıralama dağılımı."""
+    ogrenci_id: str
+    ornek_sayisi: int
+    puan_ortalama: float
+    puan_std: float
+    puan_yuzdelikleri: Dict[int, float] = field(default_factory=dict)
+    siralama_yuzdelikleri: Dict[int, int] = field(default_factory=dict)
+    hedef_olasiligi: Optional[float] = None   # P(sıralama ≤ hedef_siralama)
+    puanlar: Optional[np.ndarray] = field(default=None, repr=False)  # İstenirse ham örnekler
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d.pop("puanlar")
+        return d
+
+
+# ──────────────────────────────────────────────
+# Ders bazlı dağılım parametreleri
+# ──────────────────────────────────────────────
+def _ders_parametreleri(
+    netleri_listesi: List[Dict[str, float]],
+    dersler: Sequence[str],
+    bolum: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Deneme kayıtlarından ders bazında (ortalama, std) vektörleri üretir."""
+    tavan = soru_sayisi_vektoru(dersler, bolum)
+    if not netleri_listesi:
+        return np.zeros(len(dersler)), np.zeros(len(dersler))
+
+    matris = netleri_matrise(netleri_listesi, dersler)
+    ortalama = matris.mean(axis=0)
+    if len(netleri_listesi) >= 2:
+        std = matris.std(axis=0, ddof=1)
+    else:
+        std = tavan * VARSAYILAN_STD_ORANI
+    # Hiç çözülmeyen dersler (ortalama 0) simülasyona gürültü katmasın
+    std = np.where(ortalama > 0, np.maximum(std, MIN_STD), 0.0)
+    return ortalama, std
+
+
+def _ornekle(
+    rng: np.random.Generator,
+    ortalama: np.ndarray,
+    std: np.ndarray,
+    tavan: np.ndarray,
+    ornek_sayisi: int,
+) -> np.ndarray:
+    """Bağımsız normal netler çeker ve [0, soru sayısı] aralığına kırpar."""
+    ornekler = rng.normal(ortalama, std, size=(ornek_sayisi, len(ortalama)))
+    return np.clip(ornekler, 0.0, tavan)
+
+
+def puan_dagilimi_simule(
+    ogrenci: Ogrenci,
+    ornek_sayisi: int = VARSAYILAN_ORNEK_SAYISI,
+    son_n: Optional[int] = None,
+    tohum=None,
+    ornekleri_sakla: bool = False,
+) -> Optional[SimulasyonSonucu]:
+    """
+    Öğrencinin deneme geçmişinden sınav günü puan/sıralama dağılımını simüle eder.
+    Onaylanmamış şüpheli denemeler kullanılmaz; son_n verilirse yalnızca
+    trende giren son n deneme kullanılır. Puan türü TYT ise puanlar TYT
+    puanıdır (OBP ve AYT katılmaz), sıralama TYT tablosundan okunur. Kayıt yoksa None döner.
+    """
+    kayitlar = ogrenci.trend_kayitlari[-son_n:] if son_n else ogrenci.trend_kayitlari
+    if not kayitlar:
+        return None
+
+    rng = np.random.default_rng(tohum)
+
+    if ogrenci.sinav_turu == "LGS":
+        ortalama, std = _ders_parametreleri([k.netleri for k in kayitlar], LGS_DERS_SIRASI, "LGS")
+        tavan = soru_sayisi_vektoru(LGS_DERS_SIRASI, "LGS")
+        puanlar = lgs_puan_vektorel(_ornekle(rng, ortalama, std, tavan, ornek_sayisi))
+    else:
+        tyt_kayit = [k.netleri for k in kayitlar if deneme_bolumu(k.netleri) == "TYT"]
+        tyt_ort, tyt_std = _ders_parametreleri(tyt_kayit, TYT_DERS_SIRASI, "TYT")
+        tyt = _ornekle(rng, tyt_ort, tyt_std, soru_sayisi_vektoru(TYT_DERS_SIRASI, "TYT"), ornek_sayisi)
+        if ogrenci.hedef_puan_turu == "TYT":
+            # TYT sıralama tablosu TYT puanı ölçeğindedir (hedef_plani_hesapla gibi)
+            puanlar = tyt_puan_vektorel(tyt)
+        else:
+            ayt_kayit = [k.netleri for k in kayitlar if deneme_bolumu(k.netleri) == "AYT"]
+            ayt_ort, ayt_std = _ders_parametreleri(ayt_kayit, AYT_DERS_SIRASI, "AYT")
+            ayt = _ornekle(rng, ayt_ort, ayt_std, soru_sayisi_vektoru(AYT_DERS_SIRASI, "AYT"), ornek_sayisi)
+            puanlar = yerlestirme_puani_vektorel(
+                tyt_puan_vektorel(tyt),
+                ayt_puan_vektorel(ayt, ogrenci.hedef_puan_turu),
+                ogrenci.obp,
+            )
+
+    tablo = _siralama_tablosu(ogrenci.sinav_turu, ogrenci.hedef_puan_turu)
+    siralamalar = siralama_tahmin_vektorel(puanlar, tablo)
+
+    puan_y = np.percentile(puanlar, YUZDELIKLER)
+    sira_y = np.percentile(siralamalar, YUZDELIKLER)
+
+    hedef_olasiligi = None
+    if ogrenci.hedef_siralama:
+        hedef_olasiligi = round(float(np.mean(siralamalar <= ogrenci.hedef_siralama)), 4)
+
+    return SimulasyonSonucu(
+        ogrenci_id=ogrenci.ogrenci_id,
+        ornek_sayisi=ornek_sayisi,
+        puan_ortalama=round(float(puanlar.mean()), 2),
+        puan_std=round(float(puanlar.std()), 2),
+        puan_yuzdelikleri={p: round(float(v), 2) for p, v in zip(YUZDELIKLER, puan_y)},
+        siralama_yuzdelikleri={p: int(v) for p, v in zip(YUZDELIKLER, sira_y)},
+        hedef_olasiligi=hedef_olasiligi,
+        puanlar=puanlar if ornekleri_sakla else None,
+    )
+
+
+# ──────────────────────────────────────────────
+# Kohort (kurum geneli) simülasyonu
+# ──────────────────────────────────────────────
+def _simule_et_gorev(arguman: Tuple[Ogrenci, int, Optional[int], np.random.SeedSequence]):
+    """Süreç havuzunda çalışan tekil görev (modül seviyesinde olmalı, pickle edilebilir)."""
+    ogrenci, ornek_sayisi, son_n, tohum = arguman
+    return ogrenci.ogrenci_id, puan_dagilimi_simule(ogrenci, ornek_sayisi, son_n, tohum)
+
+
+def kohort_simulasyonu(
+    ogrenciler: Sequence[Ogrenci],
+    ornek_sayisi: int = VARSAYILAN_ORNEK_SAYISI,
+    son_n: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    tohum: Optional[int] = None,
+) -> Dict[str, SimulasyonSonucu]:
+    """
+    Tüm öğrenciler için simülasyonu süreç havuzunda paralel çalıştırır.
+    Her öğrenci bağımsız bir rastgele akış alır; aynı tohum aynı sonucu üretir.
+    max_workers=1 verilirse havuz kurulmadan sırayla çalışır.
+    """
+    tohumlar = np.random.SeedSequence(tohum).spawn(len(ogrenciler))
+    gorevler = [(o, ornek_sayisi, son_n, t) for o, t in zip(ogrenciler, tohumlar)]
+
+    if max_workers == 1 or len(gorevler) <= 1:
+        sonuclar = map(_simule_et_gorev, gorevler)
+    else:
+        havuz = ProcessPoolExecutor(max_workers=max_workers)
+        parca = max(1, len(gorevler) // ((max_workers or os.cpu_count() or 1) * 4))
+        with havuz:
+            sonuclar = list(havuz.map(_simule_et_gorev, gorevler, chunksize=parca))
+
+    return {oid: s for oid, s in sonuclar if s is not None}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Kurum geneli gece simülasyonu: sonuçları JSON dosyasına yazar."""
+    from core.veritabani import OgrenciRepository
+
+    ayr = argparse.ArgumentParser(description="OmniPDR kohort Monte Carlo simülasyonu")
+    ayr.add_argument("--ornek", type=int, default=VARSAYILAN_ORNEK_SAYISI)
+    ayr.add_argument("--son-n", type=int, default=None)
+    ayr.add_argument("--isci", type=int, default=None)
+    ayr.add_argument("--tohum", type=int, default=None)
+    ayr.add_argument("--cikti", type=Path, default=Path("data") / "simulasyon_sonuclari.json")
+    args = ayr.parse_args(argv)
+
+    repo = OgrenciRepository(yaz=False)
+    sonuclar = kohort_simulasyonu(
+        repo.hepsini_getir(), args.ornek, args.son_n, args.isci, args.tohum,
+    )
+    args.cikti.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.cikti, "w", encoding="utf-8") as f:
+        json.dump({oid: s.to_dict() for oid, s in sonuclar.items()}, f, ensure_ascii=False, indent=2)
+    print(f"{len(sonuclar)} öğrenci simüle edildi → {args.cikti}")
+
+
+if __name__ == "__main__":
+    main()
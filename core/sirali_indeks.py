@@ -0,0 +1,96 @@
+"""
+OmniPDR – core/sirali_indeks.py
+===================================
+Katalog filtre bileşimleri başına sıralı dizin listeleri ve bisect aralık sorguları.
+
+Tasarım kararı: YÖK Atlas bölüm kataloğu ve LGS lise kataloğu aynı
+yapıyı kullanır. Her filtre bileşimi (ör. (puan türü, şehir, tür);
+None = filtre yok) için kayıt dizinleri bir sayısal alana göre bir kez
+sıralanır. Aralık sorguları bisect ile O(log n + k) maliyetle yanıtlanır.
+Şehir filtresi birden çok şehre eşleşirse parçalar heapq.merge ile
+birleştirilir.
+
+Kullanım:
+    gruplar = filtre_gruplari([(b.puan_turu, b.sehir, b.tur) for b in bolumler])
+    taban = SiraliIndeks(gruplar, [b.taban_puan for b in bolumler], esitlikte_ters=True)
+    taban.aralik([("SAY", s, None) for s in sehir_eslesmeleri(sehirler, "ist")], 450, 480)
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from itertools import product
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from core.turkce import tr_katla
+
+
+def sehir_eslesmeleri(sehirler: Sequence[str], sehir: Optional[str]) -> List[Optional[str]]:
+    """Şehir filtresini (alt dize, Türkçe büyük/küçük harf ve aksan duyarsız) indeks anahtarlarına çevirir."""
+    if not sehir:
+        return [None]
+    aranan = tr_katla(sehir)
+    return [s for s in sehirler if aranan in tr_katla(s)]
+
+
+def filtre_gruplari(alan_degerleri: Sequence[Tuple[Hashable, ...]]) -> Dict[Tuple, List[int]]:
+    """
+    Kayıt başına filtre alanlarının değerlerinden, her (değer ya da None)
+    bileşimine düşen kayıt dizinleri. Dizinler artan sıradadır.
+    """
+    gruplar: Dict[Tuple, List[int]] = defaultdict(list)
+    for i, degerler in enumerate(alan_degerleri):
+        for anahtar in product(*((None, d) for d in degerler)):
+            gruplar[anahtar].append(i)
+    return gruplar
+
+
+def aralik_dilimi(anahtarlar: Sequence[float], alt, ust, alt_dahil: bool = True, ust_dahil: bool = True) -> slice:
+    """Sıralı anahtarlarda [alt, ust] (uçlar isteğe göre açık) aralığının dilimi."""
+    bas = 0 if alt is None else (bisect_left if alt_dahil else bisect_right)(anahtarlar, alt)
+    son = len(anahtarlar) if ust is None else (bisect_right if ust_dahil else bisect_left)(anahtarlar, ust)
+    return slice(bas, son)
+
+
+class SiraliIndeks:
+    """
+    Filtre bileşimi başına bir alana göre sıralı (değerler, dizinler) çiftleri.
+
+    esitlikte_ters: Eşit değerlerde büyük dizin önce gelir; listeyi azalan
+    sırada okuyan çağıranlar böylece özgün liste sırasını korur.
+    """
+
+    def __init__(
+        self,
+        gruplar: Dict[Tuple, List[int]],
+        degerler: Sequence[float],
+        esitlikte_ters: bool = False,
+    ):
+        self._degerler = degerler
+        self._isaret = -1 if esitlikte_ters else 1
+        self._sirali: Dict[Tuple, Tuple[List[float], List[int]]] = {}
+        for anahtar, dizinler in gruplar.items():
+            sirali = sorted(dizinler, key=self._sira_anahtari)
+            self._sirali[anahtar] = ([degerler[i] for i in sirali], sirali)
+
+    def _sira_anahtari(self, i: int) -> Tuple[float, int]:
+        return self._degerler[i], self._isaret * i
+
+    def aralik(
+        self,
+        anahtarlar: Sequence[Tuple],
+        alt=None,
+        ust=None,
+        alt_dahil: bool = True,
+        ust_dahil: bool = True,
+    ) -> List[int]:
+        """Verilen filtre bileşimlerinde değeri aralıktaki kayıtların dizinleri, artan değer sırasıyla."""
+        parcalar = []
+        for anahtar in anahtarlar:
+            degerler, dizinler = self._sirali.get(anahtar, ([], []))
+            parcalar.append(dizinler[aralik_dilimi(degerler, alt, ust, alt_dahil, ust_dahil)])
+        if len(parcalar) == 1:
+            return parcalar[0]
+        return list(heapq.merge(*parcalar, key=self._sira_anahtari))
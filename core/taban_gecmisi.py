@@ -0,0 +1,161 @@
+"""
+OmniPDR – core/taban_gecmisi.py
+===================================
+Program bazlı çok yıllı taban/tavan puan, başarı sırası ve kontenjan geçmişi.
+
+Tasarım kararı: Her metrik (program × yıl) boyutlu bir numpy matrisinde,
+eksik yıllar NaN olarak tutulur; program kimliği → satır dizini sözlüğü
+ile erişilir. Gelecek yıl tahmini, katalog yüklenirken tüm programlar için
+tek bir vektörel en küçük kareler geçişiyle hesaplanır; istek
+anında regresyon yapılmaz.
+
+Kimlik: program_kodu doluysa o, değilse "üniversite|bölüm|puan türü".
+
+Kullanım:
+    gecmis = TabanGecmisi.kur({2022: [...], 2023: [...], 2024: [...]})
+    gecmis.taban_tahmini[gecmis.dizin("ODTÜ|Bilgisayar Mühendisliği|SAY")]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Taban/tavan puan tahminleri bu aralığa kırpılır
+PUAN_ALT_SINIR = 0.0
+PUAN_UST_SINIR = 560.0
+
+
+def program_kimligi(bolum) -> str:
+    """Bir BolumBilgisi için yıllar arasında kararlı program kimliği."""
+    return bolum.program_kodu or f"{bolum.universite}|{bolum.bolum}|{bolum.puan_turu}"
+
+
+def _dogrusal_tahmin(x: np.ndarray, y: np.ndarray, hedef_x: float) -> tuple:
+    """
+    Satır bazında (NaN'ları atlayarak) doğrusal regresyon; (tahmin, eğim) döndürür.
+    Tek gözlemli satırlarda eğim 0'dır (son değer korunur). Kısa serilerde
+    aşırı uç tahminleri önlemek için eğim (n−1)/n ile sönümlenir.
+    """
+    maske = ~np.isnan(y)
+    n = maske.sum(axis=1)
+    n_guvenli = np.maximum(n, 1)
+    x_ort = (maske * x).sum(axis=1) / n_guvenli
+    y_ort = np.nansum(y, axis=1) / n_guvenli
+    dx = (x[None, :] - x_ort[:, None]) * maske
+    dy = np.where(maske, y - y_ort[:, None], 0.0)
+    payda = (dx * dx).sum(axis=1)
+    egim = np.divide((dx * dy).sum(axis=1), payda, out=np.zeros_like(payda), where=payda > 0)
+    egim *= (n - 1) / n_guvenli
+    tahmin = np.where(n > 0, y_ort + egim * (hedef_x - x_ort), np.nan)
+    return tahmin, egim
+
+
+@dataclass
+class TabanGecmisi:
+    """Program × yıl matrisleri ve bir sonraki yıl için önceden hesaplanmış tahminler."""
+    program_idleri: List[str]
+    yillar: np.ndarray            # (Y,) artan
+    taban: np.ndarray             # (P, Y) — eksik yıl NaN
+    tavan: np.ndarray
+    siralama: np.ndarray
+    kontenjan: np.ndarray
+    projeksiyon_yili: int
+    taban_tahmini: np.ndarray     # (P,)
+    tavan_tahmini: np.ndarray
+    siralama_tahmini: np.ndarray  # (P,) int64
+    kontenjan_tahmini: np.ndarray
+    taban_egimi: np.ndarray       # Puan/yıl
+
+    def __post_init__(self):
+        self._dizinler: Dict[str, int] = {p: i for i, p in enumerate(self.program_idleri)}
+
+    @classmethod
+    def kur(cls, yillik: Mapping[int, Sequence]) -> "TabanGecmisi":
+        """Yıl → BolumBilgisi listesi eşlemesinden matrisleri ve tahminleri kurar."""
+        yillar = np.array(sorted(yillik), dtype=np.int64)
+        idler: Dict[str, int] = {}
+        for yil in yillar:
+            for b in yillik[int(yil)]:
+                idler.setdefault(program_kimligi(b), len(idler))
+
+        boyut = (len(idler), len(yillar))
+        taban, tavan, siralama, kontenjan = (np.full(boyut, np.nan) for _ in range(4))
+        for j, yil in enumerate(yillar):
+            for b in yillik[int(yil)]:
+                i = idler[program_kimligi(b)]
+                taban[i, j] = b.taban_puan
+                tavan[i, j] = b.tavan_puan
+                siralama[i, j] = b.siralama
+                kontenjan[i, j] = b.kontenjan
+
+        projeksiyon_yili = int(yillar[-1]) + 1
+        x = yillar.astype(np.float64)
+        taban_t, taban_egimi = _dogrusal_tahmin(x, taban, projeksiyon_yili)
+        tavan_t, _ = _dogrusal_tahmin(x, tavan, projeksiyon_yili)
+        # Başarı sırası çarpımsal değişir: log uzayında doğrusal
+        log_sira_t, _ = _dogrusal_tahmin(x, np.log(siralama), projeksiyon_yili)
+
+        taban_t = np.clip(taban_t, PUAN_ALT_SINIR, PUAN_UST_SINIR)
+        tavan_t = np.maximum(np.clip(tavan_t, PUAN_ALT_SINIR, PUAN_UST_SINIR), taban_t)
+        siralama_t = np.maximum(np.rint(np.exp(np.nan_to_num(log_sira_t))), 1).astype(np.int64)
+        # Kontenjan idari karardır; son bilinen değer korunur
+        son_dizin = np.where(~np.isnan(kontenjan), np.arange(len(yillar)), -1).max(axis=1)
+        kontenjan_t = kontenjan[np.arange(len(idler)), son_dizin]
+
+        return cls(
+            program_idleri=list(idler),
+            yillar=yillar,
+            taban=taban, tavan=tavan, siralama=siralama, kontenjan=kontenjan,
+            projeksiyon_yili=projeksiyon_yili,
+            taban_tahmini=np.round(taban_t, 2),
+            tavan_tahmini=np.round(tavan_t, 2),
+            siralama_tahmini=siralama_t,
+            kontenjan_tahmini=kontenjan_t,
+            taban_egimi=np.round(taban_egimi, 3),
+        )
+
+    def __len__(self) -> int:
+        return len(self.program_idleri)
+
+    @property
+    def cok_yillik(self) -> bool:
+        """Tahminin anlamlı olması için en az iki yıl veri gerekir."""
+        return len(self.yillar) >= 2
+
+    def dizin(self, program_id: str) -> Optional[int]:
+        return self._dizinler.get(program_id)
+
+    def seri(self, program_id: str) -> Optional[Dict[str, list]]:
+        """Bir programın yıllık serisi (grafik için); eksik yıllar None."""
+        i = self.dizin(program_id)
+        if i is None:
+            return None
+
+        def _liste(m: np.ndarray) -> list:
+            return [None if np.isnan(v) else float(v) for v in m[i]]
+
+        return {
+            "yil": self.yillar.tolist(),
+            "taban": _liste(self.taban),
+            "tavan": _liste(self.tavan),
+            "siralama": _liste(self.siralama),
+            "kontenjan": _liste(self.kontenjan),
+        }
+
+    def projeksiyonlu(self, bolumler: Sequence) -> List:
+        """Verilen (son yıl) bölümlerinin tahmini değerler ve tahmin yılıyla kopyalarını üretir."""
+        sonuc = []
+        for b in bolumler:
+            i = self._dizinler[program_kimligi(b)]
+            sonuc.append(replace(
+                b,
+                taban_puan=float(self.taban_tahmini[i]),
+                tavan_puan=float(self.tavan_tahmini[i]),
+                siralama=int(self.siralama_tahmini[i]),
+                kontenjan=int(self.kontenjan_tahmini[i]),
+                yil=self.projeksiyon_yili,
+            ))
+        return sonuc
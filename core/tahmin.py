@@ -0,0 +1,388 @@
+"""
+OmniPDR – core/tahmin.py
+====================================
+Sınav gününe net ve puan projeksiyonu.
+
+Her öğrenci × ders için ağırlıklı doğrusal eğilim kurulur:
+  - Üstel ağırlık  → yakın denemeler daha etkili (yarılanma süresi haftalık)
+  - Huber/bisquare → tek bir kötü/şanslı deneme eğimi saptırmaz (IRLS)
+  - Sönümlü eğim   → eğim sınava kadar doğrusal sürmez, haftalık φ ile azalır
+  - Belirsizlik    → ağırlıklı artık varyansından tahmin aralığı
+
+Tüm kohort tek seferde (öğrenci × deneme × ders) dizileri üzerinde kapalı
+biçim ağırlıklı en küçük kareler ile çözülür; öğrenci başına döngü yoktur.
+Sonuçlar veri sürümüyle önbelleğe alınır, yeni deneme gelene kadar
+yeniden hesaplanmaz; önbellek kapasitesi kohort boyutuna göre büyür ve
+kurum tablosu öğrenci anahtarlarının demetiyle ayrıca saklanır. Onaylanmamış şüpheli denemeler (bkz. core/anomali.py)
+uyuma girmez.
+
+Kullanım:
+    tahmin = net_tahmini(ogrenci)
+    tahminler = net_tahminleri(repo.hepsini_getir())
+"""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.onbellek import LRUOnbellek
+from core.puan_hesaplama import (
+    AYT_DERS_SIRASI, LGS_DERS_SIRASI, TYT_DERS_SIRASI,
+    _siralama_tablosu, ayt_puan_vektorel, deneme_bolumu, lgs_puan_vektorel,
+    siralama_tahmin_vektorel, soru_sayisi_vektoru, tyt_puan_vektorel,
+    yerlestirme_puani_vektorel,
+)
+from core.simulasyon import MIN_STD, VARSAYILAN_STD_ORANI
+from models.ogrenci_sinifi import Ogrenci
+
+
+# ──────────────────────────────────────────────
+# Sabitler
+# ──────────────────────────────────────────────
+YKS_TARIH = datetime(2026, 6, 13)
+LGS_TARIH = datetime(2026, 6, 7)
+
+YARILANMA_HAFTA = 8.0           # 8 hafta önceki deneme yarı ağırlıkta
+SONUM_KATSAYISI = 0.95          # Haftalık eğim sönümü (φ)
+HUBER_K = 1.345                 # Huber eşiği (ölçek birimi)
+BISQUARE_C = 4.685              # Tukey bisquare eşiği; bunun ötesindeki artık ağırlığı 0
+ROBUST_ITERASYON = 6            # IRLS yeniden ağırlıklandırma adımı
+HUBER_ADIMI = 3                 # İlk adımlar Huber (kararlı başlangıç), sonrası bisquare
+MIN_GOZLEM_EGILIM = 3           # Daha az denemede eğim 0 kabul edilir (yalnızca düzey)
+GUVEN_DUZEYI = 0.80
+_Z = 1.2816                     # %80 iki yönlü aralık için normal kantil
+
+YKS_BOLUMLERI = (("TYT", TYT_DERS_SIRASI), ("AYT", AYT_DERS_SIRASI))
+LGS_BOLUMLERI = (("LGS", LGS_DERS_SIRASI),)
+
+_TAHMIN_ONBELLEGI = LRUOnbellek("net_tahmini", kapasite=2048)
+_TABLO_ONBELLEGI = LRUOnbellek("tahmin_tablosu", kapasite=4)
+_KAPASITE_PAYI = 256            # Kohortun üstüne tekil öğrenci görüntülemeleri için yer
+
+
+def sinav_tarihi(sinav_turu: str) -> date:
+    return (LGS_TARIH if sinav_turu == "LGS" else YKS_TARIH).date()
+
+
+@dataclass
+class DersTahmini:
+    """Tek bir dersin eğilimi ve sınav günü projeksiyonu."""
+    bolum: str
+    ders: str
+    gozlem: int
+    son_duzey: float            # Son deneme tarihindeki eğilim değeri
+    haftalik_egim: float
+    tahmin: float
+    alt: float
+    ust: float
+
+
+@dataclass
+class NetTahmini:
+    """Bir öğrencinin sınav günü net, puan ve sıralama projeksiyonu."""
+    ogrenci_id: str
+    sinav_turu: str
+    hedef_tarih: date
+    ufuk_hafta: float           # Son denemeden sınava kalan hafta
+    dersler: List[DersTahmini] = field(default_factory=list)
+    toplam_net: float = 0.0
+    toplam_net_alt: float = 0.0
+    toplam_net_ust: float = 0.0
+    puan: float = 0.0
+    puan_alt: float = 0.0
+    puan_ust: float = 0.0
+    siralama: int = 0
+    siralama_iyi: int = 0       # Aralığın üst puanına karşılık gelen sıralama
+    siralama_kotu: int = 0
+
+    def ders_tablosu(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(d) for d in self.dersler])
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["hedef_tarih"] = self.hedef_tarih.isoformat()
+        return d
+
+
+# ──────────────────────────────────────────────
+# Toplu eğilim (öğrenci × deneme × ders)
+# ──────────────────────────────────────────────
+def _agirlikli_dogru(x: np.ndarray, Y: np.ndarray, w: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    x (S, T, 1), Y ve w (S, T, D) üzerinde ağırlıklı y = a + b·x uyumu.
+    a son deneme anındaki (x = 0) düzeydir. Eksik gözlemlerin ağırlığı 0'dır.
+    """
+    sw = w.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_ort = np.where(sw > 0, (w * x).sum(axis=1) / sw, 0.0)
+        y_ort = np.where(sw > 0, (w * Y).sum(axis=1) / sw, 0.0)
+    dx = x - x_ort[:, None, :]
+    sxx = (w * dx * dx).sum(axis=1)
+    sxy = (w * dx * (Y - y_ort[:, None, :])).sum(axis=1)
+    n = (w > 0).sum(axis=1)
+    egimli = (n >= MIN_GOZLEM_EGILIM) & (sxx > 1e-12)
+    b = np.where(egimli, sxy / np.where(egimli, sxx, 1.0), 0.0)
+    a = y_ort - b * x_ort
+    return a, b, sw, x_ort, sxx, egimli
+
+
+def _toplu_egilim(
+    x: np.ndarray,
+    Y: np.ndarray,
+    ufuk: np.ndarray,
+    tavan: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    x: (S, T) son denemeye göre hafta (≤ 0, dolgu NaN); Y: (S, T, D) netler
+    (gözlenmeyen NaN); ufuk: (S,) sınava kalan hafta; tavan: (D,) soru sayısı.
+    Her (öğrenci, ders) için düzey, eğim, tahmin ve standart hata döner.
+    """
+    maske = ~np.isnan(Y)
+    Y0 = np.where(maske, Y, 0.0)
+    x3 = np.nan_to_num(x)[:, :, None]
+    w0 = np.where(maske, 0.5 ** (-x3 / YARILANMA_HAFTA), 0.0)
+
+    w = w0
+    a, b, sw, x_ort, sxx, egimli = _agirlikli_dogru(x3, Y0, w)
+    for adim in range(ROBUST_ITERASYON):
+        artik = np.where(maske, Y0 - (a[:, None, :] + b[:, None, :] * x3), np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)   # Hiç gözlemi olmayan dersler
+            olcek = 1.4826 * np.nanmedian(np.abs(artik), axis=1)
+        olcek = np.where(np.isnan(olcek) | (olcek < 1e-9), np.inf, olcek)
+        u = np.abs(np.nan_to_num(artik)) / olcek[:, None, :]
+        if adim < HUBER_ADIMI:
+            with np.errstate(divide="ignore"):
+                robust = np.minimum(1.0, HUBER_K / u)
+        else:
+            robust = np.where(u < BISQUARE_C, (1 - (u / BISQUARE_C) ** 2) ** 2, 0.0)
+        w = w0 * robust
+        a, b, sw, x_ort, sxx, egimli = _agirlikli_dogru(x3, Y0, w)
+
+    # Sönümlü ufuk: Σ_{k=1..h} φ^k (h sürekli)
+    phi = SONUM_KATSAYISI
+    h_etkin = phi * (1 - phi ** ufuk) / (1 - phi)
+    nokta = a + b * h_etkin[:, None]
+
+    artik = np.where(maske, Y0 - (a[:, None, :] + b[:, None, :] * x3), 0.0)
+    sw2 = (w * w).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n_etkin = np.where(sw2 > 0, sw * sw / sw2, 0.0)
+        serbestlik = n_etkin - np.where(egimli, 2.0, 1.0)
+        s2 = np.where(serbestlik > 0, (w * artik * artik).sum(axis=1) / sw * n_etkin / serbestlik, np.nan)
+        egim_payi = np.where(
+            egimli, (h_etkin[:, None] - x_ort) ** 2 / np.where(egimli, sxx / sw * n_etkin, 1.0), 0.0,
+        )
+        std_hata = np.sqrt(s2 * (1.0 + 1.0 / n_etkin + egim_payi))
+
+    gozlem = maske.sum(axis=1)
+    varsayilan = np.broadcast_to(tavan * VARSAYILAN_STD_ORANI, std_hata.shape)
+    std_hata = np.where(np.isnan(std_hata), varsayilan, np.maximum(std_hata, MIN_STD))
+    std_hata = np.where(gozlem > 0, std_hata, 0.0)
+    return {
+        "gozlem": gozlem,
+        "duzey": a,
+        "egim": b,
+        "tahmin": np.clip(nokta, 0.0, tavan),
+        "std_hata": std_hata,
+    }
+
+
+def _bolum_dizileri(
+    ogrenciler: Sequence[Ogrenci],
+    bolum: str,
+    dersler: Sequence[str],
+    son_tarihler: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bölümün denemelerinden (S, T) hafta ve (S, T, D) net dizileri; eksik ders 0 net."""
+    secili = [
+        [k for k in o.trend_kayitlari if o.sinav_turu == "LGS" or deneme_bolumu(k.netleri) == bolum]
+        for o in ogrenciler
+    ]
+    T = max((len(s) for s in secili), default=0) or 1
+    x = np.full((len(ogrenciler), T), np.nan)
+    Y = np.full((len(ogrenciler), T, len(dersler)), np.nan)
+    for i, kayitlar in enumerate(secili):
+        if not kayitlar:
+            continue
+        gun = np.array([k.tarih.toordinal() for k in kayitlar], dtype=np.float64)
+        x[i, :len(kayitlar)] = (gun - son_tarihler[i]) / 7.0
+        Y[i, :len(kayitlar)] = [[k.netleri.get(d, 0.0) for d in dersler] for k in kayitlar]
+    return x, Y
+
+
+# ──────────────────────────────────────────────
+# Puan ve sıralama projeksiyonu
+# ──────────────────────────────────────────────
+def _puanla(sinav_turu: str, matrisler: Dict[str, np.ndarray], puan_turleri: np.ndarray, obp: np.ndarray) -> np.ndarray:
+    if sinav_turu == "LGS":
+        return lgs_puan_vektorel(matrisler["LGS"])
+    puan = np.empty(len(obp))
+    tyt = tyt_puan_vektorel(matrisler["TYT"])
+    for pt in np.unique(puan_turleri):
+        s = puan_turleri == pt
+        puan[s] = yerlestirme_puani_vektorel(tyt[s], ayt_puan_vektorel(matrisler["AYT"][s], pt), obp[s])
+    return puan
+
+
+def _siralamalar(sinav_turu: str, puanlar: np.ndarray, puan_turleri: np.ndarray) -> np.ndarray:
+    sonuc = np.empty(len(puanlar), dtype=np.int64)
+    for pt in np.unique(puan_turleri):
+        s = puan_turleri == pt
+        sonuc[s] = siralama_tahmin_vektorel(puanlar[s], _siralama_tablosu(sinav_turu, pt))
+    return sonuc
+
+
+def _grup_tahminleri(ogrenciler: Sequence[Ogrenci], sinav_turu: str, hedef: date) -> List[NetTahmini]:
+    """Aynı sınav türündeki öğrenciler için tek toplu uyum ve puanlama."""
+    S = len(ogrenciler)
+    son_tarihler = np.array([o.trend_kayitlari[-1].tarih.toordinal() for o in ogrenciler], dtype=np.float64)
+    ufuk = np.maximum(0.0, (hedef.toordinal() - son_tarihler) / 7.0)
+    puan_turleri = np.array([o.hedef_puan_turu for o in ogrenciler])
+    obp = np.array([o.obp for o in ogrenciler], dtype=np.float64)
+
+    bolumler = LGS_BOLUMLERI if sinav_turu == "LGS" else YKS_BOLUMLERI
+    egilimler = {}
+    for bolum, dersler in bolumler:
+        x, Y = _bolum_dizileri(ogrenciler, bolum, dersler, son_tarihler)
+        egilimler[bolum] = _toplu_egilim(x, Y, ufuk, soru_sayisi_vektoru(dersler, bolum))
+
+    # Puan belirsizliği: ders hatalarının puana doğrusal yayılımı (bağımsızlık varsayımı)
+    tahminler = {b: e["tahmin"] for b, e in egilimler.items()}
+    puan = _puanla(sinav_turu, tahminler, puan_turleri, obp)
+    puan_varyansi = np.zeros(S)
+    for bolum, dersler in bolumler:
+        for j in range(len(dersler)):
+            artik = {b: m.copy() for b, m in tahminler.items()}
+            artik[bolum][:, j] += 1.0
+            egim = _puanla(sinav_turu, artik, puan_turleri, obp) - puan
+            puan_varyansi += (egim * egilimler[bolum]["std_hata"][:, j]) ** 2
+    puan_yayilim = _Z * np.sqrt(puan_varyansi)
+    puan_alt, puan_ust = puan - puan_yayilim, puan + puan_yayilim
+    siralama = _siralamalar(sinav_turu, puan, puan_turleri)
+    siralama_iyi = _siralamalar(sinav_turu, puan_ust, puan_turleri)
+    siralama_kotu = _siralamalar(sinav_turu, puan_alt, puan_turleri)
+
+    sonuclar = []
+    for i, o in enumerate(ogrenciler):
+        dersler_i: List[DersTahmini] = []
+        toplam_varyans = 0.0
+        for bolum, dersler in bolumler:
+            e = egilimler[bolum]
+            tavan = soru_sayisi_vektoru(dersler, bolum)
+            for j, ders in enumerate(dersler):
+                if e["gozlem"][i, j] == 0:
+                    continue
+                t, sh = float(e["tahmin"][i, j]), float(e["std_hata"][i, j])
+                toplam_varyans += sh * sh
+                dersler_i.append(DersTahmini(
+                    bolum=bolum, ders=ders, gozlem=int(e["gozlem"][i, j]),
+                    son_duzey=round(float(e["duzey"][i, j]), 2),
+                    haftalik_egim=round(float(e["egim"][i, j]), 3),
+                    tahmin=round(t, 2),
+                    alt=round(max(0.0, t - _Z * sh), 2),
+                    ust=round(min(float(tavan[j]), t + _Z * sh), 2),
+                ))
+        toplam = sum(d.tahmin for d in dersler_i)
+        yayilim = _Z * toplam_varyans ** 0.5
+        sonuclar.append(NetTahmini(
+            ogrenci_id=o.ogrenci_id,
+            sinav_turu=sinav_turu,
+            hedef_tarih=hedef,
+            ufuk_hafta=round(float(ufuk[i]), 1),
+            dersler=dersler_i,
+            toplam_net=round(toplam, 2),
+            toplam_net_alt=round(max(0.0, toplam - yayilim), 2),
+            toplam_net_ust=round(toplam + yayilim, 2),
+            puan=round(float(puan[i]), 2),
+            puan_alt=round(float(puan_alt[i]), 2),
+            puan_ust=round(float(puan_ust[i]), 2),
+            siralama=int(siralama[i]),
+            siralama_iyi=int(siralama_iyi[i]),
+            siralama_kotu=int(siralama_kotu[i]),
+        ))
+    return sonuclar
+
+
+# ──────────────────────────────────────────────
+# Önbellekli giriş noktaları
+# ──────────────────────────────────────────────
+def _tahmin_anahtari(ogrenci: Ogrenci, hedef: date) -> tuple:
+    """Deneme verisi, hedef tarih ve puanlama girdileri değişmedikçe aynı kalır."""
+    kayitlar = ogrenci.trend_kayitlari
+    return (
+        ogrenci.ogrenci_id, ogrenci.veri_surumu, len(kayitlar), kayitlar[-1].id,
+        ogrenci.sinav_turu, ogrenci.hedef_puan_turu, ogrenci.obp, hedef,
+    )
+
+
+def net_tahminleri(
+    ogrenciler: Sequence[Ogrenci],
+    hedef_tarih: Optional[date] = None,
+) -> Dict[str, NetTahmini]:
+    """
+    Denemesi olan her öğrenci için sınav günü projeksiyonu (öğrenci id → tahmin).
+    hedef_tarih verilmezse öğrencinin sınav türünün tarihi kullanılır.
+    Önbellekte olmayan öğrenciler sınav türüne göre gruplanıp toplu uydurulur.
+    """
+    # Toplu okumada LRU'nun kendi kendini tahliye etmemesi için kohort sığmalı
+    _TAHMIN_ONBELLEGI.kapasiteyi_genislet(len(ogrenciler) + _KAPASITE_PAYI)
+    sonuclar: Dict[str, NetTahmini] = {}
+    eksikler: Dict[Tuple[str, date], List[Tuple[Ogrenci, tuple]]] = {}
+    for o in ogrenciler:
+        if not o.trend_kayitlari:
+            continue
+        hedef = hedef_tarih or sinav_tarihi(o.sinav_turu)
+        anahtar = _tahmin_anahtari(o, hedef)
+        onceki = _TAHMIN_ONBELLEGI.bul(anahtar)
+        if onceki is not None:
+            sonuclar[o.ogrenci_id] = onceki
+        else:
+            tur = "LGS" if o.sinav_turu == "LGS" else "YKS"
+            eksikler.setdefault((tur, hedef), []).append((o, anahtar))
+
+    for (tur, hedef), grup in eksikler.items():
+        for (o, anahtar), tahmin in zip(grup, _grup_tahminleri([o for o, _ in grup], tur, hedef)):
+            _TAHMIN_ONBELLEGI.koy(anahtar, tahmin)
+            sonuclar[o.ogrenci_id] = tahmin
+    return sonuclar
+
+
+def net_tahmini(ogrenci: Ogrenci, hedef_tarih: Optional[date] = None) -> Optional[NetTahmini]:
+    """Tek öğrencinin projeksiyonu; denemesi yoksa None."""
+    return net_tahminleri([ogrenci], hedef_tarih).get(ogrenci.ogrenci_id)
+
+
+def tahmin_tablosu(ogrenciler: Sequence[Ogrenci], hedef_tarih: Optional[date] = None) -> pd.DataFrame:
+    """
+    Kurum geneli özet: öğrenci başına toplam net, puan ve sıralama aralıkları.
+    Tablo, öğrenci anahtarlarının demetiyle önbelleğe alınır; hiçbir öğrencinin
+    denemesi değişmediyse yeniden çalıştırmalar tahminlere hiç inmez.
+    """
+    anahtar = tuple(
+        (o.ad, _tahmin_anahtari(o, hedef_tarih or sinav_tarihi(o.sinav_turu)))
+        for o in ogrenciler if o.trend_kayitlari
+    )
+    return _TABLO_ONBELLEGI.getir(anahtar, lambda: _tahmin_tablosu_olustur(ogrenciler, hedef_tarih)).copy()
+
+
+def _tahmin_tablosu_olustur(ogrenciler: Sequence[Ogrenci], hedef_tarih: Optional[date]) -> pd.DataFrame:
+    tahminler = net_tahminleri(ogrenciler, hedef_tarih)
+    satirlar = []
+    for o in ogrenciler:
+        t = tahminler.get(o.ogrenci_id)
+        if t is None:
+            continue
+        satirlar.append({
+            "ogrenci_id": o.ogrenci_id, "ad": o.ad, "sinav_turu": t.sinav_turu,
+            "toplam_net": t.toplam_net, "toplam_net_alt": t.toplam_net_alt, "toplam_net_ust": t.toplam_net_ust,
+            "puan": t.puan, "puan_alt": t.puan_alt, "puan_ust": t.puan_ust,
+            "siralama": t.siralama, "siralama_iyi": t.siralama_iyi, "siralama_kotu": t.siralama_kotu,
+        })
+    return pd.DataFrame(satirlar)
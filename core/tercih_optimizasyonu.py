@@ -0,0 +1,283 @@
+"""
+OmniPDR – core/tercih_optimizasyonu.py
+==========================================
+Beklenen faydayı en büyükleyen tercih listesi (en fazla 24 program).
+
+Model: Yerleştirme tek bir puana göre yapılır; öğrenci listesindeki,
+taban puanını geçtiği en üst tercihe yerleşir. Kabuller iç içedir (zor
+programa giren kolaya da girer), bu yüzden:
+  - Hem daha zor hem daha az istenen bir program asla işe yaramaz
+    → adaylar (kabul olasılığı, fayda) Pareto sınırına indirgenir.
+  - Sınır, kolaydan zora sıralandığında faydası artan bir zincirdir ve
+    seçilen alt zincirin beklenen faydası Σ (u_j − u_önceki) · P_j olur.
+K elemanlı en iyi alt zincir, dinamik programlama ile bulunur; geçişler
+monoton dışbükey zarf (convex hull trick) ile O(K · m) maliyetlidir.
+
+Kullanım:
+    liste = tercih_listesi_olustur(452.0, "SAY", puan_std=11.0)
+    for s in liste.secimler:
+        print(s.sira, s.bolum.universite, s.bolum.bolum, s.yerlesme_olasiligi)
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.turkce import tr_katla
+from core.yerlesme_modeli import (
+    YerlesmeTahmini, normal_yerlesme_tahmini, ogrenci_yerlesme_tahmini,
+)
+from core.yokatlas_verileri import BolumBilgisi, BolumKatalogu
+from models.ogrenci_sinifi import Ogrenci
+
+# ──────────────────────────────────────────────
+# Sabitler
+# ──────────────────────────────────────────────
+MAKS_TERCIH = 24                # ÖSYM tercih listesi üst sınırı
+MIN_OLASILIK = 0.01             # Daha düşük kabul olasılıklı programlar aday sayılmaz
+VARSAYILAN_PUAN_STD = 12.0      # Deneme geçmişi yoksa öğrenci puanı belirsizliği
+FAYDA_OLCEGI = 500.0            # Fayda = taban puan / ölçek × tercih çarpanı
+MIN_IYILESME = 1e-9             # Bir tercih daha eklemek bundan az katkı veriyorsa dur
+
+
+# ──────────────────────────────────────────────
+# Öğrenci tercih ağırlıkları
+# ──────────────────────────────────────────────
+@dataclass
+class TercihAgirliklari:
+    """
+    Öğrencinin kişisel tercihleri: anahtar kelime → fayda çarpanı.
+    Anahtarlar Türkçe duyarsız alt dize olarak eşleşir ("bilgisayar",
+    "istanbul"). Çarpan 0 ise eşleşen programlar listeye hiç alınmaz.
+    """
+    bolumler: Dict[str, float] = field(default_factory=dict)
+    sehirler: Dict[str, float] = field(default_factory=dict)
+    universiteler: Dict[str, float] = field(default_factory=dict)
+    turler: Dict[str, float] = field(default_factory=dict)    # "Devlet" / "Vakıf"
+
+    def carpanlar(self, k: BolumKatalogu) -> np.ndarray:
+        """Katalogdaki her program için toplam çarpan (eşleşen tüm anahtarların çarpımı)."""
+        sonuc = np.ones(len(k))
+        for alan, agirliklar in (
+            ("bolum", self.bolumler), ("sehir", self.sehirler),
+            ("universite", self.universiteler), ("tur", self.turler),
+        ):
+            if not agirliklar:
+                continue
+            anahtarlar = [(tr_katla(a), c) for a, c in agirliklar.items()]
+            degerler, ters = np.unique(k.dizi(alan), return_inverse=True)
+            tekil = np.ones(len(degerler))
+            for j, deger in enumerate(degerler):
+                katli = tr_katla(str(deger))
+                for anahtar, carpan in anahtarlar:
+                    if anahtar in katli:
+                        tekil[j] *= carpan
+            sonuc *= tekil[ters]
+        return sonuc
+
+
+# ──────────────────────────────────────────────
+# Sonuç yapıları
+# ──────────────────────────────────────────────
+@dataclass
+class TercihSecimi:
+    """Listedeki tek bir tercih."""
+    sira: int
+    bolum: BolumBilgisi
+    kabul_olasiligi: float      # P(puan ≥ taban)
+    yerlesme_olasiligi: float   # P(tam olarak bu tercihe yerleşme)
+    fayda: float
+
+
+@dataclass
+class TercihListesi:
+    """Optimize edilmiş tercih listesi (1. tercih en çok istenen)."""
+    secimler: List[TercihSecimi]
+    beklenen_fayda: float
+    toplam_yerlesme_olasiligi: float
+    aday_sayisi: int            # Pareto sınırındaki aday sayısı
+
+    def __len__(self) -> int:
+        return len(self.secimler)
+
+
+# ──────────────────────────────────────────────
+# Pareto sınırı ve zincir DP
+# ──────────────────────────────────────────────
+def _pareto_siniri(olasilik: np.ndarray, fayda: np.ndarray) -> np.ndarray:
+    """
+    Başka bir program tarafından hem olasılıkta hem faydada geçilmeyen adaylar.
+    Dönüş, kolaydan zora (olasılık azalan, fayda kesin artan) sıralı dizinlerdir.
+    """
+    sira = np.lexsort((-fayda, -olasilik))
+    f = fayda[sira]
+    onceki_en_iyi = np.maximum.accumulate(np.concatenate([[-np.inf], f[:-1]]))
+    return sira[f > onceki_en_iyi]
+
+
+def _zincir_sec(olasilik: np.ndarray, fayda: np.ndarray, k_maks: int) -> List[int]:
+    """
+    Zincirden en fazla k_maks eleman seçerek Σ (u_j − u_önceki) · P_j'yi en büyükler.
+    f_k[i] = P_i·u_i + max_{p<i} (f_{k−1}[p] − u_p·P_i): p'ye ait doğrular
+    (eğim −u_p azalan) ve sorgular (P_i azalan) monoton olduğundan her adım
+    tek geçişlik bir dışbükey zarf ile çözülür.
+    """
+    m = len(olasilik)
+    P = olasilik.tolist()
+    u = fayda.tolist()
+    onceki = [P[i] * u[i] for i in range(m)]
+    ebeveynler: List[List[int]] = [[-1] * m]
+    en_iyi_deger = max(onceki)
+    en_iyi = (0, onceki.index(en_iyi_deger))
+
+    for k in range(1, min(k_maks, m)):
+        yeni = [-math.inf] * m
+        ebeveyn = [-1] * m
+        zarf: deque = deque()   # Doğru dizinleri (eğim azalan)
+        for i in range(1, m):
+            p = i - 1
+            if onceki[p] > -math.inf:
+                a3, b3 = -u[p], onceki[p]
+                while len(zarf) >= 2:
+                    l1, l2 = zarf[-2], zarf[-1]
+                    a1, b1, a2, b2 = -u[l1], onceki[l1], -u[l2], onceki[l2]
+                    if (b3 - b2) * (a1 - a2) >= (b2 - b1) * (a2 - a3):
+                        zarf.pop()
+                    else:
+                        break
+                zarf.append(p)
+            if not zarf:
+                continue
+            x = P[i]
+            while len(zarf) >= 2 and onceki[zarf[1]] - u[zarf[1]] * x >= onceki[zarf[0]] - u[zarf[0]] * x:
+                zarf.popleft()
+            q = zarf[0]
+            yeni[i] = P[i] * u[i] + onceki[q] - u[q] * x
+            ebeveyn[i] = q
+
+        adim_en_iyisi = max(yeni)
+        ebeveynler.append(ebeveyn)
+        if adim_en_iyisi <= en_iyi_deger + MIN_IYILESME:
+            break
+        en_iyi_deger = adim_en_iyisi
+        en_iyi = (k, yeni.index(adim_en_iyisi))
+        onceki = yeni
+
+    k, i = en_iyi
+    zincir = []
+    while i >= 0:
+        zincir.append(i)
+        i = ebeveynler[k][i]
+        k -= 1
+    return zincir[::-1]
+
+
+# ──────────────────────────────────────────────
+# Tercih listesi
+# ──────────────────────────────────────────────
+def tercih_listesi_olustur(
+    puan: float,
+    puan_turu: str,
+    puan_std: float = VARSAYILAN_PUAN_STD,
+    agirliklar: Optional[TercihAgirliklari] = None,
+    liste_uzunlugu: int = MAKS_TERCIH,
+    tur: Optional[str] = None,
+    projeksiyon: bool = True,
+) -> TercihListesi:
+    """
+    Puan dağılımı (ortalama, std) verilen öğrenci için en yüksek beklenen
+    faydalı tercih listesini kurar (normal yerleşme modeliyle).
+    """
+    tahmin = normal_yerlesme_tahmini(puan, puan_std, puan_turu, projeksiyon)
+    return tahminden_tercih_listesi(tahmin, agirliklar, liste_uzunlugu, tur)
+
+
+def tahminden_tercih_listesi(
+    tahmin: YerlesmeTahmini,
+    agirliklar: Optional[TercihAgirliklari] = None,
+    liste_uzunlugu: int = MAKS_TERCIH,
+    tur: Optional[str] = None,
+) -> TercihListesi:
+    """
+    Katalog geneli yerleşme olasılıklarından tercih listesi kurar. Liste fayda
+    sırasıyla (1. tercih en çok istenen) döner; her tercih için tam olarak o
+    programa yerleşme olasılığı hesaplanır.
+    """
+    k = tahmin.katalog
+    maske = ~np.isnan(tahmin.olasiliklar)
+    if tur:
+        maske &= k.dizi("tur") == tur
+    dizinler = np.flatnonzero(maske)
+
+    olasilik = tahmin.olasiliklar[dizinler]
+    fayda = k.dizi("taban_puan")[dizinler] / FAYDA_OLCEGI
+    if agirliklar is not None:
+        fayda = fayda * agirliklar.carpanlar(k)[dizinler]
+
+    uygun = (olasilik >= MIN_OLASILIK) & (fayda > 0)
+    dizinler, olasilik, fayda = dizinler[uygun], olasilik[uygun], fayda[uygun]
+    if not len(dizinler):
+        return TercihListesi([], 0.0, 0.0, 0)
+
+    sinir = _pareto_siniri(olasilik, fayda)
+    zincir = sinir[_zincir_sec(olasilik[sinir], fayda[sinir], min(liste_uzunlugu, MAKS_TERCIH))]
+
+    # Zincir kolaydan zora; tercih listesi zordan (en çok istenen) kolaya
+    P = olasilik[zincir]
+    yerlesme = P - np.append(P[1:], 0.0)
+    beklenen = float((fayda[zincir] * yerlesme).sum())
+    secimler = [
+        TercihSecimi(
+            sira=s,
+            bolum=k.bolumler[dizinler[j]],
+            kabul_olasiligi=round(float(olasilik[j]), 4),
+            yerlesme_olasiligi=round(float(y), 4),
+            fayda=round(float(fayda[j]), 4),
+        )
+        for s, (j, y) in enumerate(zip(zincir[::-1], yerlesme[::-1]), start=1)
+    ]
+    return TercihListesi(
+        secimler=secimler,
+        beklenen_fayda=round(beklenen, 4),
+        toplam_yerlesme_olasiligi=round(float(P[0]), 4),
+        aday_sayisi=len(sinir),
+    )
+
+
+def ogrenci_tercih_listesi(
+    ogrenci: Ogrenci,
+    agirliklar: Optional[TercihAgirliklari] = None,
+    liste_uzunlugu: int = MAKS_TERCIH,
+) -> Optional[TercihListesi]:
+    """
+    Öğrencinin simüle edilmiş puan dağılımından (önbellekli yerleşme tahmini)
+    tercih listesi. LGS öğrencileri ve denemesi olmayanlar için None döner.
+    """
+    tahmin = ogrenci_yerlesme_tahmini(ogrenci)
+    if tahmin is None:
+        return None
+    return tahminden_tercih_listesi(tahmin, agirliklar, liste_uzunlugu)
+
+
+def sinif_tercih_listeleri(
+    ogrenciler: Sequence[Ogrenci],
+    agirliklar: Optional[Dict[str, TercihAgirliklari]] = None,
+    liste_uzunlugu: int = MAKS_TERCIH,
+) -> Dict[str, TercihListesi]:
+    """
+    Tercih dönemi toplu çalıştırması: ogrenci_id → tercih listesi.
+    agirliklar: ogrenci_id → kişisel tercih ağırlıkları (verilmeyenler nötr).
+    Katalog ve indeksleri tüm sınıf için bir kez kurulur.
+    """
+    agirliklar = agirliklar or {}
+    sonuclar: Dict[str, TercihListesi] = {}
+    for ogr in ogrenciler:
+        liste = ogrenci_tercih_listesi(ogr, agirliklar.get(ogr.ogrenci_id), liste_uzunlugu)
+        if liste is not None:
+            sonuclar[ogr.ogrenci_id] = liste
+    return sonuclar
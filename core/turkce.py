@@ -0,0 +1,49 @@
+"""
+OmniPDR – core/turkce.py
+============================
+Türkçe metin yardımcıları.
+
+Python'un str.lower() metodu Türkçe'yi bilmez: "I".lower() → "i" (doğrusu "ı"),
+"İ".lower() → "i̇" (birleşik nokta ile). Arama ve eşleştirme için burada
+Türkçe büyük/küçük harf dönüşümü ve aksan duyarsız katlama yapılır.
+"""
+
+from __future__ import annotations
+
+import re
+
+_BUYUK_KUCUK = str.maketrans({"I": "ı", "İ": "i"})
+_AKSANSIZ = str.maketrans({
+    "ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u",
+    "â": "a", "î": "i", "û": "u", "̇": None,  # U+0307: birleşik üst nokta
+})
+_AYIRICI = re.compile(r"[^0-9a-z]+")
+
+
+def tr_kucuk(metin: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir ("IŞIK" → "ışık", "İZMİR" → "izmir")."""
+    return metin.translate(_BUYUK_KUCUK).lower()
+
+
+def tr_katla(metin: str) -> str:
+    """
+    Arama anahtarı: Türkçe küçük harf + aksansız + noktalama yerine tek boşluk.
+    "Boğaziçi Üniversitesi" → "bogazici universitesi", "İTÜ" → "itu"
+    """
+    return _AYIRICI.sub(" ", tr_kucuk(metin).translate(_AKSANSIZ)).strip()
+
+
+# Türk alfabesi sırası (q, w, x Latin konumlarında); harf dışı karakterler önde kalır
+_ALFABE = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+_SIRALAMA = str.maketrans({
+    **{h: chr(0x2000 + i) for i, h in enumerate(_ALFABE)},
+    "â": chr(0x2000), "î": chr(0x2000 + _ALFABE.index("i")), "û": chr(0x2000 + _ALFABE.index("u")),
+})
+
+
+def tr_siralama_anahtari(metin: str) -> tuple:
+    """
+    Türkçe alfabetik sıralama anahtarı: sorted(liste, key=tr_siralama_anahtari).
+    "Çanakkale" C'den sonra, "İzmir" I/ı'dan sonra gelir; büyük/küçük harf eşit sayılır.
+    """
+    return tr_kucuk(metin).translate(_SIRALAMA), metin
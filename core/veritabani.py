@@ -12,9 +12,13 @@ from __future__ import annotations
 
 import json
 import os
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
+from core.anomali import anomalileri_isaretle
+from core.puan_gecmisi import puan_gecmisini_guncelle
+from core.puan_hesaplama import PUAN_TABLOSU_SURUMU
 from models.ogrenci_sinifi import Ogrenci
 
 
@@ -33,11 +37,17 @@ class OgrenciRepository:
         repo.kaydet(ogrenci)
         ogr = repo.getir_id_ile("abc123")
         hepsi = repo.hepsini_getir()
+
+    yaz=False: Salt okunur yükleme (arka plan taraması, komut satırı
+    raporları). Dosya hiç yazılmaz; puan tabloları değiştiyse geçmiş
+    yalnızca bellekte yenilenir. Kaydetme çağrıları hata verir.
     """
 
-    def __init__(self, dosya_yolu: Path = _VARSAYILAN_YOL):
-        self.dosya_yolu = dosya_yolu
+    def __init__(self, dosya_yolu: Path = _VARSAYILAN_YOL, yaz: bool = True):
+        self.dosya_yolu = Path(dosya_yolu)
+        self.yaz = yaz
         self._bellek: Dict[str, Ogrenci] = {}  # id → Ogrenci
+        self._taranan_surum: Dict[str, int] = {}  # id → anomali taramasındaki veri_surumu
         self._yukle()
 
     # ── Dahili I/O ─────────────────────────────
@@ -45,8 +55,9 @@ class OgrenciRepository:
     def _yukle(self) -> None:
         """JSON dosyasından tüm öğrencileri belleğe yükler."""
         if not self.dosya_yolu.exists():
-            self.dosya_yolu.parent.mkdir(parents=True, exist_ok=True)
-            self._kaydet_dosya()
+            if self.yaz:
+                self.dosya_yolu.parent.mkdir(parents=True, exist_ok=True)
+                self._kaydet_dosya()
             return
 
         with open(self.dosya_yolu, "r", encoding="utf-8") as f:
@@ -56,19 +67,67 @@ class OgrenciRepository:
             ogr = Ogrenci.from_dict(ogr_dict)
             self._bellek[ogr.ogrenci_id] = ogr
 
+        # Puan geçmişi dosya yazılırken güncel tutulur (kaydet/toplu_kaydet);
+        # yalnızca puan tabloları değiştiyse bir kez yeniden hesaplanıp yazılır.
+        if ham.get("puan_tablosu_surumu") != PUAN_TABLOSU_SURUMU:
+            for ogr in self._bellek.values():
+                puan_gecmisini_guncelle(ogr)
+            if self.yaz:
+                self._kaydet_dosya()
+
     def _kaydet_dosya(self) -> None:
-        """Belleği JSON dosyasına yazar (atomic write ile veri kaybı önlenir)."""
-        veri = {"ogrenciler": [ogr.to_dict() for ogr in self._bellek.values()]}
-        tmp_yol = self.dosya_yolu.with_suffix(".tmp")
-        with open(tmp_yol, "w", encoding="utf-8") as f:
+        """
+        Belleği JSON dosyasına yazar (atomic write ile veri kaybı önlenir).
+        Geçici dosya yazar başına tekildir; eşzamanlı iki yazım birbirinin
+        yarım dosyasını taşımaz.
+        """
+        if not self.yaz:
+            raise PermissionError(f"Salt okunur depo: {self.dosya_yolu}")
+        veri = {
+            "puan_tablosu_surumu": PUAN_TABLOSU_SURUMU,
+            "ogrenciler": [ogr.to_dict() for ogr in self._bellek.values()],
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.dosya_yolu.parent,
+            prefix=f".{self.dosya_yolu.stem}.", suffix=".tmp", delete=False,
+        ) as f:
             json.dump(veri, f, ensure_ascii=False, indent=2)
-        os.replace(tmp_yol, self.dosya_yolu)  # Atomic rename
+        try:
+            os.replace(f.name, self.dosya_yolu)  # Atomic rename
+        except OSError:
+            Path(f.name).unlink(missing_ok=True)
+            raise
 
     # ── Genel CRUD operasyonları ───────────────
 
+    def _anomalileri_tara(self, hedefler: Sequence[Ogrenci]) -> None:
+        """Denemeleri değişen öğrencilerde şüpheli kayıtları (kurum kohortuna göre) işaretler."""
+        degisen = [o for o in hedefler if self._taranan_surum.get(o.ogrenci_id) != o.veri_surumu]
+        if not degisen:
+            return
+        anomalileri_isaretle(self.hepsini_getir(), degisen)
+        for o in degisen:
+            self._taranan_surum[o.ogrenci_id] = o.veri_surumu
+
     def kaydet(self, ogrenci: Ogrenci) -> None:
-        """Yeni veya mevcut öğrenciyi kaydeder/günceller."""
+        """
+        Yeni veya mevcut öğrenciyi kaydeder/günceller (puan geçmişi ve
+        deneme anomali işaretleri de güncellenir).
+        """
+        puan_gecmisini_guncelle(ogrenci)
         self._bellek[ogrenci.ogrenci_id] = ogrenci
+        self._anomalileri_tara([ogrenci])
+        self._kaydet_dosya()
+
+    def toplu_kaydet(self, ogrenciler: Sequence[Ogrenci]) -> None:
+        """
+        Toplu içe aktarma: tüm öğrencileri ekler, anomali taramasını kurum
+        geneli tek seferde çalıştırır ve dosyayı bir kez yazar.
+        """
+        for o in ogrenciler:
+            puan_gecmisini_guncelle(o)
+            self._bellek[o.ogrenci_id] = o
+        self._anomalileri_tara(ogrenciler)
         self._kaydet_dosya()
 
     def getir_id_ile(self, ogrenci_id: str) -> Optional[Ogrenci]:
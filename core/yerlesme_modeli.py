@@ -0,0 +1,191 @@
+"""
+OmniPDR – core/yerlesme_modeli.py
+=====================================
+Tüm katalog için vektörel yerleşme olasılığı modeli.
+
+Bir öğrencinin puan dağılımı verildiğinde, aynı puan türündeki her program
+için P(sınav puanı ≥ taban puan) tek geçişte, katalog dizileri üzerinde
+hesaplanır; BolumBilgisi nesneleri üzerinde döngü kurulmaz.
+
+İki yol vardır:
+  - Normal model: puan ~ N(μ, σ) ve taban puanı ~ N(taban, KESME_BELIRSIZLIGI).
+  - Örnek (ECDF) modeli: Monte Carlo puan örnekleri sıralanır, her taban
+    için searchsorted ile örneklerin ne kadarının tabanı geçtiği bulunur.
+Öğrenci bazlı sonuçlar, deneme geçmişi ve katalog sürümüyle anahtarlanan
+LRU önbellekte tutulur.
+
+Kullanım:
+    tahmin = ogrenci_yerlesme_tahmini(ogrenci)
+    tahmin.olasilik(bolum), tahmin.kategori(bolum), tahmin.ozet()
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.onbellek import LRUOnbellek
+from core.simulasyon import puan_dagilimi_simule
+from core.yokatlas_verileri import BolumBilgisi, BolumKatalogu, katalog, oneri_katalogu
+from models.ogrenci_sinifi import Ogrenci
+
+# ──────────────────────────────────────────────
+# Sabitler
+# ──────────────────────────────────────────────
+KESME_BELIRSIZLIGI = 5.0        # Taban puanın yıldan yıla oynaması (puan, std)
+GUVENLI_ESIGI = 0.80            # P ≥ 0.80 → güvenli
+DENGELI_ESIGI = 0.40            # 0.40 ≤ P < 0.80 → dengeli
+SANS_ESIGI = 0.10               # 0.10 ≤ P < 0.40 → şans; altı "uzak"
+VARSAYILAN_ORNEK_SAYISI = 4000
+
+KATEGORILER = ("guvenli", "dengeli", "sans", "uzak")
+
+_YERLESME_ONBELLEGI = LRUOnbellek("yerlesme", kapasite=256)
+
+
+# ──────────────────────────────────────────────
+# Olasılık hesapları (saf numpy)
+# ──────────────────────────────────────────────
+def normal_kdf(z: np.ndarray) -> np.ndarray:
+    """Standart normal birikimli dağılım (Abramowitz–Stegun 7.1.26, hata < 1.5e-7)."""
+    x = np.abs(z) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    polinom = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - polinom * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def kabul_olasiliklari(puan: float, puan_std: float, tabanlar: np.ndarray) -> np.ndarray:
+    """P(sınav puanı ≥ taban): öğrenci puanı ve taban puanı bağımsız normal kabul edilir."""
+    sigma = math.sqrt(puan_std ** 2 + KESME_BELIRSIZLIGI ** 2)
+    return normal_kdf((puan - np.asarray(tabanlar, dtype=np.float64)) / sigma)
+
+
+def ampirik_kabul_olasiliklari(
+    puan_ornekleri: np.ndarray,
+    tabanlar: np.ndarray,
+    tohum=0,
+) -> np.ndarray:
+    """
+    P(örnek puan ≥ taban) — örneklere taban belirsizliği kadar gürültü eklenip
+    sıralanır, her taban için searchsorted ile sayılır: O((n + m) log n).
+    """
+    rng = np.random.default_rng(tohum)
+    ornekler = np.sort(puan_ornekleri + rng.normal(0.0, KESME_BELIRSIZLIGI, size=len(puan_ornekleri)))
+    gecmeyen = np.searchsorted(ornekler, np.asarray(tabanlar, dtype=np.float64), side="left")
+    return 1.0 - gecmeyen / len(ornekler)
+
+
+# ──────────────────────────────────────────────
+# Sonuç yapısı
+# ──────────────────────────────────────────────
+@dataclass
+class YerlesmeTahmini:
+    """Bir puan türündeki tüm programlar için yerleşme olasılıkları."""
+    puan_turu: str
+    katalog: BolumKatalogu = field(repr=False)
+    olasiliklar: np.ndarray = field(repr=False)   # Katalog uzunluğunda; diğer puan türleri NaN
+
+    def olasilik(self, bolum: BolumBilgisi) -> Optional[float]:
+        i = self.katalog.kimlik_dizini(bolum)
+        if i is None or np.isnan(self.olasiliklar[i]):
+            return None
+        return float(self.olasiliklar[i])
+
+    def kategori(self, bolum: BolumBilgisi) -> Optional[str]:
+        p = self.olasilik(bolum)
+        if p is None:
+            return None
+        if p >= GUVENLI_ESIGI:
+            return "guvenli"
+        if p >= DENGELI_ESIGI:
+            return "dengeli"
+        return "sans" if p >= SANS_ESIGI else "uzak"
+
+    def kategoriler(self) -> np.ndarray:
+        """Her program için kategori adı (diğer puan türleri boş dize)."""
+        p = self.olasiliklar
+        return np.select(
+            [np.isnan(p), p >= GUVENLI_ESIGI, p >= DENGELI_ESIGI, p >= SANS_ESIGI],
+            ["", "guvenli", "dengeli", "sans"], default="uzak",
+        )
+
+    def ozet(self) -> Dict[str, int]:
+        """Kategori başına program sayısı."""
+        kategoriler = self.kategoriler()
+        return {k: int((kategoriler == k).sum()) for k in KATEGORILER}
+
+
+def _tahmin_olustur(k: BolumKatalogu, puan_turu: str, hesapla) -> YerlesmeTahmini:
+    olasiliklar = np.full(len(k), np.nan)
+    maske = k.puan_turu_maskesi(puan_turu)
+    olasiliklar[maske] = hesapla(k.dizi("taban_puan")[maske])
+    return YerlesmeTahmini(puan_turu, k, olasiliklar)
+
+
+def normal_yerlesme_tahmini(
+    puan: float,
+    puan_std: float,
+    puan_turu: str,
+    projeksiyon: bool = True,
+) -> YerlesmeTahmini:
+    """Puan ~ N(puan, puan_std) için tüm programların yerleşme olasılıkları."""
+    k = oneri_katalogu() if projeksiyon else katalog()
+    return _tahmin_olustur(k, puan_turu, lambda t: kabul_olasiliklari(puan, puan_std, t))
+
+
+def ornek_yerlesme_tahmini(
+    puan_ornekleri: np.ndarray,
+    puan_turu: str,
+    projeksiyon: bool = True,
+    tohum=0,
+) -> YerlesmeTahmini:
+    """Monte Carlo puan örneklerinin ampirik dağılımıyla yerleşme olasılıkları."""
+    k = oneri_katalogu() if projeksiyon else katalog()
+    return _tahmin_olustur(k, puan_turu, lambda t: ampirik_kabul_olasiliklari(puan_ornekleri, t, tohum))
+
+
+# ──────────────────────────────────────────────
+# Öğrenci bazlı, önbellekli tahmin
+# ──────────────────────────────────────────────
+def _ogrenci_durumu(ogrenci: Ogrenci) -> str:
+    """Olasılıkları etkileyen öğrenci verilerinin özeti (trend denemelerinin netleri, OBP, puan türü)."""
+    ham = json.dumps(
+        [ogrenci.sinav_turu, ogrenci.hedef_puan_turu, ogrenci.obp, [k.netleri for k in ogrenci.trend_kayitlari]],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.blake2b(ham.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def ogrenci_yerlesme_tahmini(
+    ogrenci: Ogrenci,
+    ornek_sayisi: int = VARSAYILAN_ORNEK_SAYISI,
+    projeksiyon: bool = True,
+) -> Optional[YerlesmeTahmini]:
+    """
+    Öğrencinin simüle edilmiş puan dağılımıyla tüm katalog için yerleşme olasılıkları.
+    Aynı deneme geçmişi ve katalog için sonuç önbellekten döner (tohum durumdan
+    türetildiğinden sonuç da kararlıdır). YKS dışı veya denemesiz öğrencide None.
+    """
+    if ogrenci.sinav_turu != "YKS" or not ogrenci.trend_kayitlari:
+        return None
+    k = oneri_katalogu() if projeksiyon else katalog()
+    durum = _ogrenci_durumu(ogrenci)
+
+    def _hesapla() -> Optional[YerlesmeTahmini]:
+        # Simülasyon ve taban gürültüsü bağımsız akışlardan çekilmeli
+        simulasyon_tohumu, gurultu_tohumu = np.random.SeedSequence(int(durum, 16)).spawn(2)
+        dagilim = puan_dagilimi_simule(ogrenci, ornek_sayisi, tohum=simulasyon_tohumu, ornekleri_sakla=True)
+        if dagilim is None:
+            return None
+        return _tahmin_olustur(
+            k, ogrenci.hedef_puan_turu,
+            lambda t: ampirik_kabul_olasiliklari(dagilim.puanlar, t, gurultu_tohumu),
+        )
+
+    return _YERLESME_ONBELLEGI.getir((ogrenci.ogrenci_id, durum, k.surum, ornek_sayisi), _hesapla)
@@ -6,14 +6,34 @@ YÖK Atlas statik veri seti.
 En popüler ~80 üniversite bölümünün 2024 YKS taban puanları,
 başarı sıralamaları ve kontenjan bilgileri.
 
+Tam katalog (≈20.000 program, birden çok yıl) data/yokatlas_katalog.csv|json
+dosyasından veya OMNIPDR_KATALOG ile verilen yoldan yüklenir; dosya yoksa
+aşağıdaki gömülü liste kullanılır. Etkin yıl OMNIPDR_KATALOG_YILI ile seçilir.
+Birden çok yıl yüklendiğinde öneriler, gelecek yıl için tahmin edilen taban
+puan ve sıralamalara göre yapılır (bkz. core/taban_gecmisi.py).
+
 Not: Veriler yaklaşık değerlerdir ve bilgi amaçlıdır.
 Resmi güncel veriler için: https://yokatlas.yok.gov.tr
 """
 
 from __future__ import annotations
 
+import itertools
+import math
+import os
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.arama_indeksi import AramaIndeksi
+from core.faset_indeksi import FasetIndeksi, Filtre
+from core.katalog_yukleyici import Alan, Sema, tablo_yukle
+from core.sirali_indeks import SiraliIndeks, filtre_gruplari, sehir_eslesmeleri
+from core.taban_gecmisi import TabanGecmisi, program_kimligi
+from core.turkce import tr_katla
 
 
 @dataclass
@@ -28,6 +48,8 @@ class BolumBilgisi:
     siralama: int           # 2024 başarı sıralaması
     kontenjan: int          # Toplam kontenjan
     tur: str = "Devlet"     # Devlet / Vakıf
+    yil: int = 2024         # Verinin ait olduğu YKS yılı
+    program_kodu: str = ""  # ÖSYM program kodu (veri dosyasından yüklenince dolu)
 
 
 # ──────────────────────────────────────────────
@@ -133,6 +155,263 @@ BOLUM_VERILERI: List[BolumBilgisi] = [
 ]
 
 
+# ──────────────────────────────────────────────
+# İndeksli Katalog
+# ──────────────────────────────────────────────
+_Anahtar = Tuple[Optional[str], Optional[str], Optional[str]]  # (puan_turu, sehir, tur); None = hepsi
+# Metin aramasında alan ağırlıkları: bölüm adı > üniversite > şehir
+ARAMA_ALAN_AGIRLIKLARI = (1.0, 0.8, 0.6)
+FASET_ALANLARI = ("sehir", "universite", "bolum", "puan_turu", "tur")
+
+
+class BolumKatalogu:
+    """
+    Bölüm listesi üzerine yükleme anında bir kez kurulan indeksler.
+
+    Her (puan türü, şehir, tür) bileşimi (None = filtre yok) için taban puana
+    ve başarı sıralamasına göre sıralı dizin listeleri tutulur (bkz.
+    core/sirali_indeks.py); aralık sorguları O(log n + k) maliyetlidir.
+
+    Kullanım:
+        katalog = BolumKatalogu(BOLUM_VERILERI)
+        katalog.taban_araligi("SAY", 450, 480)
+    """
+
+    _sayac = itertools.count(1)
+
+    def __init__(self, bolumler: Sequence[BolumBilgisi]):
+        self.bolumler: List[BolumBilgisi] = list(bolumler)
+        # Süreç içinde tekil: bu kataloğa bağlı önbellek anahtarlarında kullanılır
+        self.surum: int = next(BolumKatalogu._sayac)
+        self._kimlik_dizinleri: Optional[Dict[str, int]] = None
+        self.sehirler: List[str] = sorted({b.sehir for b in self.bolumler})
+        self._arama_indeksi: Optional[AramaIndeksi] = None
+        self._faset_indeksi: Optional[FasetIndeksi] = None
+        self._diziler: Dict[str, np.ndarray] = {}
+        puan_turleri = self.dizi("puan_turu")
+        self._puan_turu_maskeleri = {pt: puan_turleri == pt for pt in set(puan_turleri.tolist())}
+
+        gruplar = filtre_gruplari([(b.puan_turu, b.sehir, b.tur) for b in self.bolumler])
+        # Eşit taban puanlarında azalan sırada özgün liste sırası korunsun diye esitlikte_ters
+        self._taban = SiraliIndeks(gruplar, [b.taban_puan for b in self.bolumler], esitlikte_ters=True)
+        self._siralama = SiraliIndeks(gruplar, [b.siralama for b in self.bolumler])
+
+    def __len__(self) -> int:
+        return len(self.bolumler)
+
+    def _anahtarlar(self, puan_turu: Optional[str], sehir: Optional[str], tur: Optional[str]) -> List[_Anahtar]:
+        return [(puan_turu, s, tur) for s in sehir_eslesmeleri(self.sehirler, sehir)]
+
+    def taban_araligi(
+        self,
+        puan_turu: Optional[str] = None,
+        min_puan: Optional[float] = None,
+        max_puan: Optional[float] = None,
+        sehir: Optional[str] = None,
+        tur: Optional[str] = None,
+        min_dahil: bool = True,
+    ) -> List[int]:
+        """Taban puanı aralıktaki bölümlerin dizinleri, artan taban puan sırasıyla."""
+        return self._taban.aralik(self._anahtarlar(puan_turu, sehir, tur), min_puan, max_puan, min_dahil)
+
+    def siralama_araligi(
+        self,
+        puan_turu: Optional[str] = None,
+        min_siralama: Optional[int] = None,
+        max_siralama: Optional[int] = None,
+        sehir: Optional[str] = None,
+        tur: Optional[str] = None,
+    ) -> List[int]:
+        """Başarı sırası [min, max] aralığındaki bölümlerin dizinleri, artan sıra ile."""
+        return self._siralama.aralik(self._anahtarlar(puan_turu, sehir, tur), min_siralama, max_siralama)
+
+    def getir(self, dizinler: Sequence[int]) -> List[BolumBilgisi]:
+        return [self.bolumler[i] for i in dizinler]
+
+    def dizi(self, alan: str) -> np.ndarray:
+        """Bir BolumBilgisi alanının katalog sırasıyla numpy dizisi (ilk istekte kurulur)."""
+        if alan not in self._diziler:
+            self._diziler[alan] = np.array([getattr(b, alan) for b in self.bolumler])
+        return self._diziler[alan]
+
+    def kimlik_dizini(self, bolum: BolumBilgisi) -> Optional[int]:
+        """Bölümün bu katalogdaki dizini (program kimliğiyle; başka yılın kaydı da eşleşir)."""
+        if self._kimlik_dizinleri is None:
+            self._kimlik_dizinleri = {program_kimligi(b): i for i, b in enumerate(self.bolumler)}
+        return self._kimlik_dizinleri.get(program_kimligi(bolum))
+
+    def puan_turu_maskesi(self, puan_turu: Optional[str]) -> Optional[np.ndarray]:
+        """Puan türündeki bölümler için boolean maske; puan_turu boşsa None (filtre yok)."""
+        if not puan_turu:
+            return None
+        return self._puan_turu_maskeleri.get(puan_turu, np.zeros(len(self.bolumler), dtype=bool))
+
+    @property
+    def arama_indeksi(self) -> AramaIndeksi:
+        """Bölüm/üniversite/şehir metin indeksi (ilk aramada bir kez kurulur)."""
+        if self._arama_indeksi is None:
+            self._arama_indeksi = AramaIndeksi(
+                [(b.bolum, b.universite, b.sehir) for b in self.bolumler], ARAMA_ALAN_AGIRLIKLARI,
+            )
+        return self._arama_indeksi
+
+    @property
+    def faset_indeksi(self) -> FasetIndeksi:
+        """Şehir/üniversite/bölüm/puan türü/tür faset indeksi (ilk istekte bir kez kurulur)."""
+        if self._faset_indeksi is None:
+            self._faset_indeksi = FasetIndeksi({alan: self.dizi(alan).tolist() for alan in FASET_ALANLARI})
+        return self._faset_indeksi
+
+    def metin_ara(
+        self,
+        sorgu: str,
+        puan_turu: Optional[str] = None,
+        limit: Optional[int] = 20,
+    ) -> List[int]:
+        """Bulanık metin araması; en iyi eşleşen bölümlerin dizinleri (eşitlikte yüksek taban önce)."""
+        indeks = self.arama_indeksi
+        maske = self.puan_turu_maskesi(puan_turu)
+        return [i for i, _ in indeks.ara(sorgu, limit, maske=maske, oncelik=self.dizi("taban_puan"))]
+
+
+# ──────────────────────────────────────────────
+# Veri Dosyasından Yükleme
+# ──────────────────────────────────────────────
+PUAN_TURLERI = frozenset({"SAY", "EA", "SOZ", "TYT", "YDT"})
+KATALOG_YOLU_ORTAM = "OMNIPDR_KATALOG"        # Katalog dosyası yolu (CSV/JSON)
+KATALOG_YILI_ORTAM = "OMNIPDR_KATALOG_YILI"   # Etkin yıl; verilmezse en güncel yıl
+_VERI_DIZINI = Path(__file__).parent.parent / "data"
+_VARSAYILAN_KATALOG_YOLLARI = (_VERI_DIZINI / "yokatlas_katalog.csv", _VERI_DIZINI / "yokatlas_katalog.json")
+
+
+def _bolum_kontrol(d: Dict[str, object]) -> Optional[str]:
+    if d["tavan_puan"] < d["taban_puan"]:
+        return "tavan puan taban puandan küçük"
+    if d["siralama"] <= 0:
+        return "başarı sıralaması pozitif olmalı"
+    if d["kontenjan"] < 0:
+        return "kontenjan negatif olamaz"
+    return None
+
+
+# Sütun sırası BolumBilgisi alan sırasıyla aynıdır: BolumBilgisi(*satir)
+BOLUM_SEMASI = Sema(
+    ad="yokatlas",
+    alanlar=(
+        Alan("universite", str),
+        Alan("bolum", str),
+        Alan("sehir", str),
+        Alan("puan_turu", str, izinli=PUAN_TURLERI),
+        Alan("taban_puan", float),
+        Alan("tavan_puan", float),
+        Alan("siralama", int),
+        Alan("kontenjan", int),
+        Alan("tur", str, zorunlu=False, varsayilan="Devlet"),
+        Alan("yil", int, zorunlu=False, varsayilan=2024),
+        Alan("program_kodu", str, zorunlu=False, varsayilan=""),
+    ),
+    kontrol=_bolum_kontrol,
+)
+
+_YILLIK_BOLUMLER: Dict[int, List[BolumBilgisi]] = {}
+_YILLIK_KATALOGLAR: Dict[int, BolumKatalogu] = {}
+_KATALOG: Optional[BolumKatalogu] = None
+_GECMIS: Optional[TabanGecmisi] = None
+_PROJEKSIYON_KATALOGU: Optional[BolumKatalogu] = None
+
+
+def katalog_dosyadan_yukle(yol: Path) -> Dict[int, List[BolumBilgisi]]:
+    """
+    Katalog dosyasındaki tüm yılları yükler ve yıl → bölüm listesi döndürür.
+    Geçersiz satırlar atlanır (bkz. katalog_yukleyici.tablo_yukle).
+    """
+    sonuc = tablo_yukle(Path(yol), BOLUM_SEMASI)
+    yillik: Dict[int, List[BolumBilgisi]] = defaultdict(list)
+    for satir in sonuc.satirlar:
+        b = BolumBilgisi(*satir)
+        yillik[b.yil].append(b)
+    return dict(yillik)
+
+
+def katalog_yukle(yol: Optional[Path] = None, yil: Optional[int] = None) -> BolumKatalogu:
+    """
+    Katalog dosyasını yükleyip etkin katalog yapar.
+    yol verilmezse OMNIPDR_KATALOG ortam değişkeni, o da yoksa data/yokatlas_katalog.csv|json
+    denenir; hiçbiri yoksa koddaki BOLUM_VERILERI kullanılır.
+    """
+    global _KATALOG, _GECMIS, _PROJEKSIYON_KATALOGU
+    if yol is None:
+        ortam = os.environ.get(KATALOG_YOLU_ORTAM)
+        yol = Path(ortam) if ortam else next((p for p in _VARSAYILAN_KATALOG_YOLLARI if p.exists()), None)
+
+    yillik = katalog_dosyadan_yukle(yol) if yol is not None else {BOLUM_VERILERI[0].yil: BOLUM_VERILERI}
+    _YILLIK_BOLUMLER.clear()
+    _YILLIK_BOLUMLER.update(yillik)
+    _YILLIK_KATALOGLAR.clear()
+    # Tahminler yükleme anında tüm programlar için tek geçişte hesaplanır
+    _GECMIS = TabanGecmisi.kur(_YILLIK_BOLUMLER)
+    _PROJEKSIYON_KATALOGU = None
+
+    if yil is None and os.environ.get(KATALOG_YILI_ORTAM):
+        yil = int(os.environ[KATALOG_YILI_ORTAM])
+    _KATALOG = katalog_yili_sec(yil if yil is not None else max(_YILLIK_BOLUMLER))
+    return _KATALOG
+
+
+def katalog_yili_sec(yil: int) -> BolumKatalogu:
+    """Yüklenmiş yıllardan birini etkin katalog yapar (indeksler yıl başına bir kez kurulur)."""
+    global _KATALOG
+    if yil not in _YILLIK_BOLUMLER:
+        raise KeyError(f"{yil} yılı katalogda yok. Mevcut yıllar: {katalog_yillari()}")
+    if yil not in _YILLIK_KATALOGLAR:
+        _YILLIK_KATALOGLAR[yil] = BolumKatalogu(_YILLIK_BOLUMLER[yil])
+    _KATALOG = _YILLIK_KATALOGLAR[yil]
+    return _KATALOG
+
+
+def katalog_yillari() -> List[int]:
+    """Yüklenmiş katalog yılları (yeniden eskiye)."""
+    if _KATALOG is None:
+        katalog_yukle()
+    return sorted(_YILLIK_BOLUMLER, reverse=True)
+
+
+def katalog() -> BolumKatalogu:
+    """Uygulamanın kullandığı etkin bölüm kataloğunu döndürür (ilk çağrıda yüklenir)."""
+    if _KATALOG is None:
+        katalog_yukle()
+    return _KATALOG
+
+
+def taban_gecmisi() -> TabanGecmisi:
+    """Yüklenmiş tüm yılların program bazlı geçmişi ve gelecek yıl tahminleri."""
+    if _GECMIS is None:
+        katalog_yukle()
+    return _GECMIS
+
+
+def projeksiyon_yili() -> Optional[int]:
+    """Öneriler tahmini değerlerle yapılıyorsa tahmin yılı, aksi halde None."""
+    gecmis = taban_gecmisi()
+    return gecmis.projeksiyon_yili if gecmis.cok_yillik else None
+
+
+def oneri_katalogu() -> BolumKatalogu:
+    """
+    Önerilerde kullanılacak katalog: çok yıllı veri varken ve etkin yıl en
+    güncel yılsa gelecek yıl tahminleri, aksi halde etkin katalog.
+    """
+    global _PROJEKSIYON_KATALOGU
+    k = katalog()
+    gecmis = taban_gecmisi()
+    son_yil = int(gecmis.yillar[-1])
+    if not gecmis.cok_yillik or k is not _YILLIK_KATALOGLAR.get(son_yil):
+        return k
+    if _PROJEKSIYON_KATALOGU is None:
+        _PROJEKSIYON_KATALOGU = BolumKatalogu(gecmis.projeksiyonlu(_YILLIK_BOLUMLER[son_yil]))
+    return _PROJEKSIYON_KATALOGU
+
+
 # ──────────────────────────────────────────────
 # Arama ve Filtreleme Fonksiyonları
 # ──────────────────────────────────────────────
@@ -144,57 +423,104 @@ def bolum_ara(
     bolum_adi: Optional[str] = None,
     tur: Optional[str] = None,
 ) -> List[BolumBilgisi]:
-    """Kriterlere göre bölüm arar."""
-    sonuclar = BOLUM_VERILERI.copy()
-
-    if puan_turu:
-        sonuclar = [b for b in sonuclar if b.puan_turu == puan_turu]
-    if min_puan is not None:
-        sonuclar = [b for b in sonuclar if b.taban_puan >= min_puan]
-    if max_puan is not None:
-        sonuclar = [b for b in sonuclar if b.taban_puan <= max_puan]
-    if sehir:
-        sonuclar = [b for b in sonuclar if sehir.lower() in b.sehir.lower()]
+    """Kriterlere göre bölüm arar (taban puana göre azalan)."""
+    k = katalog()
+    dizinler = k.taban_araligi(puan_turu or None, min_puan, max_puan, sehir, tur or None)
+    sonuclar = k.getir(reversed(dizinler))
     if bolum_adi:
-        sonuclar = [b for b in sonuclar if bolum_adi.lower() in b.bolum.lower()]
-    if tur:
-        sonuclar = [b for b in sonuclar if b.tur == tur]
+        aranan = tr_katla(bolum_adi)
+        sonuclar = [b for b in sonuclar if aranan in tr_katla(b.bolum)]
+    return sonuclar
 
-    return sorted(sonuclar, key=lambda b: b.taban_puan, reverse=True)
+
+def bolum_ara_bulanik(
+    sorgu: str,
+    puan_turu: Optional[str] = None,
+    limit: Optional[int] = 20,
+) -> List[BolumBilgisi]:
+    """
+    Bölüm, üniversite ve şehir adlarında Türkçe duyarlı, yazım hatasına
+    toleranslı arama ("bilgisyar odtu", "istanbul tip"). En iyi eşleşme önce.
+    """
+    k = katalog()
+    return k.getir(k.metin_ara(sorgu, puan_turu or None, limit))
 
 
 def universite_oner(
     puan: float,
     puan_turu: str,
     tolerans: float = 20.0,
+    limit: int = 8,
+    projeksiyon: bool = True,
 ) -> Dict[str, List[BolumBilgisi]]:
     """
     Puana göre üniversite önerileri.
     3 kategori: Güvenli, Dengeli, Şans
+    projeksiyon=True ise (varsa) gelecek yıl tahmini taban puanları kullanılır.
     """
-    tum = bolum_ara(puan_turu=puan_turu)
+    k = oneri_katalogu() if projeksiyon else katalog()
+    guvenli = k.taban_araligi(puan_turu, max_puan=puan - tolerans / 2)[-limit:]
+    dengeli = k.taban_araligi(puan_turu, puan - tolerans / 2, puan + tolerans / 2)[-limit:]
+    sans = k.taban_araligi(puan_turu, puan, puan + tolerans, min_dahil=False)[-limit:]
 
-    guvenli = [b for b in tum if b.taban_puan <= puan - tolerans / 2][:8]
-    dengeli = [b for b in tum if abs(b.taban_puan - puan) <= tolerans / 2][:8]
-    sans = [b for b in tum if puan < b.taban_puan <= puan + tolerans][:8]
+    return {
+        "guvenli": k.getir(reversed(guvenli)),
+        "dengeli": k.getir(reversed(dengeli)),
+        "sans": sorted(k.getir(reversed(sans)), key=lambda b: b.taban_puan),
+    }
+
+
+def universite_oner_siralama(
+    hedef_siralama: int,
+    puan_turu: str,
+    sehir: Optional[str] = None,
+    tur: Optional[str] = None,
+    guvenli_bandi: float = 0.2,
+    sans_bandi: float = 0.2,
+    limit: int = 8,
+    projeksiyon: bool = True,
+) -> Dict[str, List[BolumBilgisi]]:
+    """
+    Hedef başarı sıralamasına göre üniversite önerileri.
+    Dengeli: sıralaması [hedef·(1−sans_bandi), hedef·(1+guvenli_bandi)] aralığında,
+    Güvenli: hedef·(1+guvenli_bandi) ve daha geride (daha kolay),
+    Şans:    hedef·(1−sans_bandi) altında (daha zor).
+    Her liste hedefe en yakın bölümlerle başlar; sıralama indeksinde bisect
+    pencereleriyle O(log n + k) maliyetlidir, toplu işlerde de kullanılabilir.
+    projeksiyon=True ise (varsa) gelecek yıl tahmini sıralamaları kullanılır.
+    """
+    k = oneri_katalogu() if projeksiyon else katalog()
+    alt = math.ceil(hedef_siralama * (1 - sans_bandi))
+    ust = math.floor(hedef_siralama * (1 + guvenli_bandi))
+    guvenli = k.siralama_araligi(puan_turu, min_siralama=max(alt, ust + 1), sehir=sehir, tur=tur)[:limit]
+    dengeli = k.siralama_araligi(puan_turu, alt, ust, sehir=sehir, tur=tur)[:limit]
+    sans = k.siralama_araligi(puan_turu, max_siralama=alt - 1, sehir=sehir, tur=tur)[-limit:]
 
     return {
-        "guvenli": sorted(guvenli, key=lambda b: b.taban_puan, reverse=True),
-        "dengeli": sorted(dengeli, key=lambda b: b.taban_puan, reverse=True),
-        "sans": sorted(sans, key=lambda b: b.taban_puan),
+        "guvenli": k.getir(guvenli),
+        "dengeli": k.getir(dengeli),
+        "sans": k.getir(reversed(sans)),
     }
 
 
 def benzersiz_sehirler() -> List[str]:
-    """Verideki tüm şehirleri döndürür."""
-    return sorted(set(b.sehir for b in BOLUM_VERILERI))
+    """Verideki tüm şehirleri döndürür (Türkçe alfabetik)."""
+    return katalog().faset_indeksi.degerler("sehir")
 
 
 def benzersiz_bolumler() -> List[str]:
-    """Verideki tüm bölüm adlarını döndürür."""
-    return sorted(set(b.bolum for b in BOLUM_VERILERI))
+    """Verideki tüm bölüm adlarını döndürür (Türkçe alfabetik)."""
+    return katalog().faset_indeksi.degerler("bolum")
 
 
 def benzersiz_universiteler() -> List[str]:
-    """Verideki tüm üniversite adlarını döndürür."""
-    return sorted(set(b.universite for b in BOLUM_VERILERI))
+    """Verideki tüm üniversite adlarını döndürür (Türkçe alfabetik)."""
+    return katalog().faset_indeksi.degerler("universite")
+
+
+def faset_sayimlari(alan: str, filtreler: Optional[Filtre] = None) -> List[Tuple[str, int]]:
+    """
+    Filtre widget'ları için (değer, bölüm sayısı) listesi.
+    Örnek: faset_sayimlari("sehir", {"puan_turu": "SAY", "tur": "Devlet"})
+    """
+    return katalog().faset_indeksi.sayimlar(alan, filtreler)
@@ -0,0 +1,170 @@
+"""
+OmniPDR – models/deneme_akisi.py
+====================================
+Deneme kayıtları için çevrimiçi (akış) istatistikler.
+
+Her yeni deneme eklendiğinde O(1) güncellenen birikimciler:
+  - Önek toplamları   → herhangi bir [bas, son) penceresinin ortalaması O(1)
+  - Welford            → ortalama ve varyans, tek geçişte ve sayısal kararlı
+  - EWMA               → son denemelere ağırlık veren üstel ortalama
+  - Halka tampon       → son k değer (ör. ZPD için son 3 deneme)
+
+Analiz kuralları (burnout, ZPD) bu değerleri okuyarak deneme listesini
+yeniden taramadan öğrenci başına O(1) çalışır. Trende girmeyen
+(onaylanmamış şüpheli) denemeler yalnızca sayılır, istatistiklere girmez.
+
+Streamlit her etkileşimde öğrencileri diskten yeniden yükler; kurulan
+birikimciler (ogrenci_id, veri_surumu) anahtarıyla süreç içi LRU'da
+tutulur, böylece her yeniden çalıştırmada O(n) yeniden kurulmaz.
+
+Kullanım:
+    akis = akis_getir(ogrenci.ogrenci_id, ogrenci.veri_surumu, ogrenci.deneme_kayitlari)
+    akis.alan("toplam_net").pencere_ortalamasi(0, akis.n // 2)
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from core.onbellek import LRUOnbellek
+
+AKIS_ALANLARI = ("toplam_net", "calisma_saati", "stres_puani", "uyku_saati")
+VARSAYILAN_SON_K = 3            # Halka tampon uzunluğu (ZPD: son 3 deneme)
+VARSAYILAN_EWMA_ALFA = 0.3      # Yeni gözlemin ağırlığı
+
+_AKIS_ONBELLEGI = LRUOnbellek("deneme_akisi", kapasite=8192)
+
+
+class AlanAkisi:
+    """Tek bir sayısal alanın akış istatistikleri."""
+
+    __slots__ = ("n", "_onek", "_ortalama", "_m2", "_ewma", "_alfa", "_son")
+
+    def __init__(self, son_k: int = VARSAYILAN_SON_K, alfa: float = VARSAYILAN_EWMA_ALFA):
+        self.n = 0
+        self._onek: List[float] = [0.0]     # _onek[i] = ilk i değerin toplamı
+        self._ortalama = 0.0
+        self._m2 = 0.0
+        self._ewma: Optional[float] = None
+        self._alfa = alfa
+        self._son: deque = deque(maxlen=son_k)
+
+    def ekle(self, x: float) -> None:
+        self.n += 1
+        self._onek.append(self._onek[-1] + x)
+        fark = x - self._ortalama
+        self._ortalama += fark / self.n
+        self._m2 += fark * (x - self._ortalama)
+        self._ewma = x if self._ewma is None else self._alfa * x + (1 - self._alfa) * self._ewma
+        self._son.append(x)
+
+    def pencere_ortalamasi(self, bas: int, son: int) -> Optional[float]:
+        """[bas, son) aralığındaki değerlerin ortalaması (boş pencerede None)."""
+        if son <= bas:
+            return None
+        return (self._onek[son] - self._onek[bas]) / (son - bas)
+
+    @property
+    def ortalama(self) -> Optional[float]:
+        return self._ortalama if self.n else None
+
+    @property
+    def varyans(self) -> Optional[float]:
+        """Örneklem varyansı (n − 1); en az iki gözlem gerekir."""
+        return self._m2 / (self.n - 1) if self.n >= 2 else None
+
+    @property
+    def std(self) -> Optional[float]:
+        v = self.varyans
+        return math.sqrt(v) if v is not None else None
+
+    @property
+    def ewma(self) -> Optional[float]:
+        return self._ewma
+
+    @property
+    def son_degerler(self) -> List[float]:
+        """Halka tampondaki son k değer (eskiden yeniye)."""
+        return list(self._son)
+
+    @property
+    def son_ortalama(self) -> Optional[float]:
+        return sum(self._son) / len(self._son) if self._son else None
+
+
+class DenemeAkisi:
+    """Bir öğrencinin denemeleri için alan bazında akış istatistikleri."""
+
+    def __init__(self, son_k: int = VARSAYILAN_SON_K, alfa: float = VARSAYILAN_EWMA_ALFA):
+        self.n = 0                 # İstatistiklere giren (trende dahil) deneme sayısı
+        self.kayit_sayisi = 0      # Görülen tüm denemeler (trend dışı olanlar dahil)
+        self.son_id: Optional[str] = None   # Trende giren son denemenin kimliği
+        self.veri_surumu = 0       # Birikimcinin yansıttığı Ogrenci.veri_surumu
+        self._alanlar: Dict[str, AlanAkisi] = {a: AlanAkisi(son_k, alfa) for a in AKIS_ALANLARI}
+
+    @classmethod
+    def kur(cls, kayitlar: Iterable, veri_surumu: int = 0) -> "DenemeAkisi":
+        """Mevcut deneme listesinden birikimcileri baştan kurar (O(n), bir kez)."""
+        akis = cls()
+        for k in kayitlar:
+            akis.ekle(k)
+        akis.veri_surumu = veri_surumu
+        return akis
+
+    def ekle(self, kayit) -> None:
+        """Listenin sonuna eklenen bir DenemeKaydi ile tüm birikimcileri O(1) günceller."""
+        self.kayit_sayisi += 1
+        if not kayit.trende_dahil:
+            return
+        self.n += 1
+        self.son_id = kayit.id
+        self._alanlar["toplam_net"].ekle(kayit.toplam_net)
+        self._alanlar["calisma_saati"].ekle(kayit.calisma_saati)
+        self._alanlar["stres_puani"].ekle(kayit.stres_puani)
+        self._alanlar["uyku_saati"].ekle(kayit.uyku_saati)
+
+    def alan(self, ad: str) -> AlanAkisi:
+        return self._alanlar[ad]
+
+
+# ──────────────────────────────────────────────
+# Süreç içi önbellek
+# ──────────────────────────────────────────────
+def _son_trend_id(kayitlar: Sequence) -> Optional[str]:
+    return next((k.id for k in reversed(kayitlar) if k.trende_dahil), None)
+
+
+def akis_gecerli_mi(akis: Optional[DenemeAkisi], veri_surumu: int, kayitlar: Sequence) -> bool:
+    """Birikimci bu veri sürümünü ve deneme listesini yansıtıyor mu (tipik durumda O(1))."""
+    return (
+        akis is not None
+        and akis.veri_surumu == veri_surumu
+        and akis.kayit_sayisi == len(kayitlar)
+        and akis.son_id == _son_trend_id(kayitlar)
+    )
+
+
+def akis_getir(ogrenci_id: str, veri_surumu: int, kayitlar: Sequence) -> DenemeAkisi:
+    """
+    Öğrencinin birikimcileri: önbellekteki giriş aynı sürümü ve listeyi
+    yansıtıyorsa doğrudan döner, aksi halde bir kez kurulup saklanır.
+    """
+    anahtar = (ogrenci_id, veri_surumu)
+    akis = _AKIS_ONBELLEGI.bul(anahtar)
+    if not akis_gecerli_mi(akis, veri_surumu, kayitlar):
+        akis = DenemeAkisi.kur(kayitlar, veri_surumu)
+        _AKIS_ONBELLEGI.koy(anahtar, akis)
+    return akis
+
+
+def akis_ilerlet(ogrenci_id: str, akis: DenemeAkisi, kayit, veri_surumu: int) -> None:
+    """
+    Sona eklenen denemeyi birikimciye işler ve önbellek girişini yeni
+    sürüme taşır (eski sürümün kopyaları yerinde değişmiş girişi okumasın).
+    """
+    _AKIS_ONBELLEGI.gecersiz_kil((ogrenci_id, akis.veri_surumu))
+    akis.ekle(kayit)
+    akis.veri_surumu = veri_surumu
+    _AKIS_ONBELLEGI.koy((ogrenci_id, veri_surumu), akis)
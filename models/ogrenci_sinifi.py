@@ -12,11 +12,15 @@ Psikolojik Temel:
 
 from __future__ import annotations
 
+import hashlib
+import json
 import uuid
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import List, Optional
 
+from models.deneme_akisi import DenemeAkisi, akis_gecerli_mi, akis_getir, akis_ilerlet
+
 
 # ──────────────────────────────────────────────
 # 1. YKS/LGS Ders Adları (sabit değerler)
@@ -154,11 +158,24 @@ class DenemeKaydi:
     stres_puani: int       # 1–10 arası öznel stres skoru
     uyku_saati: float      # Günlük ortalama uyku süresi (saat)
     notlar: str = ""       # Serbest metin notlar
+    # Hesaplanmış puan/sıralama (core.puan_gecmisi doldurur; görüntülemede yeniden puanlama yapılmaz)
+    puan_kaydi: Optional[dict] = None
+    # Kalıcı kimlik: önbellekler denemeleri bununla tanır
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    # Anomali dedektörünün bulgusu (core.anomali doldurur); None → olağan
+    anomali: Optional[dict] = None
+    # Danışman şüpheli kaydın gerçek olduğunu onayladıysa trende yeniden dahil edilir
+    onaylandi: bool = False
 
     @property
     def toplam_net(self) -> float:
         return sum(self.netleri.values())
 
+    @property
+    def trende_dahil(self) -> bool:
+        """Şüpheli (onaylanmamış) kayıtlar trend ve burnout/ZPD hesaplarına girmez."""
+        return self.anomali is None or self.onaylandi
+
     def to_dict(self) -> dict:
         return {
             "tarih": self.tarih.isoformat(),
@@ -167,10 +184,22 @@ class DenemeKaydi:
             "stres_puani": self.stres_puani,
             "uyku_saati": self.uyku_saati,
             "notlar": self.notlar,
+            "puan_kaydi": self.puan_kaydi,
+            "id": self.id,
+            "anomali": self.anomali,
+            "onaylandi": self.onaylandi,
         }
 
     @classmethod
-    def from_dict(cls, d: dict) -> "DenemeKaydi":
+    def from_dict(cls, d: dict, sira: int = 0) -> "DenemeKaydi":
+        # Kimliksiz eski kayıtlar: içerik ve listedeki konumdan türetilen kararlı kimlik
+        # (aynı içerikli iki deneme çakışmasın); ilk kayıtta to_dict ile kalıcı olur
+        kimlik = d.get("id") or hashlib.blake2b(
+            json.dumps(
+                [sira, d["tarih"], d["netleri"], d["calisma_saati"], d["stres_puani"]], sort_keys=True,
+            ).encode("utf-8"),
+            digest_size=6,
+        ).hexdigest()
         return cls(
             tarih=date.fromisoformat(d["tarih"]),
             netleri=d["netleri"],
@@ -178,6 +207,10 @@ class DenemeKaydi:
             stres_puani=d["stres_puani"],
             uyku_saati=d.get("uyku_saati", 7.0),
             notlar=d.get("notlar", ""),
+            puan_kaydi=d.get("puan_kaydi"),
+            id=kimlik,
+            anomali=d.get("anomali"),
+            onaylandi=d.get("onaylandi", False),
         )
 
 
@@ -226,6 +259,9 @@ class Ogrenci:
         self.sinif = sinif
         
         self.kayit_tarihi: date = date.today()
+        # Deneme verisi her değiştiğinde artar; analiz önbellekleri bu sürümle anahtarlanır
+        self.veri_surumu: int = 0
+        self._deneme_akisi: Optional[DenemeAkisi] = None
 
         # Alt koleksiyonlar
         self.deneme_kayitlari: List[DenemeKaydi] = []
@@ -238,8 +274,28 @@ class Ogrenci:
 
     def deneme_ekle(self, kayit: DenemeKaydi) -> None:
         """Yeni bir deneme kaydı ekler (tarihe göre sıralı tutar)."""
+        # Sona eklenen denemede akış istatistikleri O(1) güncellenir
+        akis = self._deneme_akisi
+        guncel = akis_gecerli_mi(akis, self.veri_surumu, self.deneme_kayitlari)
         self.deneme_kayitlari.append(kayit)
         self.deneme_kayitlari.sort(key=lambda d: d.tarih)
+        self.veri_degisti()
+        if guncel and self.deneme_kayitlari[-1] is kayit:
+            akis_ilerlet(self.ogrenci_id, akis, kayit, self.veri_surumu)
+
+    def veri_degisti(self) -> None:
+        """Deneme kayıtları yerinde değiştirildiğinde çağrılır (veri_surumu'nu artırır)."""
+        self.veri_surumu += 1
+
+    def deneme_onayla(self, deneme_id: str) -> bool:
+        """Şüpheli işaretlenmiş denemeyi danışman onayıyla trende geri alır."""
+        for k in self.deneme_kayitlari:
+            if k.id == deneme_id:
+                if not k.onaylandi:
+                    k.onaylandi = True
+                    self.veri_degisti()
+                return True
+        return False
 
     def hata_ekle(self, ders: str, konu: str, tarih: Optional[date] = None) -> HataKaydi:
         """
@@ -274,10 +330,32 @@ class Ogrenci:
 
     # ── Hesaplama özellikleri ──────────────────
 
+    @property
+    def trend_kayitlari(self) -> List[DenemeKaydi]:
+        """Trend analizlerine giren denemeler (onaylanmamış şüpheli kayıtlar hariç)."""
+        return [k for k in self.deneme_kayitlari if k.trende_dahil]
+
+    @property
+    def deneme_akisi(self) -> DenemeAkisi:
+        """
+        Trende dahil denemelerin akış istatistikleri. Diskten yeniden yüklenen
+        öğrenci aynı veri sürümündeyse süreç içi önbellekteki birikimciyi
+        kullanır; liste dışarıdan değiştiyse bir kez yeniden kurulur.
+        """
+        akis = self._deneme_akisi
+        if not akis_gecerli_mi(akis, self.veri_surumu, self.deneme_kayitlari):
+            akis = self._deneme_akisi = akis_getir(self.ogrenci_id, self.veri_surumu, self.deneme_kayitlari)
+        return akis
+
     @property
     def son_deneme(self) -> Optional[DenemeKaydi]:
         return self.deneme_kayitlari[-1] if self.deneme_kayitlari else None
 
+    @property
+    def son_trend_denemesi(self) -> Optional[DenemeKaydi]:
+        """Trende giren en son deneme (onaylanmamış şüpheli kayıtlar atlanır)."""
+        return next((k for k in reversed(self.deneme_kayitlari) if k.trende_dahil), None)
+
     @property
     def bugunun_tekrar_listesi(self) -> List[HataKaydi]:
         """Bugün tekrar edilmesi gereken konular."""
@@ -313,6 +391,7 @@ class Ogrenci:
             "sinif": self.sinif,
             
             "kayit_tarihi": self.kayit_tarihi.isoformat(),
+            "veri_surumu": self.veri_surumu,
             "deneme_kayitlari": [d.to_dict() for d in self.deneme_kayitlari],
             "hata_kayitlari": [h.to_dict() for h in self.hata_kayitlari],
             "gorusme_notlari": [g.to_dict() for g in self.gorusme_notlari],
@@ -340,7 +419,8 @@ class Ogrenci:
             sinif=d.get("sinif", ""),
         )
         ogr.kayit_tarihi = date.fromisoformat(d.get("kayit_tarihi", date.today().isoformat()))
-        ogr.deneme_kayitlari = [DenemeKaydi.from_dict(x) for x in d.get("deneme_kayitlari", [])]
+        ogr.veri_surumu = d.get("veri_surumu", 0)
+        ogr.deneme_kayitlari = [DenemeKaydi.from_dict(x, i) for i, x in enumerate(d.get("deneme_kayitlari", []))]
         ogr.hata_kayitlari = [HataKaydi.from_dict(x) for x in d.get("hata_kayitlari", [])]
         ogr.gorusme_notlari = [GorusmeNotu.from_dict(x) for x in d.get("gorusme_notlari", [])]
         ogr.konu_ilerlemeleri = d.get("konu_ilerlemeleri", {})